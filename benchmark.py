@@ -0,0 +1,585 @@
+# benchmark.py
+"""
+Medições de desempenho da geração de contratos
+
+Uso:
+    python benchmark.py
+    python -c "import benchmark; benchmark.bench_inicializacao()"
+"""
+
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from docx import Document
+
+from cache_templates import CacheTemplates, listar_paragrafos
+from config import ABREVIACOES, MESES_PT, PALAVRAS_NEGRITO
+from formatador import FormatadorDados
+from gerador import GeradorContratos, substituir_placeholders, TEMPLATES as TEMPLATES_GERADOR
+from negrito import obter_matcher
+from normalizador_endereco import NORMALIZADOR_PADRAO, normalizar_endereco
+
+TEMPLATES = [template_path for template_path, _ in TEMPLATES_GERADOR]
+
+DADOS_EXEMPLO = {
+    'nome_completo': 'MARIA DA SILVA PEREIRA',
+    'cpf': '529.982.247-25',
+    'endereco_completo': 'Av. Paulista, 1000, apto 101',
+    'cidade': 'São Paulo',
+    'estado': 'SP',
+    'oab_numero': '123.456',
+    'oab_uf': 'SP',
+    'estado_civil': 'casada',
+    'data_formatada': '23 de dezembro de 2025',
+    'profissao': 'advogado',
+    'nacionalidade': 'brasileiro',
+}
+
+
+def cronometrar(funcao, repeticoes):
+    """Executa a função N vezes e devolve o tempo médio em segundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def bench_cache_templates(repeticoes=50):
+    """
+    Custo por documento: template relido do disco a cada contrato
+    versus cópia do template em cache (só a carga e o documento completo).
+    """
+    cache = CacheTemplates()
+    gerador = GeradorContratos(cache_templates=cache)
+    placeholders = gerador.preparar_placeholders(DADOS_EXEMPLO)
+    nome = DADOS_EXEMPLO['nome_completo']
+
+    print("\n📊 Cache de templates (ms por documento)")
+    print("-" * 60)
+    print(f"{'Template':45} {'carga':>18} {'documento':>18}")
+
+    for template in TEMPLATES:
+        def sem_cache():
+            doc = Document(template)
+            for paragraph in listar_paragrafos(doc):
+                gerador.processar_paragrafo(paragraph, placeholders, nome)
+
+        def com_cache():
+            gerador.renderizar(template, DADOS_EXEMPLO)
+
+        carga_antes = cronometrar(lambda: Document(template), repeticoes)
+        carga_depois = cronometrar(lambda: cache.clonar(template), repeticoes)
+        antes = cronometrar(sem_cache, repeticoes)
+        depois = cronometrar(com_cache, repeticoes)
+
+        print(f"{template.split('/')[-1]:45} "
+              f"{carga_antes * 1000:7.2f} -> {carga_depois * 1000:6.2f} "
+              f"{antes * 1000:7.2f} -> {depois * 1000:6.2f}")
+
+
+def bench_motor_compilado(repeticoes=50):
+    """
+    Custo por documento: todos os parágrafos reescritos (como antes)
+    versus só os slots dinâmicos do template compilado.
+    """
+    cache = CacheTemplates()
+    gerador = GeradorContratos(cache_templates=cache)
+    placeholders = gerador.preparar_placeholders(DADOS_EXEMPLO)
+    nome = DADOS_EXEMPLO['nome_completo']
+
+    print("\n📊 Motor compilado (ms por documento)")
+    print("-" * 60)
+
+    for template in TEMPLATES:
+        compilado = cache.obter(template)
+
+        def todos_paragrafos():
+            doc = compilado.clonar()
+            for paragraph in listar_paragrafos(doc):
+                gerador.processar_paragrafo(paragraph, placeholders, nome)
+
+        def so_slots():
+            gerador.renderizar(template, DADOS_EXEMPLO)
+
+        antes = cronometrar(todos_paragrafos, repeticoes)
+        depois = cronometrar(so_slots, repeticoes)
+
+        print(f"{template.split('/')[-1]:45} {antes * 1000:7.2f} -> {depois * 1000:6.2f}  "
+              f"({antes / depois:.1f}x, {len(compilado.slots)} slots)")
+
+
+def bench_substituicao(repeticoes=20000):
+    """
+    Micro-benchmark da substituição de placeholders nos parágrafos reais dos
+    templates: laço com "in" + str.replace por placeholder (como antes)
+    versus regex única e posições pré-calculadas do slot.
+    """
+    cache = CacheTemplates()
+    placeholders = GeradorContratos().preparar_placeholders(DADOS_EXEMPLO)
+    slots = [slot for template in TEMPLATES for slot in cache.obter(template).slots]
+
+    def laco_replace():
+        for slot in slots:
+            texto = slot.texto
+            for placeholder, valor in placeholders.items():
+                if placeholder in texto:
+                    texto = texto.replace(placeholder, valor)
+
+    def regex_unica():
+        for slot in slots:
+            substituir_placeholders(slot.texto, placeholders)
+
+    def posicoes_slot():
+        for slot in slots:
+            substituir_placeholders(slot.texto, placeholders, slot.spans)
+
+    tamanho_medio = sum(len(slot.texto) for slot in slots) / len(slots)
+
+    print(f"\n📊 Substituição de placeholders (µs por parágrafo, {len(slots)} parágrafos, "
+          f"{tamanho_medio:.0f} caracteres em média)")
+    print("-" * 60)
+
+    for nome, funcao in [("in + str.replace", laco_replace),
+                         ("regex única", regex_unica),
+                         ("posições do slot", posicoes_slot)]:
+        tempo = cronometrar(funcao, repeticoes) / len(slots)
+        print(f"{nome:45} {tempo * 1e6:7.2f}")
+
+
+def negrito_por_paragrafo(texto, nome_completo):
+    """Negrito como era feito antes: busca + regex montada a cada parágrafo"""
+    if not texto.strip():
+        return [(texto, False)]
+
+    palavras = [nome_completo] if nome_completo and nome_completo in texto else []
+    palavras += [palavra for palavra in PALAVRAS_NEGRITO if palavra in texto]
+    if not palavras:
+        return [(texto, False)]
+
+    palavras.sort(key=len, reverse=True)
+    padrao = '|'.join(re.escape(palavra) for palavra in palavras)
+    return [(parte, parte in palavras) for parte in re.split(f'({padrao})', texto) if parte]
+
+
+def bench_negrito(repeticoes=2000):
+    """
+    Negrito seletivo sobre todos os parágrafos dos templates (já com os
+    placeholders substituídos): regex montada por parágrafo versus matcher
+    compilado, e a parcela do negrito no tempo de um documento.
+    """
+    cache = CacheTemplates()
+    gerador = GeradorContratos(cache_templates=cache)
+    placeholders = gerador.preparar_placeholders(DADOS_EXEMPLO)
+    nome = DADOS_EXEMPLO['nome_completo']
+
+    textos = []
+    for template in TEMPLATES:
+        for paragraph in listar_paragrafos(cache.clonar(template)):
+            textos.append(substituir_placeholders(paragraph.text, placeholders))
+
+    def antes():
+        for texto in textos:
+            negrito_por_paragrafo(texto, nome)
+
+    def depois():
+        matcher = obter_matcher(nome)
+        for texto in textos:
+            matcher.segmentar(texto)
+
+    tempo_antes = cronometrar(antes, repeticoes) / len(textos)
+    tempo_depois = cronometrar(depois, repeticoes) / len(textos)
+
+    print(f"\n📊 Negrito seletivo (µs por parágrafo, {len(textos)} parágrafos)")
+    print("-" * 60)
+    print(f"{'regex montada por parágrafo':45} {tempo_antes * 1e6:7.2f}")
+    print(f"{'matcher compilado':45} {tempo_depois * 1e6:7.2f}")
+
+    # Parcela do negrito no documento: só os slots passam pelo matcher
+    for template in TEMPLATES:
+        compilado = cache.obter(template)
+        slots = [substituir_placeholders(s.texto, placeholders, s.spans) for s in compilado.slots]
+        documento = cronometrar(lambda: gerador.renderizar(template, DADOS_EXEMPLO), 50)
+        negrito = cronometrar(lambda: [obter_matcher(nome).segmentar(t) for t in slots], repeticoes)
+        print(f"{template.split('/')[-1]:45} {negrito / documento:7.2%} do documento")
+
+
+def roster_sintetico(linhas, semente=42):
+    """
+    Roster cru (como viria da planilha) com valores repetidos de cidade,
+    endereço e data, como nos rosters reais.
+    """
+    aleatorio = random.Random(semente)
+    cidades = ['PORTO ALEGRE', 'são paulo', 'rio de janeiro', 'Belo Horizonte', 'CANOAS']
+    ruas = ['avenida carlos gomes', 'rua dos andradas', 'av borges de medeiros', 'travessa da paz']
+    estados_civis = ['solteiro', 'casado', 'divorciado', 'viúvo', 'separado']
+    nomes = ['maria', 'joao', 'ana', 'pedro', 'carla', 'lucas']
+
+    roster = []
+    for i in range(linhas):
+        roster.append({
+            'nome_completo': f"{aleatorio.choice(nomes)} da silva {i}",
+            'cpf': f"{aleatorio.randrange(10**11):011d}",
+            'endereco_completo': f"{aleatorio.choice(ruas)} {aleatorio.randrange(1, 60) * 10}, apto {aleatorio.randrange(1, 9)}01",
+            'cidade': aleatorio.choice(cidades),
+            'estado': aleatorio.choice(['rs', 'SP', 'rj', 'mg']),
+            'oab_numero': f"{aleatorio.randrange(10**6):06d}",
+            'oab_uf': aleatorio.choice(['RS', 'sp']),
+            'estado_civil': aleatorio.choice(estados_civis),
+            'data': f"{aleatorio.randrange(1, 29):02d}/{aleatorio.randrange(1, 13):02d}/2025",
+        })
+    return roster
+
+
+def bench_formatador_lote(linhas=100000):
+    """
+    Formatação de um roster inteiro: linha a linha (formatar_registro)
+    versus colunas inteiras (formatar_colunas), com listas e com pandas.
+    """
+    from lote import COLUNAS_ROSTER, formatar_registro
+
+    roster = roster_sintetico(linhas)
+    colunas = {coluna: [linha[coluna] for linha in roster] for coluna in COLUNAS_ROSTER}
+
+    print(f"\n📊 Formatação de roster ({linhas} linhas, segundos)")
+    print("-" * 60)
+
+    formatador = FormatadorDados()
+    print(f"{'linha a linha':45} {cronometrar(lambda: [formatar_registro(l, formatador) for l in roster], 1):7.2f}")
+    print(f"{'colunas (listas)':45} {cronometrar(lambda: FormatadorDados.formatar_colunas(colunas), 1):7.2f}")
+
+    try:
+        import pandas
+    except ImportError:
+        print(f"{'colunas (pandas)':45} {'pandas não instalado':>20}")
+        return
+
+    tabela = pandas.DataFrame(colunas)
+    print(f"{'colunas (pandas)':45} {cronometrar(lambda: FormatadorDados.formatar_colunas(tabela), 1):7.2f}")
+
+
+def formatar_data_strptime(data_str):
+    """formatar_data anterior: strptime em cada formato, com try/except"""
+    formatos = ['%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d']
+
+    for formato in formatos:
+        try:
+            data = datetime.strptime(data_str.strip(), formato)
+            return f"{data.day} de {MESES_PT[data.month]} de {data.year}"
+        except ValueError:
+            continue
+
+    data = datetime.now()
+    return f"{data.day} de {MESES_PT[data.month]} de {data.year}"
+
+
+def bench_datas(linhas=100000):
+    """
+    Coluna de datas: strptime com try/except em cada valor versus
+    formatar_coluna_data (formato detectado uma vez, regex compilada e
+    memoização das datas repetidas). Inclui datas ISO, que fazem o laço
+    antigo falhar três vezes antes de acertar.
+    """
+    aleatorio = random.Random(7)
+    coluna = []
+    for _ in range(linhas):
+        dia, mes = aleatorio.randrange(1, 29), aleatorio.randrange(1, 13)
+        if aleatorio.random() < 0.2:
+            coluna.append(f"2025-{mes:02d}-{dia:02d}")
+        else:
+            coluna.append(f"{dia:02d}/{mes:02d}/2025")
+
+    distintas = list(dict.fromkeys(coluna))
+    if [formatar_data_strptime(d) for d in distintas] != FormatadorDados.formatar_coluna_data(distintas):
+        raise AssertionError("formatar_coluna_data diverge do laço com strptime")
+
+    print(f"\n📊 Coluna de datas ({linhas} valores, {len(distintas)} distintos, segundos)")
+    print("-" * 60)
+    print(f"{'strptime + try/except por valor':45} {cronometrar(lambda: [formatar_data_strptime(d) for d in coluna], 1):7.3f}")
+    print(f"{'formatar_data (regex) por valor':45} {cronometrar(lambda: [FormatadorDados.formatar_data(d) for d in coluna], 1):7.3f}")
+    print(f"{'formatar_coluna_data':45} {cronometrar(lambda: FormatadorDados.formatar_coluna_data(coluna), 1):7.3f}")
+
+
+def formatar_endereco_split(endereco):
+    """formatar_endereco anterior: split e consulta palavra a palavra"""
+    palavras = ' '.join(endereco.split()).lower().split()
+    formatadas = [ABREVIACOES[p] if p in ABREVIACOES else p.capitalize() for p in palavras]
+    return re.sub(r'(\d+)\s*,', r'\1,', ' '.join(formatadas))
+
+
+def bench_enderecos(linhas=100000):
+    """
+    Normalização de endereços: split + dicionário a cada chamada versus o
+    normalizador com trie, sem e com o cache LRU, numa coluna de roster com
+    endereços repetidos.
+    """
+    enderecos = [linha['endereco_completo'] for linha in roster_sintetico(linhas)]
+    distintos = len(set(enderecos))
+
+    print(f"\n📊 Endereços ({linhas} valores, {distintos} distintos, endereços/segundo)")
+    print("-" * 60)
+
+    def taxa(funcao):
+        return linhas / cronometrar(lambda: [funcao(e) for e in enderecos], 1)
+
+    normalizar_endereco.cache_clear()
+    print(f"{'split + dicionário':45} {taxa(formatar_endereco_split):12,.0f}")
+    print(f"{'trie, sem cache':45} {taxa(NORMALIZADOR_PADRAO.normalizar):12,.0f}")
+    print(f"{'trie + LRU (formatar_endereco)':45} {taxa(FormatadorDados.formatar_endereco):12,.0f}")
+
+
+def bench_backends(repeticoes=200):
+    """
+    Contratos por segundo (gerados em memória, até os bytes do .docx) com o
+    backend python-docx e com o backend de emenda direta do XML.
+    """
+    import warnings
+
+    gerador = GeradorContratos()
+    gerador.aquecer()
+
+    print(f"\n📊 Backends de renderização ({repeticoes} contratos por template, contratos/segundo)")
+    print("-" * 72)
+    print(f"{'Template':40} {'docx':>9} {'xml':>9} {'ganho':>9}")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+
+        for template_path in TEMPLATES:
+            taxas = {}
+            for backend in ('docx', 'xml'):
+                # Primeiro contrato fora da medição (monta o plano do backend xml)
+                gerador.renderizar_bytes(template_path, DADOS_EXEMPLO, backend)
+                segundos = cronometrar(
+                    lambda: gerador.renderizar_bytes(template_path, DADOS_EXEMPLO, backend), repeticoes,
+                )
+                taxas[backend] = 1 / segundos
+
+            nome = template_path.split('/')[-1][:40]
+            print(f"{nome:40} {taxas['docx']:9.0f} {taxas['xml']:9.0f} {taxas['xml'] / taxas['docx']:8.1f}x")
+
+
+def bench_validacao(linhas=100000):
+    """
+    Validação de um roster inteiro: linha a linha (validar_registro) versus
+    colunas inteiras (validar_colunas), sem abrir nenhum documento.
+    """
+    from lote import COLUNAS_ROSTER
+    from validacao import validar_colunas, validar_registro
+
+    roster = roster_sintetico(linhas)
+    colunas = {coluna: [linha[coluna] for linha in roster] for coluna in COLUNAS_ROSTER}
+
+    print(f"\n📊 Validação de roster ({linhas} linhas, linhas/segundo)")
+    print("-" * 60)
+
+    segundos = cronometrar(lambda: [validar_registro(linha, numero) for numero, linha in enumerate(roster)], 1)
+    print(f"{'linha a linha':45} {linhas / segundos:12,.0f}")
+    segundos = cronometrar(lambda: validar_colunas(colunas), 1)
+    print(f"{'colunas':45} {linhas / segundos:12,.0f}")
+
+
+def bench_reedicao(repeticoes=200):
+    """
+    Correção de um campo (endereço) num contrato já gerado, em memória:
+    gerar de novo, com cada backend, versus reescrever só os slots afetados
+    pelo mapa de slots (GeradorContratos.remendar). Nos dois casos o
+    arquivo ainda é gravado uma vez.
+    """
+    import warnings
+    import zipfile
+    from io import BytesIO
+
+    from reedicao import hash_documento, montar_mapa
+    from renderizador_xml import PARTE_DOCUMENTO
+
+    print(f"\n📊 Correção de um campo ({repeticoes} correções por template, ms por contrato)")
+    print("-" * 84)
+    print(f"{'Template':40} {'docx':>9} {'xml':>9} {'mapa':>9} {'slots':>7} {'ganho':>7}")
+
+    gerador = GeradorContratos()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+
+        for template_path in TEMPLATES:
+            tempos = {
+                backend: cronometrar(lambda: gerador.renderizar_bytes(template_path, DADOS_EXEMPLO, backend),
+                                     repeticoes)
+                for backend in ('docx', 'xml')
+            }
+
+            plano, template, placeholders, runs_do_slot = gerador._preparar_xml(template_path, DADOS_EXEMPLO)
+            documento_xml, posicoes = plano.montar_documento(runs_do_slot)
+            mapa = montar_mapa(template, DADOS_EXEMPLO, placeholders, hash_documento(documento_xml), posicoes)
+            enderecos = iter(['Rua das Flores, 10', 'Av. Paulista, 1000, apto 101'] * repeticoes)
+
+            def corrigir():
+                nonlocal documento_xml, mapa
+                conteudo, mapa, _ = gerador.remendar(documento_xml, mapa, {'endereco_completo': next(enderecos)})
+                with zipfile.ZipFile(BytesIO(conteudo)) as documento:
+                    documento_xml = documento.read(PARTE_DOCUMENTO)
+
+            tempos['mapa'] = cronometrar(corrigir, repeticoes)
+            _, _, reescritos = gerador.remendar(documento_xml, mapa, {'endereco_completo': 'Rua Nova, 5'})
+            slots = f"{reescritos}/{len(template.slots)}"
+
+            nome = template_path.split('/')[-1][:40]
+            print(f"{nome:40} {tempos['docx'] * 1000:9.3f} {tempos['xml'] * 1000:9.3f} "
+                  f"{tempos['mapa'] * 1000:9.3f} {slots:>7} {tempos['docx'] / tempos['mapa']:6.1f}x")
+
+
+def bench_signatarios(quantidades=(1, 10, 100, 1000)):
+    """
+    Documento único com N signatários (signatarios.py), com cada backend,
+    em ms por signatário: com o matcher em árvore de prefixos e o template
+    compilado uma vez, o custo por signatário não cresce com N. Para
+    comparar, N documentos separados no backend xml.
+    """
+    import warnings
+
+    template_path = next(t for t in TEMPLATES if 'CONFIDENCIALIDADE' in t)
+    gerador = GeradorContratos()
+
+    print(f"\n📊 Signatários num único documento ({template_path.split('/')[-1]}, ms por signatário)")
+    print("-" * 60)
+    print(f"{'Signatários':>12} {'docx':>11} {'xml':>11} {'separados':>11}")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+
+        for quantidade in quantidades:
+            signatarios = [
+                {**DADOS_EXEMPLO, 'nome_completo': f"SIGNATÁRIO {numero} DA SILVA", 'cpf': f"{numero:011d}"}
+                for numero in range(quantidade)
+            ]
+            repeticoes = max(1, 200 // quantidade)
+
+            tempos = [
+                cronometrar(lambda: gerador.renderizar_bytes_signatarios(template_path, signatarios, backend),
+                            repeticoes) / quantidade
+                for backend in ('docx', 'xml')
+            ]
+            tempos.append(cronometrar(
+                lambda: [gerador.renderizar_bytes(template_path, dados, 'xml') for dados in signatarios],
+                repeticoes,
+            ) / quantidade)
+
+            print(f"{quantidade:12d} " + " ".join(f"{tempo * 1000:11.3f}" for tempo in tempos))
+
+
+def bench_pdf(arquivos=40, atraso=0.02):
+    """
+    Conversão para PDF com o conversor stub (atraso fixo por arquivo no
+    lugar do LibreOffice): um conversor por vez versus pools maiores.
+    """
+    import tempfile
+
+    from exportar_pdf import ConversorStub, PoolConversores
+
+    print(f"\n📊 Exportação para PDF ({arquivos} arquivos, stub com {atraso * 1000:.0f} ms por arquivo)")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminhos = []
+        for numero in range(arquivos):
+            caminho = os.path.join(pasta, f"contrato_{numero}.docx")
+            with open(caminho, 'wb') as arquivo:
+                arquivo.write(b'docx')
+            caminhos.append(caminho)
+
+        for processos in (1, 2, 4, 8):
+            with PoolConversores(lambda: ConversorStub(atraso), processos) as pool:
+                # Um PDF novo por rodada (sem sobrescrever os da rodada anterior)
+                segundos = cronometrar(lambda: [
+                    futuro.result() for futuro in [
+                        pool.enviar(caminho, f"{caminho}.{processos}.pdf") for caminho in caminhos
+                    ]
+                ], 1)
+            print(f"{f'{processos} conversor(es)':45} {arquivos / segundos:10.1f} PDFs/s")
+
+
+def _tempo_processo(codigo, repeticoes):
+    """
+    Roda `codigo` num interpretador novo, na pasta do projeto, N vezes.
+
+    Returns:
+        Tupla (tempo médio de parede, média do último número impresso pelo
+        código ou None), em segundos
+    """
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    paredes, medidos = [], []
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        saida = subprocess.run([sys.executable, '-c', codigo], cwd=pasta, check=True,
+                               capture_output=True, text=True).stdout.split()
+        paredes.append(time.perf_counter() - inicio)
+        if saida:
+            medidos.append(float(saida[-1]))
+
+    return sum(paredes) / repeticoes, sum(medidos) / len(medidos) if medidos else None
+
+
+def bench_inicializacao(repeticoes=10, pausa=1.0):
+    """
+    Partida a frio do main.py, cada medição num processo novo: tempo até o
+    primeiro prompt (só imports) e espera pelos quatro contratos depois que
+    o usuário confirma, com e sem o aquecimento em segundo plano (a pausa
+    simula o tempo que o usuário leva respondendo às perguntas).
+    """
+    gerar = (
+        "from gerador import TEMPLATES, gerar_bytes\n"
+        f"for caminho, _ in TEMPLATES: gerar_bytes({DADOS_EXEMPLO!r}, caminho)\n"
+    )
+    sem_aquecimento = (
+        "import time, warnings; warnings.simplefilter('ignore')\n"
+        "import main\n"
+        "inicio = time.perf_counter()\n" + gerar +
+        "print(time.perf_counter() - inicio)"
+    )
+    com_aquecimento = (
+        "import time, warnings; warnings.simplefilter('ignore')\n"
+        "import main\n"
+        f"thread = main.iniciar_aquecimento(); time.sleep({pausa})\n"
+        "inicio = time.perf_counter(); thread.join()\n" + gerar +
+        "print(time.perf_counter() - inicio)"
+    )
+
+    print(f"\n📊 Inicialização a frio ({repeticoes} processos por caso, ms)")
+    print("-" * 60)
+
+    for nome, codigo in [
+        ("interpretador vazio", "pass"),
+        ("main.py até o primeiro prompt", "import main"),
+        ("main.py + gerador (import antecipado)", "import main, gerador"),
+    ]:
+        parede, _ = _tempo_processo(codigo, repeticoes)
+        print(f"{nome:45} {parede * 1000:10.1f}")
+
+    for nome, codigo in [
+        ("4 contratos após confirmar, sem aquecimento", sem_aquecimento),
+        ("4 contratos após confirmar, com aquecimento", com_aquecimento),
+    ]:
+        _, medido = _tempo_processo(codigo, repeticoes)
+        print(f"{nome:45} {medido * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    bench_cache_templates()
+    bench_motor_compilado()
+    bench_substituicao()
+    bench_negrito()
+    bench_formatador_lote()
+    bench_datas()
+    bench_enderecos()
+    bench_validacao()
+    bench_backends()
+    bench_reedicao()
+    bench_signatarios()
+    bench_pdf()
+    bench_inicializacao()
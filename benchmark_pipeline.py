@@ -0,0 +1,280 @@
+# benchmark_pipeline.py
+"""
+Benchmark do pipeline de geração, etapa por etapa, com saída em JSON
+
+Roda offline: usa só os quatro templates de templates/ e templates
+sintéticos gerados na hora (quantidade de parágrafos, de tabelas e
+densidade de placeholders configuráveis), preenchidos com pessoas
+sintéticas (roster_sintetico).
+
+Etapas medidas, por documento:
+    formatacao             FormatadorDados sobre a linha crua (formatar_registro)
+    preparar_placeholders  GeradorContratos.preparar_placeholders
+    carregamento           Document(template) lido do disco
+    processar_paragrafo    todos os parágrafos, como no gerador original
+    negrito                aplicar_negrito_seletivo sobre os textos finais
+    salvar                 doc.save num buffer em memória
+    renderizar_docx        pipeline compilado completo, backend python-docx
+    renderizar_xml         pipeline compilado completo, backend xml
+
+Uso:
+    python benchmark_pipeline.py --saida resultado.json
+    python benchmark_pipeline.py --paragrafos 500 --tabelas 10 --densidade 0.5
+    python benchmark_pipeline.py --saida novo.json --comparar antigo.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+import docx
+from docx import Document
+
+from benchmark import roster_sintetico
+from cache_templates import CacheTemplates, listar_paragrafos
+from config import PALAVRAS_NEGRITO
+from gerador import GeradorContratos, TEMPLATES as TEMPLATES_GERADOR, resolver_template, substituir_placeholders
+from lote import formatar_registro
+
+ETAPAS = [
+    'formatacao',
+    'preparar_placeholders',
+    'carregamento',
+    'processar_paragrafo',
+    'negrito',
+    'salvar',
+    'renderizar_docx',
+    'renderizar_xml',
+]
+
+PALAVRAS_TEXTO = (
+    "o outorgante confere poderes para representar perante qualquer juízo instância "
+    "ou tribunal podendo propor ações contestar recorrer transigir desistir firmar acordos "
+    "receber e dar quitação substabelecer com ou sem reserva de poderes"
+).split()
+
+
+def template_sintetico(caminho, paragrafos=100, tabelas=2, densidade=0.3, semente=42):
+    """
+    Cria um template .docx sintético.
+
+    Args:
+        caminho: Arquivo .docx de saída
+        paragrafos: Parágrafos no corpo
+        tabelas: Tabelas 3x3, com um parágrafo por célula
+        densidade: Fração dos parágrafos (e células) que recebem um placeholder
+        semente: Semente do gerador aleatório
+
+    Returns:
+        O caminho do template
+    """
+    aleatorio = random.Random(semente)
+    placeholders = list(GeradorContratos().preparar_placeholders({}))
+
+    def texto():
+        palavras = aleatorio.choices(PALAVRAS_TEXTO, k=aleatorio.randrange(8, 40))
+        if aleatorio.random() < densidade:
+            palavras.insert(aleatorio.randrange(len(palavras) + 1), aleatorio.choice(placeholders))
+        if aleatorio.random() < 0.1:
+            palavras.insert(0, aleatorio.choice(PALAVRAS_NEGRITO))
+        return ' '.join(palavras)
+
+    doc = Document()
+    for _ in range(paragrafos):
+        doc.add_paragraph(texto())
+
+    for _ in range(tabelas):
+        tabela = doc.add_table(rows=3, cols=3)
+        for linha in tabela.rows:
+            for celula in linha.cells:
+                celula.text = texto()
+
+    doc.save(caminho)
+    return caminho
+
+
+def _estatisticas(amostras):
+    """Média, mediana, p95, mínimo e total (milissegundos) de amostras em ns"""
+    ordenadas = sorted(amostras)
+    total = sum(ordenadas)
+    return {
+        'amostras': len(ordenadas),
+        'media_ms': total / len(ordenadas) / 1e6,
+        'p50_ms': ordenadas[len(ordenadas) // 2] / 1e6,
+        'p95_ms': ordenadas[min(len(ordenadas) - 1, int(0.95 * len(ordenadas)))] / 1e6,
+        'min_ms': ordenadas[0] / 1e6,
+        'total_ms': total / 1e6,
+    }
+
+
+def medir_template(template_path, linhas):
+    """
+    Mede cada etapa para um template, um documento por linha do roster.
+
+    Returns:
+        Dicionário {etapa: estatísticas}
+    """
+    amostras = {etapa: [] for etapa in ETAPAS}
+    gerador = GeradorContratos(cache_templates=CacheTemplates())
+    gerador.aquecer([(template_path, '')])
+
+    def medir(etapa, funcao, *args):
+        inicio = time.perf_counter_ns()
+        resultado = funcao(*args)
+        amostras[etapa].append(time.perf_counter_ns() - inicio)
+        return resultado
+
+    for linha in linhas:
+        dados = medir('formatacao', formatar_registro, linha)
+        placeholders = medir('preparar_placeholders', gerador.preparar_placeholders, dados)
+        nome_completo = dados['nome_completo']
+
+        doc = medir('carregamento', Document, template_path)
+        paragrafos = listar_paragrafos(doc)
+        textos = [substituir_placeholders(p.text, placeholders) for p in paragrafos if p.text.strip()]
+
+        def processar_todos():
+            for paragraph in paragrafos:
+                gerador.processar_paragrafo(paragraph, placeholders, nome_completo)
+
+        def negritar_todos():
+            for texto in textos:
+                gerador.aplicar_negrito_seletivo(texto, nome_completo)
+
+        medir('negrito', negritar_todos)
+        medir('processar_paragrafo', processar_todos)
+        medir('salvar', doc.save, io.BytesIO())
+
+        medir('renderizar_docx', gerador.renderizar_bytes, template_path, dados, 'docx')
+        medir('renderizar_xml', gerador.renderizar_bytes, template_path, dados, 'xml')
+
+    return {etapa: _estatisticas(valores) for etapa, valores in amostras.items()}
+
+
+def executar(pessoas=50, paragrafos=100, tabelas=2, densidade=0.3, semente=42):
+    """
+    Roda o benchmark nos templates do projeto e num template sintético.
+
+    Returns:
+        Dicionário serializável em JSON com o ambiente, os parâmetros e as
+        estatísticas por template e etapa
+    """
+    linhas = roster_sintetico(pessoas, semente)
+    resultado = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': {
+            'python': platform.python_version(),
+            'python_docx': getattr(docx, '__version__', ''),
+            'plataforma': platform.platform(),
+        },
+        'parametros': {
+            'pessoas': pessoas,
+            'paragrafos': paragrafos,
+            'tabelas': tabelas,
+            'densidade': densidade,
+            'semente': semente,
+        },
+        'templates': {},
+    }
+
+    with warnings.catch_warnings(), tempfile.TemporaryDirectory() as pasta:
+        # Templates sintéticos usam só parte dos placeholders
+        warnings.simplefilter("ignore")
+
+        sintetico = template_sintetico(
+            os.path.join(pasta, 'SINTETICO_MODEL.docx'), paragrafos, tabelas, densidade, semente,
+        )
+        templates = [resolver_template(caminho) for caminho, _ in TEMPLATES_GERADOR] + [sintetico]
+
+        for template_path in templates:
+            nome = os.path.basename(template_path)
+            print(f"⏱️  {nome}")
+            resultado['templates'][nome] = medir_template(template_path, linhas)
+
+    return resultado
+
+
+def mostrar(resultado):
+    """Tabela com a média (ms) de cada etapa por template"""
+    print(f"\n📊 Média por documento (ms), {resultado['parametros']['pessoas']} pessoas")
+    print("-" * 100)
+    print(f"{'Etapa':24}" + ''.join(f"{nome[:14]:>15}" for nome in resultado['templates']))
+
+    for etapa in ETAPAS:
+        medias = [estatisticas[etapa]['media_ms'] for estatisticas in resultado['templates'].values()]
+        print(f"{etapa:24}" + ''.join(f"{media:15.3f}" for media in medias))
+
+
+def comparar(anterior, atual, tolerancia=0.10):
+    """
+    Compara dois resultados (média por etapa) e lista as regressões.
+
+    Args:
+        tolerancia: Aumento relativo tolerado antes de acusar regressão
+
+    Returns:
+        Lista de tuplas (template, etapa, média anterior, média atual)
+    """
+    regressoes = []
+
+    print(f"\n📈 Comparação com {anterior.get('data', 'resultado anterior')} (atual / anterior)")
+    print("-" * 72)
+
+    for nome, etapas in atual['templates'].items():
+        for etapa, estatisticas in etapas.items():
+            antes = anterior.get('templates', {}).get(nome, {}).get(etapa)
+            if not antes or not antes['media_ms']:
+                continue
+
+            razao = estatisticas['media_ms'] / antes['media_ms']
+            marca = "⚠️ " if razao > 1 + tolerancia else "  "
+            print(f"{marca}{nome[:30]:30} {etapa:24} {razao:6.2f}x")
+
+            if razao > 1 + tolerancia:
+                regressoes.append((nome, etapa, antes['media_ms'], estatisticas['media_ms']))
+
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de geração por etapa")
+    parser.add_argument("--pessoas", type=int, default=50, help="Documentos por template")
+    parser.add_argument("--paragrafos", type=int, default=100, help="Parágrafos do template sintético")
+    parser.add_argument("--tabelas", type=int, default=2, help="Tabelas do template sintético")
+    parser.add_argument("--densidade", type=float, default=0.3,
+                        help="Fração dos parágrafos sintéticos com placeholder")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="Grava o resultado neste arquivo JSON")
+    parser.add_argument("--comparar", help="Resultado JSON anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Aumento relativo tolerado na comparação (padrão: 0.10)")
+    args = parser.parse_args(argv)
+
+    resultado = executar(args.pessoas, args.paragrafos, args.tabelas, args.densidade, args.semente)
+    mostrar(resultado)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"\n💾 Resultado gravado em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            regressoes = comparar(json.load(arquivo), resultado, args.tolerancia)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} etapa(s) mais lenta(s) que o tolerado")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+# cache_resultados.py
+"""
+Cache de documentos já gerados, endereçado pelo conteúdo
+
+A chave de cada documento é o SHA-256 do hash do template, dos valores de
+preparar_placeholders, do vocabulário de negrito (PALAVRAS_NEGRITO) e de
+VERSAO_RENDERIZACAO: mudar as palavras em negrito ou o renderizador invalida
+os artefatos antigos em vez de servi-los com a formatação errada. Se a mesma
+pessoa for gerada de novo sem mudar nada que apareça no template, o
+documento vem pronto do cache e o arquivo com timestamp em output/ vira
+apenas um apelido (hard link, ou cópia quando o sistema de arquivos não
+permite) do artefato em cache.
+
+O cache tem tamanho limitado em disco: quando passa do limite, os artefatos
+usados há mais tempo são removidos. O uso é marcado no atime do artefato, e
+não no mtime, que os hard links em output/ compartilham: um acerto não muda
+a data de modificação dos contratos já gerados.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from config import CACHE_RESULTADOS_PASTA, CACHE_RESULTADOS_LIMITE_MB, PALAVRAS_NEGRITO
+
+EXTENSAO = ".docx"
+
+# Incrementar sempre que o documento renderizado mudar para os mesmos dados
+# (formatação dos runs, emenda do XML, regras de negrito...)
+VERSAO_RENDERIZACAO = 1
+
+# Parte fixa da chave: versão do renderizador e vocabulário de negrito
+_ASSINATURA = json.dumps([VERSAO_RENDERIZACAO, PALAVRAS_NEGRITO], ensure_ascii=False).encode('utf-8')
+
+
+class CacheResultados:
+    """
+    Artefatos .docx indexados pela chave de conteúdo.
+
+    Args:
+        pasta: Pasta dos artefatos
+        limite_bytes: Tamanho máximo somado dos artefatos
+    """
+
+    def __init__(self, pasta=CACHE_RESULTADOS_PASTA, limite_bytes=CACHE_RESULTADOS_LIMITE_MB * 1024 * 1024):
+        self.pasta = pasta
+        self.limite_bytes = limite_bytes
+        self.acertos = 0
+        self.faltas = 0
+        self.removidos = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(pasta, exist_ok=True)
+        self._tamanho_total = sum(tamanho for _, _, tamanho in self._artefatos())
+
+    @staticmethod
+    def chave(hash_template, placeholders, variante=''):
+        """
+        Chave de conteúdo do documento.
+
+        Args:
+            hash_template: SHA-256 do arquivo do template
+            placeholders: Dicionário de preparar_placeholders
+            variante: Texto extra que muda o resultado (ex.: backend de renderização)
+        """
+        sha = hashlib.sha256()
+        sha.update(_ASSINATURA)
+        sha.update(hash_template.encode('ascii'))
+        sha.update(variante.encode('utf-8'))
+        sha.update(json.dumps(placeholders, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return sha.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, chave + EXTENSAO)
+
+    def _artefatos(self):
+        """Lista (caminho, último uso (atime), tamanho) dos artefatos em cache"""
+        with os.scandir(self.pasta) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and entrada.name.endswith(EXTENSAO):
+                    info = entrada.stat()
+                    yield entrada.path, info.st_atime, info.st_size
+
+    def obter(self, chave):
+        """
+        Caminho do artefato em cache, ou None.
+        Um acerto atualiza o atime do artefato (uso recente, para o LRU) e
+        preserva o mtime, que é o mesmo dos hard links em output/.
+        """
+        caminho = self._caminho(chave)
+
+        try:
+            os.utime(caminho, ns=(time.time_ns(), os.stat(caminho).st_mtime_ns))
+        except FileNotFoundError:
+            self.faltas += 1
+            return None
+
+        self.acertos += 1
+        return caminho
+
+    def guardar(self, chave, conteudo):
+        """
+        Grava o artefato (bytes do .docx) de forma atômica e aplica o limite
+        de tamanho.
+
+        Returns:
+            Caminho do artefato
+        """
+        caminho = self._caminho(chave)
+
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                arquivo.write(conteudo)
+            # mkstemp cria o arquivo só para o dono; os apelidos em output/ herdam a permissão
+            os.chmod(temporario, 0o644)
+            # Regravar uma chave substitui o artefato: o tamanho antigo sai do total
+            try:
+                anterior = os.path.getsize(caminho)
+            except FileNotFoundError:
+                anterior = 0
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+        with self._lock:
+            self._tamanho_total += len(conteudo) - anterior
+            if self._tamanho_total > self.limite_bytes:
+                self._remover_antigos(manter=caminho)
+
+        return caminho
+
+    def _remover_antigos(self, manter=None):
+        """Remove os artefatos usados há mais tempo até caber no limite"""
+        artefatos = sorted(self._artefatos(), key=lambda artefato: artefato[1])
+        total = sum(tamanho for _, _, tamanho in artefatos)
+
+        for caminho, _, tamanho in artefatos:
+            if total <= self.limite_bytes:
+                break
+            if caminho == manter:
+                continue
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+            total -= tamanho
+            self.removidos += 1
+
+        self._tamanho_total = total
+
+    def reaproveitar(self, chave, destino):
+        """
+        Cria `destino` a partir do artefato em cache (obter + vincular).
+        Um artefato removido por outro processo entre os dois passos conta
+        como falta.
+
+        Returns:
+            True se o artefato estava em cache
+        """
+        artefato = self.obter(chave)
+        if artefato is None:
+            return False
+
+        try:
+            self.vincular(artefato, destino)
+        except FileNotFoundError:
+            if os.path.exists(artefato):
+                raise
+            self.acertos -= 1
+            self.faltas += 1
+            return False
+        return True
+
+    def ler(self, chave):
+        """
+        Bytes do artefato em cache, ou None. Como em reaproveitar, um
+        artefato removido por outro processo antes da leitura conta como
+        falta.
+        """
+        artefato = self.obter(chave)
+        if artefato is None:
+            return None
+
+        try:
+            with open(artefato, 'rb') as arquivo:
+                return arquivo.read()
+        except FileNotFoundError:
+            self.acertos -= 1
+            self.faltas += 1
+            return None
+
+    @staticmethod
+    def vincular(artefato, destino):
+        """
+        Cria `destino` como apelido do artefato: hard link quando possível,
+        senão uma cópia. O arquivo continua válido mesmo se o artefato for
+        removido do cache depois. Um `destino` existente é substituído.
+
+        Raises:
+            FileNotFoundError: O artefato não está mais no cache
+        """
+        pasta = os.path.dirname(destino) or '.'
+        os.makedirs(pasta, exist_ok=True)
+
+        # Cria com nome temporário e troca de uma vez (também sobrescreve)
+        temporario = os.path.join(
+            pasta, f".{os.path.basename(destino)}.{os.getpid()}.{threading.get_ident()}.tmp",
+        )
+        if os.path.lexists(temporario):
+            os.remove(temporario)
+
+        try:
+            try:
+                os.link(artefato, temporario)
+            except FileNotFoundError:
+                raise
+            except OSError:
+                shutil.copyfile(artefato, temporario)
+            os.replace(temporario, destino)
+        except BaseException:
+            if os.path.lexists(temporario):
+                os.remove(temporario)
+            raise
+
+        return destino
+
+    def estatisticas(self):
+        """Acertos, faltas, remoções e ocupação do cache"""
+        total = self.acertos + self.faltas
+        return {
+            'acertos': self.acertos,
+            'faltas': self.faltas,
+            'taxa_acerto': self.acertos / total if total else 0.0,
+            'removidos': self.removidos,
+            'bytes': self._tamanho_total,
+            'limite_bytes': self.limite_bytes,
+        }
@@ -0,0 +1,227 @@
+# cache_templates.py
+"""
+Cache de templates .docx já carregados e analisados
+
+Cada template é lido e parseado uma única vez e compilado numa lista de
+slots dinâmicos (parágrafos com placeholders). Os contratos são produzidos a
+partir de uma cópia (deepcopy) do documento em memória, sem reabrir o zip nem
+reparsear o XML, e só os slots são reescritos. O cache é invalidado quando o
+arquivo muda em disco.
+"""
+
+import copy
+import hashlib
+import os
+import re
+import threading
+
+from docx import Document
+from negrito import MATCHER_PADRAO
+
+# Placeholders no formato {{NOME}}
+PADRAO_PLACEHOLDER = re.compile(r'\{\{[A-Z0-9_]+\}\}')
+
+
+def listar_paragrafos(doc):
+    """
+    Lista os parágrafos do documento na ordem em que são processados:
+    primeiro o corpo, depois as células das tabelas.
+    Células mescladas aparecem uma única vez.
+    """
+    paragrafos = list(doc.paragraphs)
+    vistos = set()
+
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if id(cell._tc) in vistos:
+                    continue
+                vistos.add(id(cell._tc))
+                paragrafos.extend(cell.paragraphs)
+
+    return paragrafos
+
+
+def calcular_hash(caminho):
+    """Calcula o SHA-256 do arquivo"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(65536), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+class SlotDinamico:
+    """
+    Parágrafo do template que contém placeholders.
+
+    Attributes:
+        indice: Posição do parágrafo em listar_paragrafos()
+        texto: Texto do parágrafo no template
+        spans: Lista de tuplas (inicio, fim, placeholder) dentro do texto
+    """
+
+    __slots__ = ('indice', 'texto', 'spans')
+
+    def __init__(self, indice, texto, spans):
+        self.indice = indice
+        self.texto = texto
+        self.spans = spans
+
+    @property
+    def placeholders(self):
+        """Placeholders presentes no parágrafo"""
+        return [placeholder for _, _, placeholder in self.spans]
+
+
+class TemplateCarregado:
+    """
+    Template parseado e compilado.
+
+    Cada parágrafo é classificado como:
+      - slot dinâmico: tem placeholders, é reescrito em cada contrato;
+      - negrito: só tem palavras de PALAVRAS_NEGRITO, é formatado uma única
+        vez no documento original (ver preparar_negrito);
+      - estático: nunca é tocado, sai idêntico ao template.
+
+    O documento original é guardado pela sua DocumentPart e nunca é acessado
+    por objetos do python-docx que fiquem vivos (doc.paragraphs etc.): esses
+    objetos guardam elementos XML internos que o deepcopy do lxml copiaria
+    soltos da árvore.
+    """
+
+    def __init__(self, caminho, documento, mtime_ns, tamanho, hash_arquivo):
+        self.caminho = caminho
+        self._parte = documento.part
+        self.mtime_ns = mtime_ns
+        self.tamanho = tamanho
+        self.hash = hash_arquivo
+
+        self.slots = []
+        self.paragrafos_corpo = 0
+        self.com_negrito = []
+        self.estaticos = []
+        self.negrito_preparado = False
+        self._lock = threading.Lock()
+        self._compilar()
+
+    def _compilar(self):
+        """Classifica cada parágrafo do template e monta os slots"""
+        documento = self._parte.document
+        # Em listar_paragrafos, os parágrafos de tabelas vêm depois destes
+        self.paragrafos_corpo = len(documento.paragraphs)
+
+        for indice, paragraph in enumerate(listar_paragrafos(documento)):
+            texto = paragraph.text
+            spans = [(m.start(), m.end(), m.group()) for m in PADRAO_PLACEHOLDER.finditer(texto)]
+
+            if spans:
+                self.slots.append(SlotDinamico(indice, texto, spans))
+            elif MATCHER_PADRAO.contem(texto):
+                self.com_negrito.append(indice)
+            else:
+                self.estaticos.append(indice)
+
+    def em_tabela(self, slot):
+        """Indica se o slot é um parágrafo dentro de tabela"""
+        return slot.indice >= self.paragrafos_corpo
+
+    @property
+    def com_placeholders(self):
+        """Índices dos parágrafos com placeholders"""
+        return [slot.indice for slot in self.slots]
+
+    @property
+    def placeholders(self):
+        """Conjunto de placeholders usados no template"""
+        return {placeholder for slot in self.slots for placeholder in slot.placeholders}
+
+    def preparar_negrito(self, processar):
+        """
+        Aplica uma única vez, no documento original, a formatação dos
+        parágrafos que só têm palavras em negrito (sem placeholders).
+
+        Args:
+            processar: Função que recebe o Paragraph e o reescreve
+        """
+        if self.negrito_preparado:
+            return
+
+        with self._lock:
+            if self.negrito_preparado:
+                return
+
+            paragrafos = listar_paragrafos(self._parte.document)
+            for indice in self.com_negrito:
+                processar(paragrafos[indice])
+
+            self.negrito_preparado = True
+
+    def clonar(self):
+        """Devolve uma cópia independente do documento, pronta para edição"""
+        return copy.deepcopy(self._parte).document
+
+
+class CacheTemplates:
+    """
+    Cache de TemplateCarregado indexado pelo caminho do arquivo.
+
+    A cada acesso é feito apenas um os.stat. Se o mtime ou o tamanho mudaram,
+    o hash é recalculado; o template só é reparseado se o conteúdo mudou.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+        self.carregamentos = 0
+        self.acertos = 0
+
+    def obter(self, template_path):
+        """Devolve o TemplateCarregado, carregando-o se necessário"""
+        caminho = os.path.abspath(template_path)
+
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(f"Template não encontrado: {template_path}")
+
+        info = os.stat(caminho)
+
+        with self._lock:
+            template = self._templates.get(caminho)
+
+            if template is not None:
+                if (template.mtime_ns, template.tamanho) == (info.st_mtime_ns, info.st_size):
+                    self.acertos += 1
+                    return template
+
+                # Arquivo tocado: só recarrega se o conteúdo mudou
+                if calcular_hash(caminho) == template.hash:
+                    template.mtime_ns = info.st_mtime_ns
+                    self.acertos += 1
+                    return template
+
+            template = TemplateCarregado(
+                caminho,
+                Document(caminho),
+                info.st_mtime_ns,
+                info.st_size,
+                calcular_hash(caminho),
+            )
+            self._templates[caminho] = template
+            self.carregamentos += 1
+            return template
+
+    def clonar(self, template_path):
+        """Atalho: cópia pronta para edição do template"""
+        return self.obter(template_path).clonar()
+
+    def invalidar(self, template_path=None):
+        """Remove um template (ou todos) do cache"""
+        with self._lock:
+            if template_path is None:
+                self._templates.clear()
+            else:
+                self._templates.pop(os.path.abspath(template_path), None)
+
+
+# Cache compartilhado pelo processo
+CACHE_TEMPLATES = CacheTemplates()
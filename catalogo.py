@@ -0,0 +1,224 @@
+# catalogo.py
+"""
+Catálogo dos templates de contrato
+
+Os documentos disponíveis são declarados em templates/manifest.json:
+
+    {"templates": [
+        {"id": "PROCURACAO", "arquivo": "PROCURACAO_MODEL.docx",
+         "nome": "Procuração", "placeholders": ["{{NOME_COMPLETO}}", ...]},
+        ...
+    ]}
+
+Qualquer outro .docx da pasta entra no catálogo depois dos declarados, com
+id e nome derivados do nome do arquivo. Para incluir um novo tipo de
+documento basta colocar o template na pasta (e, se quiser um nome de
+exibição, declará-lo no manifest).
+
+Os chamadores escolhem quais documentos gerar pelos ids
+(CATALOGO.pares(['PROCURACAO'])); sem seleção, são gerados todos. O
+template compilado (slots e parágrafos de negrito) vem do cache de
+templates e só é montado no primeiro uso; nesse momento, os placeholders
+declarados no manifest são conferidos com os do template (ver conferir).
+"""
+
+import json
+import os
+import threading
+import weakref
+
+PASTA_TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+ARQUIVO_MANIFESTO = "manifest.json"
+
+
+def identificador(template_path):
+    """
+    Id do documento a partir do nome do template
+    Ex: templates/TERMO DE CONFIDENCIALIDADE_MODEL.docx -> TERMO_DE_CONFIDENCIALIDADE
+    """
+    nome_base = os.path.splitext(os.path.basename(template_path))[0]
+    return nome_base.replace(" ", "_").replace("_MODEL", "")
+
+
+class EntradaCatalogo:
+    """
+    Um documento do catálogo.
+
+    Attributes:
+        codigo: Identificador usado para selecionar o documento (ex.: PROCURACAO)
+        nome: Nome de exibição (ex.: Procuração)
+        caminho: Caminho absoluto do template
+        placeholders_declarados: Placeholders listados no manifest (ou None)
+    """
+
+    __slots__ = ('codigo', 'nome', 'caminho', 'placeholders_declarados')
+
+    def __init__(self, codigo, nome, caminho, placeholders_declarados=None):
+        self.codigo = codigo
+        self.nome = nome
+        self.caminho = caminho
+        self.placeholders_declarados = placeholders_declarados
+
+    def __repr__(self):
+        return f"EntradaCatalogo({self.codigo!r}, {self.nome!r})"
+
+    @property
+    def existe(self):
+        return os.path.exists(self.caminho)
+
+
+class CatalogoTemplates:
+    """
+    Documentos disponíveis numa pasta de templates, na ordem do manifest
+    seguida dos demais .docx da pasta em ordem alfabética.
+
+    O manifest e a pasta só são lidos no primeiro acesso (ver recarregar).
+    """
+
+    def __init__(self, pasta=PASTA_TEMPLATES):
+        self.pasta = pasta
+        self._entradas = None
+        self._lock = threading.Lock()
+        # Templates (TemplateCarregado) já conferidos com o manifest; um
+        # template recarregado pelo cache é conferido de novo
+        self._conferidos = weakref.WeakSet()
+
+    def _ler_manifesto(self):
+        caminho = os.path.join(self.pasta, ARQUIVO_MANIFESTO)
+        if not os.path.exists(caminho):
+            return []
+
+        try:
+            with open(caminho, encoding='utf-8') as arquivo:
+                declarados = json.load(arquivo)['templates']
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Manifest de templates inválido ({caminho}): {str(e)}")
+
+        entradas = []
+        for declarado in declarados:
+            arquivo = declarado['arquivo']
+            entradas.append(EntradaCatalogo(
+                declarado.get('id') or identificador(arquivo),
+                declarado.get('nome') or identificador(arquivo).replace("_", " "),
+                os.path.join(self.pasta, arquivo),
+                declarado.get('placeholders'),
+            ))
+        return entradas
+
+    def _carregar(self):
+        entradas = self._ler_manifesto()
+        declarados = {os.path.basename(entrada.caminho) for entrada in entradas}
+
+        if os.path.isdir(self.pasta):
+            for arquivo in sorted(os.listdir(self.pasta)):
+                # ~$ são arquivos de bloqueio do Word
+                if not arquivo.endswith('.docx') or arquivo.startswith('~$') or arquivo in declarados:
+                    continue
+                entradas.append(EntradaCatalogo(
+                    identificador(arquivo),
+                    identificador(arquivo).replace("_", " "),
+                    os.path.join(self.pasta, arquivo),
+                ))
+
+        codigos = [entrada.codigo for entrada in entradas]
+        repetidos = sorted({codigo for codigo in codigos if codigos.count(codigo) > 1})
+        if repetidos:
+            raise ValueError(f"Ids de documento repetidos no catálogo: {', '.join(repetidos)}")
+
+        return entradas
+
+    @property
+    def entradas(self):
+        """Lista de EntradaCatalogo"""
+        if self._entradas is None:
+            with self._lock:
+                if self._entradas is None:
+                    self._entradas = self._carregar()
+        return self._entradas
+
+    def recarregar(self):
+        """Relê o manifest e a pasta no próximo acesso"""
+        with self._lock:
+            self._entradas = None
+            self._conferidos = weakref.WeakSet()
+
+    def conferir(self, template):
+        """
+        Confere os placeholders declarados no manifest com os usados no
+        template (TemplateCarregado), uma vez por template carregado.
+        Templates fora do catálogo ou sem declaração não são conferidos.
+
+        Raises:
+            ValueError: O manifest não corresponde ao template
+        """
+        if template in self._conferidos:
+            return
+
+        caminho = os.path.abspath(template.caminho)
+        for entrada in self.entradas:
+            if entrada.placeholders_declarados is None or os.path.abspath(entrada.caminho) != caminho:
+                continue
+
+            declarados = set(entrada.placeholders_declarados)
+            usados = template.placeholders
+            if declarados != usados:
+                diferencas = []
+                if usados - declarados:
+                    diferencas.append(f"não declarados: {', '.join(sorted(usados - declarados))}")
+                if declarados - usados:
+                    diferencas.append(f"ausentes do template: {', '.join(sorted(declarados - usados))}")
+                raise ValueError(
+                    f"Placeholders do manifest não conferem com {os.path.basename(caminho)} "
+                    f"({'; '.join(diferencas)})"
+                )
+
+        self._conferidos.add(template)
+
+    def __iter__(self):
+        return iter(self.entradas)
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def __contains__(self, codigo):
+        return any(entrada.codigo == codigo for entrada in self.entradas)
+
+    @property
+    def ids(self):
+        return [entrada.codigo for entrada in self.entradas]
+
+    def obter(self, codigo):
+        """Entrada pelo id"""
+        for entrada in self.entradas:
+            if entrada.codigo == codigo:
+                return entrada
+        raise ValueError(f"Documento desconhecido: {codigo} (use {', '.join(self.ids)})")
+
+    def selecionar(self, ids=None):
+        """
+        Entradas dos documentos pedidos, na ordem do catálogo.
+
+        Args:
+            ids: Ids dos documentos, ou None para todos
+        """
+        if ids is None:
+            return list(self.entradas)
+
+        pedidos = set(ids)
+        for codigo in pedidos:
+            self.obter(codigo)
+        return [entrada for entrada in self.entradas if entrada.codigo in pedidos]
+
+    def pares(self, ids=None):
+        """Lista [(template_path, nome_contrato), ...] dos documentos pedidos"""
+        return [(entrada.caminho, entrada.nome) for entrada in self.selecionar(ids)]
+
+
+def separar_ids(texto):
+    """Lista de ids a partir de "PROCURACAO,TERMO_DE_CONFIDENCIALIDADE" (None se vazio)"""
+    ids = [codigo.strip() for codigo in (texto or '').split(',') if codigo.strip()]
+    return ids or None
+
+
+# Catálogo da pasta templates/ do projeto
+CATALOGO = CatalogoTemplates()
@@ -39,7 +39,7 @@ SIGLAS_ESTADOS = {
     'AC': 'Acre', 'AL': 'Alagoas', 'AP': 'Amapá', 'AM': 'Amazonas',
     'BA': 'Bahia', 'CE': 'Ceará', 'DF': 'Distrito Federal', 'ES': 'Espírito Santo',
     'GO': 'Goiás', 'MA': 'Maranhão', 'MT': 'Mato Grosso', 'MS': 'Mato Grosso do Sul',
-    'MG': 'Mato Grosso', 'PA': 'Pará', 'PB': 'Paraíba', 'PR': 'Paraná',
+    'MG': 'Minas Gerais', 'PA': 'Pará', 'PB': 'Paraíba', 'PR': 'Paraná',
     'PE': 'Pernambuco', 'PI': 'Piauí', 'RJ': 'Rio de Janeiro', 'RN': 'Rio Grande do Norte',
     'RS': 'Rio Grande do Sul', 'RO': 'Rondônia', 'RR': 'Roraima', 'SC': 'Santa Catarina',
     'SP': 'São Paulo', 'SE': 'Sergipe', 'TO': 'Tocantins'
@@ -73,6 +73,7 @@ ABREVIACOES = {
     'número': 'nº',
     'numero': 'nº',
     'n°': 'nº',
+    'nº': 'nº',
     'apartamento': 'apto',
     'apto': 'apto',
     'apartmento': 'apto',
@@ -84,6 +85,22 @@ ABREVIACOES = {
     'cj': 'cj.'
 }
 
+# Abreviações de tipos de logradouro com mais de uma palavra
+# (têm prioridade sobre as abreviações de uma palavra só)
+ABREVIACOES_COMPOSTAS = {
+    'estrada municipal': 'Est. Mun.',
+    'rodovia estadual': 'Rod. Est.',
+    'rodovia federal': 'Rod. Fed.',
+    'conjunto habitacional': 'cj. Hab.',
+    'conjunto residencial': 'cj. Res.',
+    'parque residencial': 'Pq. Res.',
+    'núcleo habitacional': 'Núcl. Hab.',
+    'nucleo habitacional': 'Núcl. Hab.',
+}
+
+# Endereços normalizados mantidos em cache (ver normalizador_endereco.py)
+CACHE_ENDERECOS_TAMANHO = 65536
+
 # Palavras/frases que DEVEM ficar em negrito (não são placeholders)
 PALAVRAS_NEGRITO = [
     "OUTORGANTE:",
@@ -101,4 +118,44 @@ PALAVRAS_NEGRITO = [
     "OUTORGANTE",
     "OUTORGADOS",
     "SOCIEDADE",
-]
\ No newline at end of file
+]
+
+# Pasta dos contratos gerados, com subpastas por data e por pessoa
+# (output/AAAA-MM-DD/NOME_DA_PESSOA/, ver escritor.py)
+PASTA_SAIDA = "output"
+SAIDA_PARTICIONADA = True
+
+# Cache de documentos já gerados (ver cache_resultados.py). Os contratos em
+# output/ que vieram do cache podem ser hard links para os artefatos desta
+# pasta (mesmo inode, mesmo conteúdo): por isso ela fica dentro de
+# PASTA_SAIDA, junto dos contratos e no mesmo sistema de arquivos, e não
+# numa .cache/ solta em qualquer pasta de onde o programa seja chamado
+CACHE_RESULTADOS_ATIVO = True
+CACHE_RESULTADOS_PASTA = f"{PASTA_SAIDA}/.cache/resultados"
+CACHE_RESULTADOS_LIMITE_MB = 512
+
+# Backend de renderização: 'docx' (python-docx) ou 'xml' (emenda direta do
+# document.xml, ver renderizador_xml.py)
+BACKEND_PADRAO = 'docx'
+BACKENDS = ('docx', 'xml')
+
+# Mapa de slots gravado ao lado de cada contrato (<arquivo>.docx.slots.json),
+# usado para corrigir campos sem gerar o documento de novo (ver reedicao.py)
+MAPA_SLOTS_ATIVO = True
+
+# Exportação para PDF (ver exportar_pdf.py): conversor 'auto' (uno se o
+# módulo do LibreOffice estiver instalado, senão soffice), 'uno', 'soffice'
+# ou 'stub'; número de conversores no pool e tempo limite por arquivo
+PDF_CONVERSOR = 'auto'
+PDF_PROCESSOS = 2
+SOFFICE_COMANDO = 'soffice'
+PDF_TEMPO_LIMITE = 120
+
+# Placeholders próprios de cada signatário: num documento com vários
+# signatários (ver signatarios.py), os parágrafos que usam algum deles são
+# repetidos uma vez por signatário; os demais usam os dados do primeiro
+PLACEHOLDERS_SIGNATARIO = {
+    "{{NOME_COMPLETO}}", "{{NOME_ASSINATURA}}", "{{CPF}}", "{{CPF_OUTORGANTE}}",
+    "{{ENDERECO_COMPLETO}}", "{{CIDADE_ESTADO}}", "{{ENDERECO_CIDADE}}", "{{ENDERECO_ESTADO}}",
+    "{{OAB_NUMERO}}", "{{OAB_UF}}", "{{ESTADO_CIVIL}}",
+}
@@ -0,0 +1,193 @@
+# diario.py
+"""
+Diário de jobs do lote, para retomar uma geração interrompida
+
+Cada par (pessoa, documento) gerado pelo lote é registrado num banco SQLite
+local com o estado (concluido/falhou), o caminho do arquivo, o SHA-256 do
+conteúdo e o número de tentativas. A pessoa é identificada pelo hash da
+linha crua da planilha, não pelo número da linha nem pelos dados já
+formatados (uma data em branco vira a data do dia, e o lote retomado no dia
+seguinte refaria tudo): se a planilha for corrigida, a linha alterada é
+gerada de novo.
+
+Ao rodar o mesmo lote com o mesmo diário, os documentos concluídos cujo
+arquivo ainda existe são pulados; os que falharam (ou nem chegaram a rodar)
+são gerados. Com verificar=True, o SHA-256 do arquivo também é conferido.
+
+As escritas são agrupadas em transações (a cada TAMANHO_TRANSACAO registros
+ou INTERVALO_TRANSACAO segundos), em modo WAL: uma queda perde no máximo a
+última transação, e esses documentos são apenas gerados de novo.
+
+Uso:
+    python lote.py roster.csv --diario lote.db      (grava e retoma)
+    python diario.py lote.db                        (resumo e falhas)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+
+TAMANHO_TRANSACAO = 500
+INTERVALO_TRANSACAO = 2.0
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    pessoa TEXT NOT NULL,
+    documento TEXT NOT NULL,
+    linha INTEGER,
+    nome TEXT,
+    estado TEXT NOT NULL,
+    caminho TEXT,
+    hash TEXT,
+    tentativas INTEGER NOT NULL DEFAULT 1,
+    atualizado REAL NOT NULL,
+    PRIMARY KEY (pessoa, documento)
+)
+"""
+
+
+def chave_pessoa(linha):
+    """Identificador da pessoa: SHA-1 da linha crua da planilha (independe da ordem das colunas)"""
+    conteudo = json.dumps(linha, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def hash_arquivo(caminho):
+    """SHA-256 do arquivo gerado"""
+    from cache_templates import calcular_hash
+    return calcular_hash(caminho)
+
+
+class DiarioLote:
+    """
+    Diário SQLite dos jobs (pessoa, documento) de um lote.
+
+    Args:
+        caminho: Arquivo do banco (criado se não existir)
+        verificar: Ao retomar, confere o SHA-256 dos arquivos concluídos
+    """
+
+    def __init__(self, caminho, verificar=False):
+        self.caminho = caminho
+        self.verificar = verificar
+        self._conexao = sqlite3.connect(caminho)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute(_ESQUEMA)
+        self._conexao.commit()
+
+        self._nao_gravados = 0
+        self._ultima_gravacao = time.monotonic()
+
+    def concluidos(self, pessoa):
+        """
+        Documentos já concluídos da pessoa cujo arquivo ainda está lá.
+
+        Returns:
+            Dicionário {id do documento: caminho}
+        """
+        linhas = self._conexao.execute(
+            "SELECT documento, caminho, hash FROM jobs WHERE pessoa = ? AND estado = ?", (pessoa, CONCLUIDO),
+        )
+        prontos = {}
+        for documento, caminho, hash_salvo in linhas:
+            if not caminho or not os.path.exists(caminho):
+                continue
+            if self.verificar and hash_arquivo(caminho) != hash_salvo:
+                continue
+            prontos[documento] = caminho
+        return prontos
+
+    def pendentes(self, linha, entradas):
+        """
+        Separa os documentos da pessoa em prontos e a gerar.
+
+        Args:
+            linha: Linha crua da planilha (ver chave_pessoa)
+            entradas: EntradaCatalogo dos documentos pedidos
+
+        Returns:
+            Tupla (chave da pessoa, {id: caminho} dos prontos, entradas a gerar)
+        """
+        pessoa = chave_pessoa(linha)
+        prontos = self.concluidos(pessoa)
+        return pessoa, prontos, [entrada for entrada in entradas if entrada.codigo not in prontos]
+
+    def registrar(self, pessoa, documento, caminho, linha=None, nome=None):
+        """Registra o resultado de um job (caminho None = falhou)"""
+        estado = CONCLUIDO if caminho else FALHOU
+        hash_conteudo = hash_arquivo(caminho) if caminho else None
+
+        self._conexao.execute(
+            """
+            INSERT INTO jobs (pessoa, documento, linha, nome, estado, caminho, hash, atualizado)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (pessoa, documento) DO UPDATE SET
+                linha = excluded.linha, nome = excluded.nome, estado = excluded.estado,
+                caminho = excluded.caminho, hash = excluded.hash, atualizado = excluded.atualizado,
+                tentativas = jobs.tentativas + 1
+            """,
+            (pessoa, documento, linha, nome, estado, caminho, hash_conteudo, time.time()),
+        )
+
+        self._nao_gravados += 1
+        if (self._nao_gravados >= TAMANHO_TRANSACAO
+                or time.monotonic() - self._ultima_gravacao >= INTERVALO_TRANSACAO):
+            self.gravar()
+
+    def gravar(self):
+        """Confirma os registros pendentes"""
+        self._conexao.commit()
+        self._nao_gravados = 0
+        self._ultima_gravacao = time.monotonic()
+
+    def resumo(self):
+        """Dicionário {estado: número de jobs}"""
+        return dict(self._conexao.execute("SELECT estado, COUNT(*) FROM jobs GROUP BY estado"))
+
+    def falhas(self):
+        """Lista [(linha, nome, documento, tentativas), ...] dos jobs que falharam"""
+        return list(self._conexao.execute(
+            "SELECT linha, nome, documento, tentativas FROM jobs WHERE estado = ? ORDER BY linha, documento",
+            (FALHOU,),
+        ))
+
+    def fechar(self):
+        self.gravar()
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Uso: python diario.py lote.db")
+        return 1
+
+    if not os.path.exists(argv[0]):
+        print(f"❌ Diário não encontrado: {argv[0]}")
+        return 1
+
+    with DiarioLote(argv[0]) as diario:
+        resumo = diario.resumo()
+        falhas = diario.falhas()
+
+    print(f"📒 {resumo.get(CONCLUIDO, 0)} concluídos, {resumo.get(FALHOU, 0)} com falha")
+    for linha, nome, documento, tentativas in falhas:
+        print(f"  ✗ Linha {linha}: {nome} - {documento} ({tentativas} tentativa(s))")
+    return 0 if not falhas else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# escritor.py
+"""
+Gravação dos contratos gerados em output/
+
+Cada arquivo recebe um nome único, com o timestamp (legível) e um id
+aleatório curto:
+
+    output/2025-12-23/MARIA_DA_SILVA/PROCURACAO_MARIA_DA_SILVA_20251223_215508_1a2b3c4d.docx
+
+e fica numa subpasta por data e por pessoa, para que nenhuma pasta acumule
+centenas de milhares de arquivos (com SAIDA_PARTICIONADA desligado, tudo vai
+direto para output/, ainda com nomes únicos).
+
+O conteúdo é escrito num arquivo temporário na mesma pasta e publicado com
+um hard link para o nome final, que falha se o nome já existir: quem lê
+output/ nunca vê um arquivo pela metade, e dois processos (ou threads) que
+gerem o mesmo documento no mesmo segundo não se sobrescrevem; quem perde a
+disputa tenta de novo com outro id. Em sistemas de arquivos sem hard link,
+o nome é reservado com O_EXCL e o temporário é trocado por ele com
+os.replace.
+"""
+
+import contextlib
+import os
+import re
+import threading
+import uuid
+from datetime import datetime
+
+from config import PASTA_SAIDA, SAIDA_PARTICIONADA
+
+# Tentativas de nome antes de desistir (cada uma com outro id)
+TENTATIVAS = 20
+
+# Tudo que não for letra, número, ponto, hífen ou sublinhado vira "_"
+_NAO_PERMITIDO = re.compile(r'[^\w.-]+')
+
+
+def parte_segura(texto, padrao='SEM_NOME'):
+    """Trecho de nome de arquivo sem separadores de pasta nem espaços"""
+    texto = _NAO_PERMITIDO.sub('_', str(texto or '').strip()).lstrip('.')
+    return texto or padrao
+
+
+def novo_id():
+    """Id aleatório curto, que diferencia arquivos do mesmo segundo"""
+    return uuid.uuid4().hex[:8]
+
+
+def _temporario(caminho):
+    pasta, nome = os.path.split(caminho)
+    return os.path.join(pasta, f".{nome}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+@contextlib.contextmanager
+def destino_atomico(caminho):
+    """
+    Caminho temporário na pasta de `caminho`, trocado por ele (os.replace)
+    só se o bloco terminar sem erro; senão o temporário é removido.
+    """
+    temporario = _temporario(caminho)
+    try:
+        yield temporario
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def gravar_atomico(caminho, conteudo):
+    """
+    Grava os bytes por inteiro ou não grava (temporário + os.replace).
+    Um arquivo existente é substituído de uma vez.
+    """
+    with destino_atomico(caminho) as temporario:
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(conteudo)
+
+
+class EscritorSaida:
+    """
+    Grava arquivos de saída com nome único, de forma atômica.
+
+    Args:
+        pasta: Pasta raiz da saída
+        particionar: Cria subpastas por data e por pessoa
+    """
+
+    def __init__(self, pasta=PASTA_SAIDA, particionar=SAIDA_PARTICIONADA):
+        self.pasta = pasta
+        self.particionar = particionar
+
+    def pasta_de(self, pessoa, quando=None):
+        """Pasta onde ficam os arquivos da pessoa (ex.: output/2025-12-23/MARIA_DA_SILVA)"""
+        if not self.particionar:
+            return self.pasta
+        quando = quando or datetime.now()
+        return os.path.join(self.pasta, quando.strftime("%Y-%m-%d"), parte_segura(pessoa))
+
+    @staticmethod
+    def nome(documento, pessoa, extensao='.docx', quando=None):
+        """Nome único do arquivo: DOCUMENTO_PESSOA_AAAAMMDD_HHMMSS_id.docx"""
+        timestamp = (quando or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        return f"{parte_segura(documento)}_{parte_segura(pessoa)}_{timestamp}_{novo_id()}{extensao}"
+
+    def salvar(self, escrever, documento, pessoa, extensao='.docx', nome=None):
+        """
+        Grava um arquivo novo.
+
+        Args:
+            escrever: Função que recebe um caminho temporário e grava nele
+                o conteúdo (ex.: doc.save)
+            documento: Id do documento (ex.: PROCURACAO)
+            pessoa: Nome da pessoa (também é o nome da subpasta)
+            nome: Nome de arquivo já escolhido com self.nome (se estiver em
+                uso, outro é gerado)
+
+        Returns:
+            Caminho do arquivo publicado
+        """
+        quando = datetime.now()
+        pasta = self.pasta_de(pessoa, quando)
+        os.makedirs(pasta, exist_ok=True)
+
+        nome = nome or self.nome(documento, pessoa, extensao, quando)
+        temporario = _temporario(os.path.join(pasta, nome))
+        try:
+            escrever(temporario)
+            return self._publicar(temporario, pasta, nome, documento, pessoa, extensao)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    def gravar(self, conteudo, documento, pessoa, extensao='.docx', nome=None):
+        """Igual a salvar, com os bytes do arquivo"""
+        def escrever(caminho):
+            with open(caminho, 'wb') as arquivo:
+                arquivo.write(conteudo)
+
+        return self.salvar(escrever, documento, pessoa, extensao, nome)
+
+    def _publicar(self, temporario, pasta, nome, documento, pessoa, extensao):
+        """Dá ao temporário um nome que ninguém mais esteja usando"""
+        for _ in range(TENTATIVAS):
+            destino = os.path.join(pasta, nome)
+            try:
+                os.link(temporario, destino)
+                return destino
+            except FileExistsError:
+                pass
+            except OSError:
+                # Sem hard link: reserva o nome e troca o conteúdo de uma vez
+                try:
+                    os.close(os.open(destino, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                except FileExistsError:
+                    pass
+                else:
+                    os.replace(temporario, destino)
+                    return destino
+
+            nome = self.nome(documento, pessoa, extensao)
+
+        raise FileExistsError(f"Não foi possível escolher um nome livre em {pasta}")
+
+
+# Saída padrão do processo (output/ no diretório atual)
+ESCRITOR = EscritorSaida()
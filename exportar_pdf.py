@@ -0,0 +1,449 @@
+# exportar_pdf.py
+"""
+Exportação dos contratos gerados para PDF
+
+Os .docx são convertidos por um pool de conversores de vida longa: cada
+conversor é criado uma vez e atende uma fila de jobs, em vez de abrir um
+processo por arquivo. Os jobs são convertidos em paralelo, um por conversor.
+
+Conversores:
+    uno      LibreOffice headless em modo listener (soffice --accept=...),
+             um processo por conversor, controlado pela API UNO (precisa do
+             módulo uno, que vem com o LibreOffice)
+    soffice  LibreOffice headless chamado a cada arquivo, para quando o
+             módulo uno não está disponível; cada conversor tem o seu
+             perfil, de modo que vários rodam ao mesmo tempo
+    stub     Conversor local, sem LibreOffice, que grava um PDF mínimo com
+             o nome do arquivo (testes e benchmarks)
+    auto     uno se o módulo estiver instalado, senão soffice
+
+Uso:
+    with PoolConversores('stub', processos=4) as pool:
+        for docx, pdf, erro in pool.converter_todos(caminhos):
+            ...
+
+    python exportar_pdf.py output/2025-12-23/*/*.docx --conversor soffice --processos 4
+"""
+
+import argparse
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from config import PDF_CONVERSOR, PDF_PROCESSOS, PDF_TEMPO_LIMITE, SOFFICE_COMANDO
+from escritor import destino_atomico
+from logs import obter_logger
+
+CONVERSORES = ('auto', 'uno', 'soffice', 'stub')
+
+log = obter_logger('pdf')
+
+
+class ConversorIndisponivel(RuntimeError):
+    """O conversor não pode ser usado neste ambiente"""
+
+
+def caminho_pdf(caminho_docx):
+    """Caminho do PDF ao lado do .docx"""
+    return os.path.splitext(caminho_docx)[0] + '.pdf'
+
+
+def pdf_minimo(texto):
+    """PDF de uma página com uma linha de texto (Helvetica)"""
+    texto = texto.encode('latin-1', 'replace').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    conteudo = b'BT /F1 12 Tf 72 770 Td (' + texto + b') Tj ET'
+
+    objetos = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length ' + str(len(conteudo)).encode() + b' >>\nstream\n' + conteudo + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+
+    partes = [b'%PDF-1.4\n']
+    posicoes = []
+    for numero, objeto in enumerate(objetos, start=1):
+        posicoes.append(sum(len(parte) for parte in partes))
+        partes.append(f'{numero} 0 obj\n'.encode() + objeto + b'\nendobj\n')
+
+    inicio_xref = sum(len(parte) for parte in partes)
+    partes.append(f'xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n'.encode())
+    partes.extend(f'{posicao:010d} 00000 n \n'.encode() for posicao in posicoes)
+    partes.append(f'trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n'.encode())
+    return b''.join(partes)
+
+
+class ConversorStub:
+    """
+    Conversor de testes: grava um PDF mínimo com o nome do .docx.
+
+    Args:
+        atraso: Segundos de espera por arquivo, para simular o custo de uma
+            conversão real
+    """
+
+    def __init__(self, atraso=0.0):
+        self.atraso = atraso
+        self.convertidos = 0
+
+    def converter(self, caminho_docx, destino):
+        if not os.path.exists(caminho_docx):
+            raise FileNotFoundError(f"Documento não encontrado: {caminho_docx}")
+        if self.atraso:
+            time.sleep(self.atraso)
+        with destino_atomico(destino) as temporario:
+            with open(temporario, 'wb') as arquivo:
+                arquivo.write(pdf_minimo(os.path.basename(caminho_docx)))
+        self.convertidos += 1
+
+    def fechar(self):
+        pass
+
+
+def _executavel(comando):
+    executavel = shutil.which(comando)
+    if executavel is None:
+        raise ConversorIndisponivel(f"LibreOffice não encontrado: {comando}")
+    return executavel
+
+
+class ConversorSoffice:
+    """
+    LibreOffice headless chamado a cada arquivo (--convert-to pdf).
+
+    O perfil próprio (-env:UserInstallation) permite vários conversores ao
+    mesmo tempo; sem ele, o segundo soffice só repassaria o pedido ao
+    primeiro.
+    """
+
+    def __init__(self, comando=SOFFICE_COMANDO, tempo_limite=PDF_TEMPO_LIMITE):
+        self.executavel = _executavel(comando)
+        self.tempo_limite = tempo_limite
+        self._perfil = tempfile.mkdtemp(prefix='contratos_soffice_')
+
+    def converter(self, caminho_docx, destino):
+        with tempfile.TemporaryDirectory(prefix='contratos_pdf_') as saida:
+            processo = subprocess.run(
+                [self.executavel, '--headless', '--norestore', '--nologo',
+                 f'-env:UserInstallation={Path(self._perfil).as_uri()}',
+                 '--convert-to', 'pdf', '--outdir', saida, os.path.abspath(caminho_docx)],
+                capture_output=True, text=True, timeout=self.tempo_limite,
+            )
+            gerado = os.path.join(saida, Path(caminho_docx).stem + '.pdf')
+            if processo.returncode != 0 or not os.path.exists(gerado):
+                raise RuntimeError(f"soffice falhou ({processo.returncode}): {processo.stderr.strip()}")
+            with destino_atomico(destino) as temporario:
+                shutil.move(gerado, temporario)
+
+    def fechar(self):
+        shutil.rmtree(self._perfil, ignore_errors=True)
+
+
+def _porta_livre():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class ConversorUno:
+    """
+    Processo LibreOffice em modo listener, controlado pela API UNO.
+
+    O processo sobe na criação do conversor e a conexão é feita no primeiro
+    arquivo, de modo que os conversores de um pool sobem em paralelo.
+    """
+
+    def __init__(self, comando=SOFFICE_COMANDO, tempo_limite=PDF_TEMPO_LIMITE, porta=None):
+        try:
+            import uno
+        except ImportError:
+            raise ConversorIndisponivel("Módulo uno do LibreOffice não instalado")
+
+        self._uno = uno
+        self.tempo_limite = tempo_limite
+        self.porta = porta or _porta_livre()
+        self._perfil = tempfile.mkdtemp(prefix='contratos_uno_')
+        self._desktop = None
+        self._processo = subprocess.Popen(
+            [_executavel(comando), '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+             f'-env:UserInstallation={Path(self._perfil).as_uri()}',
+             f'--accept=socket,host=127.0.0.1,port={self.porta};urp;StarOffice.ComponentContext'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def _conectar(self):
+        local = self._uno.getComponentContext()
+        resolvedor = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        url = f"uno:socket,host=127.0.0.1,port={self.porta};urp;StarOffice.ComponentContext"
+        limite = time.monotonic() + self.tempo_limite
+
+        while True:
+            try:
+                contexto = resolvedor.resolve(url)
+                return contexto.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", contexto)
+            except Exception:
+                if self._processo.poll() is not None:
+                    raise RuntimeError(f"LibreOffice terminou ao iniciar (código {self._processo.returncode})")
+                if time.monotonic() > limite:
+                    raise TimeoutError(f"LibreOffice não respondeu na porta {self.porta}")
+                time.sleep(0.2)
+
+    def _propriedades(self, **valores):
+        from com.sun.star.beans import PropertyValue
+
+        propriedades = []
+        for nome, valor in valores.items():
+            propriedade = PropertyValue()
+            propriedade.Name = nome
+            propriedade.Value = valor
+            propriedades.append(propriedade)
+        return tuple(propriedades)
+
+    def converter(self, caminho_docx, destino):
+        if self._desktop is None:
+            self._desktop = self._conectar()
+
+        documento = self._desktop.loadComponentFromURL(
+            self._uno.systemPathToFileUrl(os.path.abspath(caminho_docx)), "_blank", 0,
+            self._propriedades(Hidden=True),
+        )
+        if documento is None:
+            raise RuntimeError(f"LibreOffice não abriu {caminho_docx}")
+
+        # Um LibreOffice derrubado no meio da gravação não deixa PDF truncado
+        try:
+            with destino_atomico(destino) as temporario:
+                documento.storeToURL(
+                    self._uno.systemPathToFileUrl(os.path.abspath(temporario)),
+                    self._propriedades(FilterName="writer_pdf_Export"),
+                )
+        finally:
+            documento.close(True)
+
+    def fechar(self):
+        try:
+            if self._desktop is not None:
+                self._desktop.terminate()
+        except Exception:
+            # A conexão cai quando o LibreOffice encerra
+            pass
+
+        if self._processo.poll() is None:
+            self._processo.terminate()
+            try:
+                self._processo.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._processo.kill()
+                self._processo.wait()
+
+        shutil.rmtree(self._perfil, ignore_errors=True)
+
+
+def criar_conversor(tipo=PDF_CONVERSOR):
+    """Novo conversor do tipo pedido (ver CONVERSORES)"""
+    if tipo == 'auto':
+        try:
+            return ConversorUno()
+        except ConversorIndisponivel:
+            return ConversorSoffice()
+    if tipo == 'uno':
+        return ConversorUno()
+    if tipo == 'soffice':
+        return ConversorSoffice()
+    if tipo == 'stub':
+        return ConversorStub()
+    raise ValueError(f"Conversor desconhecido: {tipo} (use {', '.join(CONVERSORES)})")
+
+
+class PoolConversores:
+    """
+    Fila de conversões atendida por `processos` conversores, cada um numa
+    thread própria (o trabalho pesado roda no processo do LibreOffice).
+
+    Um conversor que falha é recriado e o arquivo é tentado mais uma vez.
+
+    Args:
+        conversor: Tipo de conversor (ver CONVERSORES) ou função sem
+            argumentos que cria um conversor
+        processos: Número de conversores
+    """
+
+    def __init__(self, conversor=PDF_CONVERSOR, processos=PDF_PROCESSOS):
+        self._fabrica = conversor if callable(conversor) else (lambda: criar_conversor(conversor))
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self._fechado = False
+        self.convertidos = 0
+        self.falhas = 0
+
+        # Conversores criados aqui: um LibreOffice ausente falha antes de
+        # qualquer documento ser enviado
+        conversores = []
+        try:
+            for _ in range(max(1, processos)):
+                conversores.append(self._fabrica())
+        except Exception:
+            for criado in conversores:
+                criado.fechar()
+            raise
+
+        self._threads = [
+            threading.Thread(target=self._trabalhar, args=(criado,), name=f"pdf-{numero}", daemon=True)
+            for numero, criado in enumerate(conversores)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def enviar(self, caminho_docx, destino=None):
+        """
+        Põe um .docx na fila.
+
+        Returns:
+            Future com o caminho do PDF
+        """
+        futuro = Future()
+
+        # Sob o lock de fechar: um job nunca entra na fila depois dos sentinelas
+        with self._lock:
+            if self._fechado:
+                raise RuntimeError("Pool de conversores já fechado")
+            self._fila.put((caminho_docx, destino or caminho_pdf(caminho_docx), futuro))
+        return futuro
+
+    def converter_todos(self, caminhos):
+        """
+        Converte vários arquivos.
+
+        Yields:
+            Tuplas (caminho_docx, caminho_pdf ou None, erro ou None), na
+            ordem dos caminhos
+        """
+        futuros = [(caminho, self.enviar(caminho)) for caminho in caminhos]
+        for caminho, futuro in futuros:
+            try:
+                yield caminho, futuro.result(), None
+            except Exception as e:
+                yield caminho, None, str(e)
+
+    def aguardar(self):
+        """Espera todos os jobs já enviados"""
+        self._fila.join()
+
+    def fechar(self):
+        """Espera os jobs pendentes e encerra os conversores"""
+        with self._lock:
+            if self._fechado:
+                return
+            self._fechado = True
+
+            for _ in self._threads:
+                self._fila.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _converter(self, conversor, caminho_docx, destino):
+        """
+        Converte; se o conversor falhar, recria e tenta mais uma vez.
+
+        Returns:
+            Tupla (conversor que continua em uso ou None, erro ou None).
+            Um conversor que falhou sai já fechado; com None, o próximo job
+            cria outro.
+        """
+        if conversor is not None:
+            try:
+                conversor.converter(caminho_docx, destino)
+                return conversor, None
+            except FileNotFoundError as e:
+                return conversor, e
+            except Exception as e:
+                log.warning(f"  ↻ Reiniciando conversor após falha em {os.path.basename(caminho_docx)}: {str(e)}")
+                conversor.fechar()
+
+        try:
+            conversor = self._fabrica()
+        except Exception as e:
+            return None, e
+
+        try:
+            conversor.converter(caminho_docx, destino)
+            return conversor, None
+        except Exception as e:
+            conversor.fechar()
+            return None, e
+
+    def _trabalhar(self, conversor):
+        try:
+            while True:
+                job = self._fila.get()
+                try:
+                    if job is None:
+                        return
+
+                    caminho_docx, destino, futuro = job
+                    if not futuro.set_running_or_notify_cancel():
+                        continue
+
+                    inicio = time.perf_counter()
+                    conversor, erro = self._converter(conversor, caminho_docx, destino)
+                    if erro is not None:
+                        with self._lock:
+                            self.falhas += 1
+                        log.warning(f"  ✗ Falha ao converter {os.path.basename(caminho_docx)}: {str(erro)}", extra={
+                            'evento': 'pdf', 'documento': os.path.basename(caminho_docx), 'resultado': 'falha',
+                        })
+                        futuro.set_exception(erro)
+                        continue
+
+                    with self._lock:
+                        self.convertidos += 1
+                    log.info(f"  📑 PDF: {os.path.basename(destino)}", extra={
+                        'evento': 'pdf', 'documento': os.path.basename(destino),
+                        'duracao': round(time.perf_counter() - inicio, 6), 'resultado': 'convertido',
+                    })
+                    futuro.set_result(destino)
+                finally:
+                    self._fila.task_done()
+        finally:
+            if conversor is not None:
+                conversor.fechar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte contratos .docx para PDF")
+    parser.add_argument("documentos", nargs='+', help="Arquivos .docx")
+    parser.add_argument("--conversor", choices=CONVERSORES, default=PDF_CONVERSOR)
+    parser.add_argument("--processos", type=int, default=PDF_PROCESSOS, help="Conversores em paralelo")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    try:
+        with PoolConversores(args.conversor, args.processos) as pool:
+            resultados = list(pool.converter_todos(args.documentos))
+    except ConversorIndisponivel as e:
+        print(f"❌ {str(e)}")
+        return 1
+
+    falhas = sum(1 for _, pdf, _ in resultados if pdf is None)
+    print(f"\n📊 {len(resultados) - falhas}/{len(resultados)} PDFs em {time.perf_counter() - inicio:.2f} s")
+    return 0 if falhas == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
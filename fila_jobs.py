@@ -0,0 +1,370 @@
+# fila_jobs.py
+"""
+Servidor assíncrono de jobs de geração de contratos
+
+Os formulários de cadastro enviam jobs (o mesmo dicionário produzido por
+ColetorDados.coletar_todos_dados) sem esperar o python-docx. Os jobs entram
+numa fila limitada; quando a fila está cheia o envio espera (ou falha, se o
+cliente não quiser esperar). Um número configurável de workers tira jobs da
+fila e manda o trabalho pesado para um pool de processos.
+
+Tudo roda localmente, sem broker externo. Além da API em Python
+(FilaJobs), há um front-end TCP simples com uma mensagem JSON por linha:
+
+    {"acao": "enviar", "dados": {...}}      -> {"job": "<id>"}
+    {"acao": "status", "job": "<id>"}       -> estado e latências do job
+    {"acao": "resultado", "job": "<id>"}    -> espera e devolve os resultados
+    {"acao": "cancelar", "job": "<id>"}     -> {"cancelado": true/false}
+    {"acao": "metricas"}                    -> totais e latências
+
+Uso:
+    python fila_jobs.py --porta 8765 --concorrencia 4 --fila 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from paralelo import gerar_contratos_processo
+
+# Estados de um job
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+CANCELADO = 'cancelado'
+
+
+class FilaCheia(Exception):
+    """A fila está cheia e o cliente pediu para não esperar"""
+
+
+class JobNaoEncontrado(KeyError):
+    """Identificador de job desconhecido"""
+
+
+class Job:
+    """Um pedido de geração dos contratos de uma pessoa"""
+
+    def __init__(self, dados_pessoa, templates=None):
+        self.id = uuid.uuid4().hex
+        self.dados_pessoa = dados_pessoa
+        self.templates = templates
+        self.estado = PENDENTE
+        self.resultados = None
+        self.erro = None
+
+        self.criado = time.perf_counter()
+        self.iniciado = None
+        self.finalizado = None
+        self.futuro = asyncio.get_running_loop().create_future()
+
+    @property
+    def espera(self):
+        """Segundos na fila até começar a executar"""
+        if self.iniciado is None:
+            return None
+        return self.iniciado - self.criado
+
+    @property
+    def execucao(self):
+        """Segundos de execução"""
+        if self.iniciado is None or self.finalizado is None:
+            return None
+        return self.finalizado - self.iniciado
+
+    @property
+    def latencia(self):
+        """Segundos do envio até o fim"""
+        if self.finalizado is None:
+            return None
+        return self.finalizado - self.criado
+
+    def finalizar(self, estado, resultados=None, erro=None):
+        """Marca o job como terminado e acorda quem espera o resultado"""
+        self.estado = estado
+        self.resultados = resultados
+        self.erro = erro
+        self.finalizado = time.perf_counter()
+
+        if not self.futuro.done():
+            self.futuro.set_result(self)
+
+    def resumo(self):
+        """Estado do job em formato serializável"""
+        return {
+            'job': self.id,
+            'estado': self.estado,
+            'resultados': self.resultados,
+            'erro': self.erro,
+            'espera': self.espera,
+            'execucao': self.execucao,
+            'latencia': self.latencia,
+        }
+
+
+def _percentil(valores, fracao):
+    """Percentil simples (valores já ordenados)"""
+    if not valores:
+        return None
+    return valores[min(len(valores) - 1, int(fracao * len(valores)))]
+
+
+class FilaJobs:
+    """
+    Fila limitada de jobs com workers assíncronos.
+
+    Args:
+        concorrencia: Número de workers (jobs executando ao mesmo tempo)
+        tamanho_fila: Máximo de jobs aguardando na fila
+        executor: Executor para o trabalho pesado (padrão: ProcessPoolExecutor
+            com `concorrencia` processos)
+        historico: Quantos jobs finalizados são mantidos para consulta
+    """
+
+    def __init__(self, concorrencia=2, tamanho_fila=100, executor=None, historico=10000):
+        self.concorrencia = concorrencia
+        self.historico = historico
+        self._fila = asyncio.Queue(maxsize=tamanho_fila)
+        self._executor = executor
+        self._executor_proprio = executor is None
+        self._jobs = {}
+        self._finalizados = deque()
+        self._workers = []
+        self._latencias = []
+
+        self.totais = {
+            'enviados': 0,
+            'recusados': 0,
+            CONCLUIDO: 0,
+            FALHOU: 0,
+            CANCELADO: 0,
+        }
+
+    async def iniciar(self):
+        """Cria o executor e os workers"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.concorrencia)
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concorrencia)]
+
+    async def parar(self):
+        """Cancela os workers e encerra o executor (se foi criado aqui)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self._executor_proprio and self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.parar()
+
+    async def enviar(self, dados_pessoa, templates=None, esperar=True):
+        """
+        Coloca um job na fila.
+
+        Args:
+            dados_pessoa: Dicionário de ColetorDados.coletar_todos_dados
+            templates: Lista de (template_path, nome_contrato); padrão: todo o catálogo
+            esperar: Se a fila estiver cheia, espera vaga (True) ou levanta
+                FilaCheia (False)
+
+        Returns:
+            Identificador do job
+        """
+        job = Job(dados_pessoa, templates)
+
+        if esperar:
+            await self._fila.put(job)
+        else:
+            try:
+                self._fila.put_nowait(job)
+            except asyncio.QueueFull:
+                self.totais['recusados'] += 1
+                raise FilaCheia("Fila de jobs cheia, tente novamente mais tarde")
+
+        self._jobs[job.id] = job
+        self.totais['enviados'] += 1
+        return job.id
+
+    def _obter(self, job_id):
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise JobNaoEncontrado(job_id)
+
+    def status(self, job_id):
+        """Estado atual do job (para polling)"""
+        return self._obter(job_id).resumo()
+
+    async def resultado(self, job_id, timeout=None):
+        """Espera o job terminar e devolve o resumo final"""
+        job = self._obter(job_id)
+        await asyncio.wait_for(asyncio.shield(job.futuro), timeout)
+        return job.resumo()
+
+    def cancelar(self, job_id):
+        """
+        Cancela um job ainda não finalizado.
+
+        Um job pendente nunca chega a executar. Um job em execução não pode
+        ser interrompido no processo do pool: o resultado é descartado.
+
+        Returns:
+            True se o job foi cancelado
+        """
+        job = self._obter(job_id)
+        if job.estado not in (PENDENTE, EXECUTANDO):
+            return False
+
+        self._registrar(job, CANCELADO)
+        return True
+
+    def _registrar(self, job, estado, resultados=None, erro=None):
+        """Finaliza o job, atualiza métricas e descarta jobs antigos"""
+        job.finalizar(estado, resultados, erro)
+        self.totais[estado] += 1
+
+        if estado == CONCLUIDO:
+            self._latencias.append(job.latencia)
+            if len(self._latencias) > self.historico:
+                del self._latencias[:len(self._latencias) - self.historico]
+
+        self._finalizados.append(job.id)
+        if len(self._finalizados) > self.historico:
+            antigo = self._finalizados.popleft()
+            self._jobs.pop(antigo, None)
+
+    async def _worker(self):
+        """Tira jobs da fila e executa no executor"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            job = await self._fila.get()
+            try:
+                if job.estado == CANCELADO:
+                    continue
+
+                job.estado = EXECUTANDO
+                job.iniciado = time.perf_counter()
+
+                try:
+                    resultados = await loop.run_in_executor(
+                        self._executor, gerar_contratos_processo, job.dados_pessoa, job.templates,
+                    )
+                except Exception as e:
+                    if job.estado != CANCELADO:
+                        self._registrar(job, FALHOU, erro=str(e))
+                    continue
+
+                if job.estado == CANCELADO:
+                    continue
+
+                if all(caminho for _, caminho in resultados):
+                    self._registrar(job, CONCLUIDO, resultados)
+                else:
+                    self._registrar(job, FALHOU, resultados, "Falha em um ou mais contratos")
+            finally:
+                self._fila.task_done()
+
+    def metricas(self):
+        """Totais, ocupação da fila e latências (segundos) dos jobs concluídos"""
+        latencias = sorted(self._latencias)
+        media = sum(latencias) / len(latencias) if latencias else None
+
+        return {
+            **self.totais,
+            'na_fila': self._fila.qsize(),
+            'capacidade_fila': self._fila.maxsize,
+            'concorrencia': self.concorrencia,
+            'latencia_media': media,
+            'latencia_p50': _percentil(latencias, 0.50),
+            'latencia_p95': _percentil(latencias, 0.95),
+            'latencia_max': latencias[-1] if latencias else None,
+        }
+
+
+async def _atender_cliente(fila, leitor, escritor):
+    """Atende uma conexão TCP: uma mensagem JSON por linha"""
+    try:
+        while True:
+            linha = await leitor.readline()
+            if not linha:
+                break
+
+            try:
+                mensagem = json.loads(linha)
+                acao = mensagem.get('acao')
+
+                if acao == 'enviar':
+                    resposta = {'job': await fila.enviar(
+                        mensagem.get('dados', {}),
+                        esperar=mensagem.get('esperar', True),
+                    )}
+                elif acao == 'status':
+                    resposta = fila.status(mensagem['job'])
+                elif acao == 'resultado':
+                    resposta = await fila.resultado(mensagem['job'], mensagem.get('timeout'))
+                elif acao == 'cancelar':
+                    resposta = {'cancelado': fila.cancelar(mensagem['job'])}
+                elif acao == 'metricas':
+                    resposta = fila.metricas()
+                else:
+                    resposta = {'erro': f"Ação desconhecida: {acao}"}
+            except FilaCheia as e:
+                resposta = {'erro': str(e), 'fila_cheia': True}
+            except JobNaoEncontrado as e:
+                resposta = {'erro': f"Job não encontrado: {e.args[0]}"}
+            except asyncio.TimeoutError:
+                resposta = {'erro': "Tempo esgotado esperando o job"}
+            except (ValueError, KeyError, AttributeError) as e:
+                resposta = {'erro': f"Mensagem inválida: {str(e)}"}
+
+            escritor.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b'\n')
+            await escritor.drain()
+    finally:
+        escritor.close()
+
+
+async def servir(host="127.0.0.1", porta=8765, concorrencia=None, tamanho_fila=100):
+    """Sobe a fila e o front-end TCP até ser interrompido"""
+    concorrencia = concorrencia or os.cpu_count() or 1
+
+    async with FilaJobs(concorrencia, tamanho_fila) as fila:
+        servidor = await asyncio.start_server(
+            lambda leitor, escritor: _atender_cliente(fila, leitor, escritor), host, porta,
+        )
+        print(f"🧾 Fila de jobs em {host}:{porta} ({concorrencia} workers, fila de {tamanho_fila})")
+
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor assíncrono de jobs de geração de contratos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--concorrencia", type=int, default=None, help="Jobs executando ao mesmo tempo")
+    parser.add_argument("--fila", type=int, default=100, help="Tamanho máximo da fila")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(servir(args.host, args.porta, args.concorrencia, args.fila))
+    except KeyboardInterrupt:
+        print("\n❌ Fila de jobs encerrada.")
+
+
+if __name__ == "__main__":
+    main()
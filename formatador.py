@@ -4,8 +4,87 @@ Módulo para formatação de dados conforme especificações
 """
 
 import re
-from datetime import datetime
-from config import MESES_PT, SIGLAS_ESTADOS, ABREVIACOES
+from datetime import date, datetime
+from config import MESES_PT, SIGLAS_ESTADOS
+from normalizador_endereco import normalizar_endereco
+
+# Padrões compilados uma única vez
+_NAO_DIGITOS = re.compile(r'[^\d]')
+
+# Formatos de data aceitos: (nome, regex, posição de dia, mês e ano nos grupos)
+FORMATOS_DATA = [
+    ('DD/MM/AAAA', re.compile(r'([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})'), (0, 1, 2)),
+    ('DD-MM-AAAA', re.compile(r'([0-9]{1,2})-([0-9]{1,2})-([0-9]{4})'), (0, 1, 2)),
+    ('DD.MM.AAAA', re.compile(r'([0-9]{1,2})\.([0-9]{1,2})\.([0-9]{4})'), (0, 1, 2)),
+    # Também aceita a hora que vem de células de data do Excel (2025-12-23 00:00:00)
+    ('AAAA-MM-DD', re.compile(r'([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})(?:[ T][0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?)?'), (2, 1, 0)),
+]
+
+# Palavras que ficam em minúsculas no nome da cidade (exceto no início)
+PALAVRAS_ESPECIAIS_CIDADE = frozenset(['de', 'da', 'do', 'das', 'dos', 'e'])
+
+# Mapeamento de estados civis por gênero
+ESTADOS_CIVIS_GENERO = {
+    'masculino': {
+        'solteiro': 'solteiro',
+        'casado': 'casado',
+        'divorciado': 'divorciado',
+        'viúvo': 'viúvo',
+        'viuvo': 'viúvo',
+        'separado': 'separado'
+    },
+    'feminino': {
+        'solteiro': 'solteira',
+        'casado': 'casada',
+        'divorciado': 'divorciada',
+        'viúvo': 'viúva',
+        'viuvo': 'viúva',
+        'separado': 'separada'
+    }
+}
+
+
+def _eh_serie_pandas(valores):
+    """Indica se a coluna é uma Series do pandas (sem importar o pandas)"""
+    return type(valores).__module__.startswith('pandas') and hasattr(valores, 'map')
+
+
+def _como_coluna(valores, resultado):
+    """Devolve o resultado no mesmo tipo da coluna de entrada"""
+    if _eh_serie_pandas(valores):
+        return resultado
+    if type(valores).__module__ == 'numpy':
+        import numpy
+        return numpy.array(resultado, dtype=object)
+    return list(resultado)
+
+
+def _mapear_unicos(valores, funcao):
+    """
+    Aplica a função uma vez por valor distinto da coluna (memoização) e
+    espalha o resultado para todas as linhas.
+    """
+    if _eh_serie_pandas(valores):
+        memo = {valor: funcao(valor) for valor in valores.unique()}
+        return valores.map(memo)
+
+    memo = {}
+    resultado = []
+    for valor in valores:
+        try:
+            resultado.append(memo[valor])
+        except KeyError:
+            memo[valor] = saida = funcao(valor)
+            resultado.append(saida)
+        except TypeError:
+            # Valor não hasheável: formata sem memoizar
+            resultado.append(funcao(valor))
+
+    return _como_coluna(valores, resultado)
+
+
+class DataInvalida(ValueError):
+    """Data que não está em nenhum dos FORMATOS_DATA ou não existe no calendário"""
 
 
 class FormatadorDados:
@@ -32,7 +111,7 @@ class FormatadorDados:
             return ""
 
         # Remover todos os caracteres não numéricos
-        cpf_limpo = re.sub(r'[^\d]', '', str(cpf))
+        cpf_limpo = _NAO_DIGITOS.sub('', str(cpf))
 
         # Verificar se tem 11 dígitos
         if len(cpf_limpo) != 11:
@@ -45,38 +124,12 @@ class FormatadorDados:
     def formatar_endereco(endereco):
         """
         Formata endereço: Primeira letra maiúscula e aplica abreviações
+        (ver normalizador_endereco.py)
         """
         if not endereco or not isinstance(endereco, str):
             return ""
 
-        # Remover espaços extras
-        endereco = ' '.join(endereco.split())
-
-        # Converter para minúsculas para processamento
-        endereco_lower = endereco.lower()
-
-        # Aplicar abreviações
-        palavras = endereco_lower.split()
-        palavras_formatadas = []
-
-        for palavra in palavras:
-            # Verificar se a palavra tem abreviação
-            if palavra in ABREVIACOES:
-                palavras_formatadas.append(ABREVIACOES[palavra])
-            else:
-                # Capitalizar primeira letra de cada palavra
-                if palavra:
-                    palavras_formatadas.append(palavra.capitalize())
-                else:
-                    palavras_formatadas.append(palavra)
-
-        # Juntar novamente
-        endereco_formatado = ' '.join(palavras_formatadas)
-
-        # Garantir que números venham após vírgula
-        endereco_formatado = re.sub(r'(\d+)\s*,', r'\1,', endereco_formatado)
-
-        return endereco_formatado
+        return normalizar_endereco(endereco)
 
     @staticmethod
     def formatar_cidade(cidade):
@@ -90,16 +143,14 @@ class FormatadorDados:
         # Remover espaços extras
         cidade = ' '.join(cidade.split())
 
-        # Converter para título, mas manter certas palavras em maiúsculo
-        palavras_especiais = ['de', 'da', 'do', 'das', 'dos', 'e']
-
+        # Converter para título, mas manter certas palavras em minúsculo
         palavras = cidade.split()
         palavras_formatadas = []
 
         for i, palavra in enumerate(palavras):
             palavra_lower = palavra.lower()
 
-            if palavra_lower in palavras_especiais and i > 0:
+            if palavra_lower in PALAVRAS_ESPECIAIS_CIDADE and i > 0:
                 palavras_formatadas.append(palavra_lower)
             else:
                 # Capitalizar primeira letra
@@ -126,52 +177,33 @@ class FormatadorDados:
     @staticmethod
     def formatar_oab(numero_oab):
         """
-        Formata número da OAB: XXX.XXX
+        Formata número da OAB (1 a 6 dígitos) com ponto de milhar:
+        XXX.XXX, XX.XXX, X.XXX ou só os dígitos se forem até 3
         """
         if not numero_oab:
             return ""
 
         # Remover caracteres não numéricos
-        numero_limpo = re.sub(r'[^\d]', '', str(numero_oab))
+        numero_limpo = _NAO_DIGITOS.sub('', str(numero_oab))
 
-        # Formatar: XXX.XXX
-        if len(numero_limpo) == 6:
-            return f"{numero_limpo[:3]}.{numero_limpo[3:]}"
+        # Formatar: XXX.XXX (ou menos dígitos antes do ponto)
+        if 3 < len(numero_limpo) <= 6:
+            return f"{numero_limpo[:-3]}.{numero_limpo[-3:]}"
         else:
-            return numero_limpo  # Retorna como está se não for 6 dígitos
+            return numero_limpo  # Até 3 dígitos (ou número inválido) fica como está
 
     @staticmethod
     def formatar_estado_civil(estado_civil, genero='masculino'):
         """
         Formata estado civil conforme gênero (minúsculas)
         """
-        if not estado_civil:
+        if not estado_civil or not isinstance(estado_civil, str):
             return ""
 
         estado_civil = estado_civil.strip().lower()
 
-        # Mapeamento de estados civis por gênero
-        estados = {
-            'masculino': {
-                'solteiro': 'solteiro',
-                'casado': 'casado',
-                'divorciado': 'divorciado',
-                'viúvo': 'viúvo',
-                'viuvo': 'viúvo',
-                'separado': 'separado'
-            },
-            'feminino': {
-                'solteiro': 'solteira',
-                'casado': 'casada',
-                'divorciado': 'divorciada',
-                'viúvo': 'viúva',
-                'viuvo': 'viúva',
-                'separado': 'separada'
-            }
-        }
-
         # Tentar encontrar correspondência
-        for entrada, saida in estados[genero].items():
+        for entrada, saida in ESTADOS_CIVIS_GENERO[genero].items():
             if entrada in estado_civil:
                 return saida
 
@@ -179,31 +211,57 @@ class FormatadorDados:
         return estado_civil
 
     @staticmethod
-    def formatar_data(data_str):
+    def interpretar_data(data_str, formatos=None):
+        """
+        Converte o texto em date, testando os FORMATOS_DATA com regex
+        compiladas (sem usar exceções para escolher o formato).
+
+        Args:
+            data_str: Texto da data (ou date/datetime, devolvido como date)
+            formatos: Formatos a testar, na ordem (padrão: FORMATOS_DATA)
+
+        Raises:
+            DataInvalida: se nenhum formato reconhecer a data
+        """
+        if isinstance(data_str, datetime):
+            return data_str.date()
+        if isinstance(data_str, date):
+            return data_str
+        if not isinstance(data_str, str):
+            raise DataInvalida(f"Data inválida: {data_str!r}")
+
+        texto = data_str.strip()
+
+        for _, padrao, (pos_dia, pos_mes, pos_ano) in formatos or FORMATOS_DATA:
+            casamento = padrao.fullmatch(texto)
+            if casamento:
+                grupos = casamento.groups()
+                try:
+                    return date(int(grupos[pos_ano]), int(grupos[pos_mes]), int(grupos[pos_dia]))
+                except ValueError:
+                    break
+
+        raise DataInvalida(f"Data inválida: {data_str!r}")
+
+    @staticmethod
+    def formatar_data(data_str, estrito=False):
         """
         Formata data: entrada 23/12/2025 -> saída 23 de dezembro de 2025
         RETORNA APENAS A DATA, SEM A CIDADE
+
+        Sem data, usa a data atual. Com uma data que não pode ser
+        interpretada, também usa a data atual, a não ser que estrito=True:
+        nesse caso levanta DataInvalida.
         """
         if not data_str:
             # Usar data atual como padrão
             data = datetime.now()
         else:
             try:
-                # Tentar vários formatos de data
-                formatos = ['%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y-%m-%d']
-                data = None
-
-                for formato in formatos:
-                    try:
-                        data = datetime.strptime(data_str.strip(), formato)
-                        break
-                    except ValueError:
-                        continue
-
-                if not data:
-                    raise ValueError("Formato de data não reconhecido")
-
-            except Exception:
+                data = FormatadorDados.interpretar_data(data_str)
+            except DataInvalida:
+                if estrito:
+                    raise
                 # Se não conseguir parsear, usar data atual
                 data = datetime.now()
 
@@ -229,4 +287,154 @@ class FormatadorDados:
             if primeiro_nome.endswith(sufixo):
                 return 'feminino'
 
-        return 'masculino'
\ No newline at end of file
+        return 'masculino'
+
+    # ------------------------------------------------------------------
+    # Formatação em lote (colunas inteiras)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def formatar_coluna_cpf(valores):
+        """Versão em lote de formatar_cpf"""
+        if not _eh_serie_pandas(valores):
+            return _como_coluna(valores, [FormatadorDados.formatar_cpf(valor) for valor in valores])
+
+        # Operações vetorizadas do pandas
+        vazios = valores.isna() | (valores.astype(str) == '')
+        digitos = valores.astype(str).str.replace(r'[^\d]', '', regex=True)
+        formatados = (digitos.str[:3] + '.' + digitos.str[3:6] + '.' +
+                      digitos.str[6:9] + '-' + digitos.str[9:])
+
+        return formatados.where(digitos.str.len() == 11, digitos).mask(vazios, '')
+
+    @staticmethod
+    def formatar_coluna_oab(valores):
+        """Versão em lote de formatar_oab"""
+        if not _eh_serie_pandas(valores):
+            return _mapear_unicos(valores, FormatadorDados.formatar_oab)
+
+        vazios = valores.isna() | (valores.astype(str) == '')
+        digitos = valores.astype(str).str.replace(r'[^\d]', '', regex=True)
+        formatados = digitos.str[:3] + '.' + digitos.str[3:]
+
+        return formatados.where(digitos.str.len() == 6, digitos).mask(vazios, '')
+
+    @staticmethod
+    def formatar_coluna_estado_civil(valores, nomes):
+        """
+        Versão em lote de formatar_estado_civil: o gênero de cada linha vem
+        da coluna de nomes (determinar_genero memoizado por nome).
+        """
+        generos = _mapear_unicos(nomes, FormatadorDados.determinar_genero)
+
+        memo = {}
+        resultado = []
+        for estado_civil, genero in zip(valores, generos):
+            chave = (estado_civil, genero)
+            if chave not in memo:
+                memo[chave] = FormatadorDados.formatar_estado_civil(estado_civil, genero)
+            resultado.append(memo[chave])
+
+        if _eh_serie_pandas(valores):
+            return type(valores)(resultado, index=valores.index, dtype=object)
+        return _como_coluna(valores, resultado)
+
+    @staticmethod
+    def formatar_coluna_data(valores):
+        """
+        Versão em lote de formatar_data.
+
+        O formato é detectado uma vez pela primeira data preenchida da coluna
+        e testado primeiro nas demais; cada data distinta é interpretada uma
+        única vez. Datas vazias viram a data atual; datas que não podem ser
+        interpretadas viram None (e não a data atual), para que possam ser
+        rejeitadas.
+        """
+        formatos = FORMATOS_DATA
+
+        for valor in valores:
+            if isinstance(valor, str) and valor.strip():
+                texto = valor.strip()
+                detectado = [f for f in FORMATOS_DATA if f[1].fullmatch(texto)]
+                if detectado:
+                    formatos = detectado + [f for f in FORMATOS_DATA if f not in detectado]
+                break
+
+        hoje = FormatadorDados.formatar_data('')
+
+        def formatar(valor):
+            if not valor or (isinstance(valor, str) and not valor.strip()):
+                return hoje
+            try:
+                data = FormatadorDados.interpretar_data(valor, formatos)
+            except DataInvalida:
+                return None
+            return f"{data.day} de {MESES_PT[data.month]} de {data.year}"
+
+        return _mapear_unicos(valores, formatar)
+
+    @staticmethod
+    def formatar_coluna(campo, valores):
+        """
+        Formata uma coluna inteira (lista, array NumPy ou Series do pandas).
+
+        Valores repetidos (cidades, endereços, datas...) são formatados uma
+        única vez. O resultado tem o mesmo tipo da entrada.
+
+        Args:
+            campo: Nome do campo, como em COLUNAS_FORMATACAO
+            valores: Coluna com os valores crus
+        """
+        if campo == 'cpf':
+            return FormatadorDados.formatar_coluna_cpf(valores)
+        if campo == 'oab_numero':
+            return FormatadorDados.formatar_coluna_oab(valores)
+        if campo == 'data':
+            return FormatadorDados.formatar_coluna_data(valores)
+        if campo not in COLUNAS_FORMATACAO:
+            raise ValueError(f"Campo sem formatação em lote: {campo}")
+
+        return _mapear_unicos(valores, COLUNAS_FORMATACAO[campo])
+
+    @staticmethod
+    def formatar_colunas(colunas):
+        """
+        Formata um roster em formato de colunas.
+
+        Args:
+            colunas: Dicionário {campo: coluna} (ou DataFrame do pandas) com
+                as colunas cruas; estado_civil usa a coluna nome_completo
+                para determinar o gênero
+
+        Returns:
+            Dicionário {campo: coluna formatada}
+        """
+        formatadas = {}
+
+        for campo in colunas:
+            if campo == 'estado_civil':
+                continue
+            if campo in ('cpf', 'oab_numero', 'data') or campo in COLUNAS_FORMATACAO:
+                formatadas[campo] = FormatadorDados.formatar_coluna(campo, colunas[campo])
+            else:
+                formatadas[campo] = colunas[campo]
+
+        if 'estado_civil' in colunas:
+            nomes = formatadas.get('nome_completo')
+            if nomes is None:
+                nomes = [''] * len(colunas['estado_civil'])
+            formatadas['estado_civil'] = FormatadorDados.formatar_coluna_estado_civil(
+                colunas['estado_civil'], nomes,
+            )
+
+        return formatadas
+
+
+# Formatador usado por campo em formatar_coluna
+COLUNAS_FORMATACAO = {
+    'nome_completo': FormatadorDados.formatar_nome_completo,
+    'endereco_completo': FormatadorDados.formatar_endereco,
+    'cidade': FormatadorDados.formatar_cidade,
+    'estado': FormatadorDados.formatar_estado,
+    'oab_uf': FormatadorDados.formatar_estado,
+}
@@ -1,15 +1,96 @@
 # gerador.py - VERSÃO COM NEGRITO SELETIVO
-from docx import Document
 from docx.shared import Pt
+import io
 import os
-import re
-from datetime import datetime
-from config import SOCIEDADE, OUTORGADOS, MESES_PT, PALAVRAS_NEGRITO
+import time
+import warnings
+from config import SOCIEDADE, CACHE_RESULTADOS_ATIVO, BACKEND_PADRAO, BACKENDS, MAPA_SLOTS_ATIVO
+from cache_templates import CACHE_TEMPLATES, PADRAO_PLACEHOLDER, listar_paragrafos
+from catalogo import CATALOGO, identificador
+from escritor import ESCRITOR, gravar_atomico
+from instrumentacao import SEM_INSTRUMENTACAO
+from logs import obter_logger
+from negrito import obter_matcher
+
+# Pasta do projeto: templates com caminho relativo são procurados a partir dela
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+log = obter_logger('gerador')
+
+
+class PlaceholderWarning(UserWarning):
+    """Placeholder do template desconhecido ou sem valor"""
+
+
+def substituir_placeholders(texto, placeholders, spans=None):
+    """
+    Substitui todos os {{PLACEHOLDERS}} do texto numa única passada.
+
+    Args:
+        texto: Texto com placeholders
+        placeholders: Dicionário {"{{NOME}}": valor}
+        spans: Posições (inicio, fim, placeholder) já conhecidas, como em
+            SlotDinamico.spans. Se omitido, o texto é varrido com a regex.
+
+    Placeholders desconhecidos são mantidos no texto.
+    """
+    if spans is None:
+        return PADRAO_PLACEHOLDER.sub(lambda m: placeholders.get(m.group(), m.group()), texto)
+
+    partes = []
+    posicao = 0
+    for inicio, fim, placeholder in spans:
+        partes.append(texto[posicao:inicio])
+        partes.append(placeholders.get(placeholder, placeholder))
+        posicao = fim
+    partes.append(texto[posicao:])
+
+    return ''.join(partes)
+
+
+def verificar_placeholders(usados, placeholders):
+    """
+    Compara os placeholders usados num template com os valores disponíveis.
+
+    Returns:
+        Tupla (desconhecidos, vazios), ambos listas ordenadas
+    """
+    desconhecidos = sorted(p for p in usados if p not in placeholders)
+    vazios = sorted(p for p in usados if p in placeholders and not placeholders[p])
+    return desconhecidos, vazios
+
+
+def nome_documento(template_path):
+    """
+    Nome do documento gerado a partir do nome do template
+    Ex: templates/TERMO DE CONFIDENCIALIDADE_MODEL.docx -> TERMO_DE_CONFIDENCIALIDADE
+    """
+    return identificador(template_path)
 
 
 class GeradorContratos:
-    def __init__(self):
-        pass
+    def __init__(self, cache_templates=None, cache_resultados=None, backend=BACKEND_PADRAO,
+                 instrumentacao=None, mapa_slots=MAPA_SLOTS_ATIVO, exportador_pdf=None, escritor=None):
+        # Templates parseados uma única vez e reaproveitados entre contratos
+        self.cache_templates = cache_templates or CACHE_TEMPLATES
+        # Documentos já gerados, reaproveitados quando nada mudou (opcional)
+        self.cache_resultados = cache_resultados
+        # 'docx' (python-docx) ou 'xml' (ver renderizador_xml.py)
+        self.backend = self._verificar_backend(backend)
+        # Tempos por etapa, contadores e perfis (ver instrumentacao.py)
+        self.instrumentacao = instrumentacao or SEM_INSTRUMENTACAO
+        # Grava o mapa de slots ao lado de cada contrato (ver reedicao.py)
+        self.mapa_slots = mapa_slots
+        # PoolConversores que recebe cada contrato salvo (ver exportar_pdf.py)
+        self.exportador_pdf = exportador_pdf
+        # Nomes únicos, subpastas por data/pessoa e gravação atômica (ver escritor.py)
+        self.escritor = escritor or ESCRITOR
+
+    @staticmethod
+    def _verificar_backend(backend):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconhecido: {backend} (use {', '.join(BACKENDS)})")
+        return backend
 
     def preparar_placeholders(self, dados_pessoa):
         """Prepara placeholders simples"""
@@ -44,56 +125,20 @@ class GeradorContratos:
             "{{SEDE}}": SOCIEDADE['sede_cidade'],
         }
 
-    def aplicar_negrito_seletivo(self, texto, nome_completo):
+    def aplicar_negrito_seletivo(self, texto, *nomes):
         """
         Aplica negrito APENAS nas palavras específicas, mantendo o resto normal.
 
         Args:
             texto: Texto completo do parágrafo (com placeholders já substituídos)
-            nome_completo: Nome completo da pessoa
+            nomes: Nome completo da pessoa (ou de cada signatário)
 
         Returns:
             Lista de tuplas [(texto1, negrito1), (texto2, negrito2), ...]
         """
-        if not texto.strip():
-            return [(texto, False)]
-
-        # Lista de todas as palavras que devem ficar em negrito
-        palavras_para_negrito = []
-
-        # 1. Adicionar nome completo (se existir e estiver no texto)
-        if nome_completo and nome_completo in texto:
-            palavras_para_negrito.append(nome_completo)
-
-        # 2. Adicionar palavras da lista PALAVRAS_NEGRITO que estão no texto
-        for palavra in PALAVRAS_NEGRITO:
-            if palavra in texto:
-                palavras_para_negrito.append(palavra)
-
-        # Se não há palavras para negrito, retorna tudo normal
-        if not palavras_para_negrito:
-            return [(texto, False)]
-
-        # Criar padrão regex para encontrar todas as palavras
-        # Ordenar por tamanho (maior primeiro) para evitar substituições parciais
-        palavras_para_negrito.sort(key=len, reverse=True)
-        padrao = '|'.join(re.escape(palavra) for palavra in palavras_para_negrito)
-
-        # Dividir o texto pelas palavras que devem ser negritadas
-        partes = re.split(f'({padrao})', texto)
-
-        # Processar as partes
-        runs = []
-        for parte in partes:
-            if parte:  # Ignorar strings vazias
-                deve_negrito = parte in palavras_para_negrito
-                runs.append((parte, deve_negrito))
-
-        # Se nenhuma parte foi encontrada (pode acontecer com regex complexa)
-        if not runs:
-            runs = [(texto, False)]
-
-        return runs
+        # Vocabulário (PALAVRAS_NEGRITO + nomes) compilado uma vez por combinação
+        with self.instrumentacao.etapa('negrito'):
+            return obter_matcher(*nomes).segmentar(texto)
 
     def processar_paragrafo(self, paragraph, placeholders, nome_completo):
         """
@@ -105,16 +150,20 @@ class GeradorContratos:
         if not texto_original.strip():
             return
 
-        # 1. Substituir TODOS os placeholders primeiro
-        texto_com_placeholders = texto_original
-        for placeholder, valor in placeholders.items():
-            if placeholder in texto_com_placeholders:
-                texto_com_placeholders = texto_com_placeholders.replace(placeholder, valor)
+        # 1. Substituir TODOS os placeholders numa única passada
+        texto_com_placeholders = substituir_placeholders(texto_original, placeholders)
 
-        # 2. Aplicar negrito seletivo
-        runs = self.aplicar_negrito_seletivo(texto_com_placeholders, nome_completo)
+        # 2. Aplicar negrito seletivo e escrever no parágrafo
+        self.escrever_paragrafo(paragraph, texto_com_placeholders, nome_completo)
+
+    def escrever_paragrafo(self, paragraph, texto, *nomes):
+        """
+        Reescreve o parágrafo com o texto final, aplicando negrito seletivo.
+        """
+        runs = self.aplicar_negrito_seletivo(texto, *nomes)
+        self.instrumentacao.contar('paragrafos')
+        self.instrumentacao.contar('runs', len(runs))
 
-        # 3. Aplicar ao parágrafo
         paragraph.clear()
         for texto_run, negrito in runs:
             run = paragraph.add_run(texto_run)
@@ -122,73 +171,671 @@ class GeradorContratos:
             run.font.size = Pt(11)
             run.bold = negrito
 
-    def gerar_contrato(self, template_path, dados_pessoa):
-        """Gera contrato com negrito seletivo"""
-        try:
+        return runs
+
+    def aquecer(self, templates=None):
+        """
+        Carrega e compila os templates antes do primeiro contrato, para que
+        a primeira geração não pague o custo de leitura do disco (no backend
+        xml, também monta o plano de emenda).
+
+        Args:
+            templates: Lista de (template_path, nome_contrato); padrão: todo
+                o catálogo
+        """
+        for template_path, _ in templates or CATALOGO.pares():
+            template = self._template_pronto(resolver_template(template_path))
+            if self.backend == 'xml':
+                from renderizador_xml import obter_plano
+                obter_plano(template)
+
+    def _template_pronto(self, template_path):
+        """Template do cache, conferido com o catálogo e com o negrito fixo já formatado"""
+        template = self.cache_templates.obter(template_path)
+        CATALOGO.conferir(template)
+        template.preparar_negrito(lambda paragraph: self.processar_paragrafo(paragraph, {}, ''))
+        return template
+
+    def _preparar_template(self, template_path, placeholders):
+        """
+        Template compilado e conferido com o manifest do catálogo, com os
+        parágrafos de negrito já formatados e avisos para placeholders
+        desconhecidos ou sem valor. Quem chama mede a etapa 'carregamento'
+        junto com a cópia (ou o plano) do template, uma vez por documento.
+        """
+        template = self._template_pronto(template_path)
+
+        desconhecidos, vazios = verificar_placeholders(template.placeholders, placeholders)
+        if desconhecidos:
+            warnings.warn(
+                f"Placeholders desconhecidos em {os.path.basename(template_path)}: {', '.join(desconhecidos)}",
+                PlaceholderWarning, stacklevel=3,
+            )
+        if vazios:
+            warnings.warn(
+                f"Placeholders sem valor em {os.path.basename(template_path)}: {', '.join(vazios)}",
+                PlaceholderWarning, stacklevel=3,
+            )
+
+        return template
+
+    def renderizar(self, template_path, dados_pessoa):
+        """
+        Gera o documento em memória (sem salvar) a partir do template compilado.
+
+        Só os slots dinâmicos (parágrafos com placeholders) são reescritos.
+        Os parágrafos que só têm palavras em negrito já foram formatados uma
+        vez no template em cache; os demais saem idênticos ao template.
+
+        Returns:
+            Document do python-docx com placeholders e negrito aplicados
+        """
+        return self._renderizar_docx(template_path, dados_pessoa)[0]
+
+    def _renderizar_docx(self, template_path, dados_pessoa):
+        """
+        Igual a renderizar, guardando o que o mapa de slots usa.
+
+        Returns:
+            Tupla (Document, template, placeholders, {indice do slot: runs})
+        """
+        nome_completo = dados_pessoa.get('nome_completo', '')
+        with self.instrumentacao.etapa('placeholders'):
             placeholders = self.preparar_placeholders(dados_pessoa)
-            nome_completo = dados_pessoa.get('nome_completo', '')
 
-            if not os.path.exists(template_path):
-                raise FileNotFoundError(f"Template não encontrado: {template_path}")
+        # Cópia do template já compilado
+        with self.instrumentacao.etapa('carregamento'):
+            template = self._preparar_template(template_path, placeholders)
+            doc = template.clonar()
+            paragrafos = listar_paragrafos(doc)
+
+        # Substituição pelas posições já conhecidas de cada slot
+        with self.instrumentacao.etapa('placeholders'):
+            textos = self._textos_dos_slots(template, placeholders)
+
+        runs = {}
+        with self.instrumentacao.etapa('paragrafos'):
+            for slot in template.slots:
+                if not template.em_tabela(slot):
+                    runs[slot.indice] = self.escrever_paragrafo(paragrafos[slot.indice], textos[slot.indice], nome_completo)
+
+        with self.instrumentacao.etapa('tabelas'):
+            for slot in template.slots:
+                if template.em_tabela(slot):
+                    runs[slot.indice] = self.escrever_paragrafo(paragrafos[slot.indice], textos[slot.indice], nome_completo)
+
+        return doc, template, placeholders, runs
+
+    @staticmethod
+    def _montado(template, placeholders, runs):
+        """
+        Dados do mapa de slots a partir dos runs já calculados de cada slot:
+        o plano de emenda do template (montado uma vez por template) dá o
+        mesmo document.xml do backend docx, byte a byte, sem substituir nem
+        segmentar de novo.
+
+        Returns:
+            Tupla (template, placeholders, hash do document.xml, posições)
+        """
+        from reedicao import hash_documento
+        from renderizador_xml import obter_plano
+
+        documento_xml, posicoes = obter_plano(template).montar_documento(lambda slot: runs[slot.indice])
+        return template, placeholders, hash_documento(documento_xml), posicoes
+
+    @staticmethod
+    def _textos_dos_slots(template, placeholders):
+        """Texto final de cada slot, indexado pela posição do parágrafo"""
+        return {
+            slot.indice: substituir_placeholders(slot.texto, placeholders, slot.spans)
+            for slot in template.slots
+        }
+
+    def renderizar_bytes(self, template_path, dados_pessoa, backend=None):
+        """
+        Gera o .docx em memória com o backend escolhido.
+
+        O backend 'xml' não cria nenhum objeto do python-docx por contrato:
+        emenda os runs de cada slot no document.xml do template (ver
+        renderizador_xml.py). Placeholders e negrito saem iguais aos do
+        backend 'docx'.
+
+        Returns:
+            Bytes do .docx
+        """
+        return self._renderizar_bytes(template_path, dados_pessoa, backend)[0]
+
+    def _renderizar_bytes(self, template_path, dados_pessoa, backend=None, montar=False):
+        """
+        Igual a renderizar_bytes; com montar=True, também devolve os dados
+        do mapa de slots (ver _montado).
+
+        Returns:
+            Tupla (bytes do .docx, dados do mapa ou None)
+        """
+        from reedicao import hash_documento
+
+        backend = self._verificar_backend(backend or self.backend)
+
+        if backend == 'docx':
+            doc, template, placeholders, runs = self._renderizar_docx(template_path, dados_pessoa)
+            buffer = io.BytesIO()
+            with self.instrumentacao.etapa('salvar'):
+                doc.save(buffer)
+            return buffer.getvalue(), self._montado(template, placeholders, runs) if montar else None
+
+        plano, template, placeholders, runs_do_slot = self._preparar_xml(template_path, dados_pessoa)
+
+        # No backend xml a emenda dos slots e a montagem do ZIP são uma etapa só
+        with self.instrumentacao.etapa('salvar'):
+            documento_xml, posicoes = plano.montar_documento(runs_do_slot)
+            conteudo = plano.empacotar(documento_xml)
+        return conteudo, (template, placeholders, hash_documento(documento_xml), posicoes) if montar else None
+
+    def _preparar_xml(self, template_path, dados_pessoa):
+        """
+        Plano de emenda do template e função com os runs de cada slot.
+
+        Returns:
+            Tupla (plano, template, placeholders, runs_do_slot)
+        """
+        from renderizador_xml import obter_plano
+
+        nome_completo = dados_pessoa.get('nome_completo', '')
+        with self.instrumentacao.etapa('placeholders'):
+            placeholders = self.preparar_placeholders(dados_pessoa)
+
+        with self.instrumentacao.etapa('carregamento'):
+            template = self._preparar_template(template_path, placeholders)
+            plano = obter_plano(template)
+
+        with self.instrumentacao.etapa('placeholders'):
+            textos = self._textos_dos_slots(template, placeholders)
+
+        def runs_do_slot(slot):
+            runs = self.aplicar_negrito_seletivo(textos[slot.indice], nome_completo)
+            self.instrumentacao.contar('paragrafos')
+            self.instrumentacao.contar('runs', len(runs))
+            return runs
+
+        return plano, template, placeholders, runs_do_slot
+
+    def _preparar_signatarios(self, signatarios):
+        """
+        Placeholders de cada signatário e nomes para o negrito (ver
+        signatarios.py).
+
+        Returns:
+            Tupla (lista de placeholders, nomes)
+        """
+        if not signatarios:
+            raise ValueError("Informe ao menos um signatário")
+
+        with self.instrumentacao.etapa('placeholders'):
+            placeholders = [self.preparar_placeholders(dados) for dados in signatarios]
+
+        nomes = tuple(dados.get('nome_completo', '') for dados in signatarios)
+        return placeholders, nomes
+
+    def renderizar_signatarios(self, template_path, signatarios):
+        """
+        Gera em memória um único documento assinado por vários signatários:
+        os parágrafos de signatário (nome, CPF, assinatura...) são repetidos
+        uma vez por pessoa, na ordem da lista; os demais slots usam os dados
+        do primeiro. O negrito cobre os nomes de todos.
+
+        Args:
+            signatarios: Lista de dicionários dados_pessoa
+
+        Returns:
+            Document do python-docx
+        """
+        from signatarios import repetir_blocos
+
+        placeholders, nomes = self._preparar_signatarios(signatarios)
+
+        with self.instrumentacao.etapa('carregamento'):
+            template = self._preparar_template(template_path, placeholders[0])
+            doc = template.clonar()
+            paragrafos, copias = repetir_blocos(template, doc, len(signatarios))
+
+        with self.instrumentacao.etapa('paragrafos'):
+            for slot in template.slots:
+                if slot.indice not in copias:
+                    texto = substituir_placeholders(slot.texto, placeholders[0], slot.spans)
+                    self.escrever_paragrafo(paragrafos[slot.indice], texto, *nomes)
+                    continue
+
+                for paragraph, valores in zip(copias[slot.indice], placeholders):
+                    texto = substituir_placeholders(slot.texto, valores, slot.spans)
+                    self.escrever_paragrafo(paragraph, texto, *nomes)
+
+        return doc
+
+    def renderizar_bytes_signatarios(self, template_path, signatarios, backend=None):
+        """
+        Igual a renderizar_signatarios, com o backend escolhido.
+
+        Returns:
+            Bytes do .docx
+        """
+        backend = self._verificar_backend(backend or self.backend)
+
+        if backend == 'docx':
+            doc = self.renderizar_signatarios(template_path, signatarios)
+            buffer = io.BytesIO()
+            with self.instrumentacao.etapa('salvar'):
+                doc.save(buffer)
+            return buffer.getvalue()
+
+        from signatarios import obter_plano_signatarios
 
-            print(f"📄 Processando: {os.path.basename(template_path)}")
+        placeholders, nomes = self._preparar_signatarios(signatarios)
 
-            # Carregar documento
-            doc = Document(template_path)
+        with self.instrumentacao.etapa('carregamento'):
+            template = self._preparar_template(template_path, placeholders[0])
+            plano = obter_plano_signatarios(template)
 
-            # Processar todos os parágrafos
-            for paragraph in doc.paragraphs:
-                self.processar_paragrafo(paragraph, placeholders, nome_completo)
+        def runs_do_slot(slot, numero):
+            texto = substituir_placeholders(slot.texto, placeholders[numero], slot.spans)
+            runs = self.aplicar_negrito_seletivo(texto, *nomes)
+            self.instrumentacao.contar('paragrafos')
+            self.instrumentacao.contar('runs', len(runs))
+            return runs
 
-            # Processar tabelas
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            self.processar_paragrafo(paragraph, placeholders, nome_completo)
+        with self.instrumentacao.etapa('salvar'):
+            return plano.renderizar(runs_do_slot, len(signatarios))
 
-            # Nome do arquivo
-            nome_base = os.path.splitext(os.path.basename(template_path))[0]
-            nome_simplificado = nome_base.replace(" ", "_").replace("_MODEL", "")
+    def gerar_contrato(self, template_path, dados_pessoa, backend=None):
+        """Gera contrato com negrito seletivo (backend padrão: self.backend)"""
+        inicio = time.perf_counter()
+        try:
+            backend = self._verificar_backend(backend or self.backend)
+
+            nome_completo = dados_pessoa.get('nome_completo', '')
+
+            if not os.path.exists(template_path):
+                raise FileNotFoundError(f"Template não encontrado: {template_path}")
+
+            log.info(f"📄 Processando: {os.path.basename(template_path)}")
+
+            # Nome do arquivo (único; ver escritor.py)
+            nome_simplificado = nome_documento(template_path)
             nome_pessoa = nome_completo.replace(" ", "_")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nome_arquivo = self.escritor.nome(nome_simplificado, nome_pessoa)
+
+            with self.instrumentacao.perfilar(os.path.splitext(nome_arquivo)[0]), \
+                    self.instrumentacao.etapa('documento'):
+                resultado = 'gerado'
+                montado = None
+
+                # Grava num temporário, publicado com o nome final pelo escritor
+                def escrever(caminho):
+                    nonlocal resultado, montado
+                    if self.cache_resultados is not None:
+                        reaproveitado, montado = self._salvar_com_cache(template_path, dados_pessoa, caminho, backend)
+                        if reaproveitado:
+                            resultado = 'reaproveitado'
+                    elif backend == 'docx':
+                        doc, template, placeholders, runs = self._renderizar_docx(template_path, dados_pessoa)
+                        with self.instrumentacao.etapa('salvar'):
+                            doc.save(caminho)
+                        if self.mapa_slots:
+                            montado = self._montado(template, placeholders, runs)
+                    else:
+                        plano, template, placeholders, runs_do_slot = self._preparar_xml(template_path, dados_pessoa)
+                        with self.instrumentacao.etapa('salvar'):
+                            documento_xml, posicoes = plano.montar_documento(runs_do_slot)
+                            with open(caminho, 'wb') as arquivo:
+                                arquivo.write(plano.empacotar(documento_xml))
+                        if self.mapa_slots:
+                            from reedicao import hash_documento
+                            montado = (template, placeholders, hash_documento(documento_xml), posicoes)
+
+                output_path = self.escritor.salvar(escrever, nome_simplificado, nome_pessoa, nome=nome_arquivo)
+                nome_arquivo = os.path.basename(output_path)
+
+                if self.mapa_slots:
+                    self._gravar_mapa(template_path, dados_pessoa, output_path, montado)
+
+            # A conversão roda em segundo plano, no pool
+            if self.exportador_pdf is not None:
+                self.exportador_pdf.enviar(output_path)
+
+            self.instrumentacao.contar('documentos')
+            log.info(f"  ✅ Salvo: {nome_arquivo}", extra={
+                'evento': 'documento',
+                'documento': nome_arquivo,
+                'template': os.path.basename(template_path),
+                'pessoa': nome_completo,
+                'backend': backend,
+                'duracao': round(time.perf_counter() - inicio, 6),
+                'resultado': resultado,
+            })
+            return output_path
 
-            nome_arquivo = f"{nome_simplificado}_{nome_pessoa}_{timestamp}.docx"
-            output_path = os.path.join("output", nome_arquivo)
+        except Exception as e:
+            self.instrumentacao.contar('erros')
+            log.error(f"✗ Erro ao gerar contrato: {str(e)}", exc_info=True, extra={
+                'evento': 'documento',
+                'template': os.path.basename(template_path),
+                'pessoa': dados_pessoa.get('nome_completo', ''),
+                'duracao': round(time.perf_counter() - inicio, 6),
+                'resultado': 'erro',
+            })
+            raise
 
-            # Salvar
-            os.makedirs("output", exist_ok=True)
-            doc.save(output_path)
+    def gerar_contrato_conjunto(self, template_path, signatarios, backend=None):
+        """
+        Gera e salva um único contrato assinado por todos os signatários
+        (ver renderizar_signatarios). Não usa o cache de resultados nem grava
+        mapa de slots: a correção de campos (reedicao.py) é por pessoa.
+        """
+        inicio = time.perf_counter()
+        pessoas = ', '.join(dados.get('nome_completo', '') for dados in signatarios)
+        try:
+            backend = self._verificar_backend(backend or self.backend)
+
+            if not os.path.exists(template_path):
+                raise FileNotFoundError(f"Template não encontrado: {template_path}")
 
-            print(f"  ✅ Salvo: {nome_arquivo}")
+            log.info(f"📄 Processando: {os.path.basename(template_path)} ({len(signatarios)} signatários)")
+
+            # Nome do arquivo (único; ver escritor.py), na pasta "N_SIGNATARIOS"
+            nome_simplificado = nome_documento(template_path)
+            grupo = f"{len(signatarios)}_SIGNATARIOS"
+            nome_arquivo = self.escritor.nome(nome_simplificado, grupo)
+
+            with self.instrumentacao.perfilar(os.path.splitext(nome_arquivo)[0]), \
+                    self.instrumentacao.etapa('documento'):
+                conteudo = self.renderizar_bytes_signatarios(template_path, signatarios, backend)
+                output_path = self.escritor.gravar(conteudo, nome_simplificado, grupo, nome=nome_arquivo)
+                nome_arquivo = os.path.basename(output_path)
+
+            if self.exportador_pdf is not None:
+                self.exportador_pdf.enviar(output_path)
+
+            self.instrumentacao.contar('documentos')
+            log.info(f"  ✅ Salvo: {nome_arquivo}", extra={
+                'evento': 'documento',
+                'documento': nome_arquivo,
+                'template': os.path.basename(template_path),
+                'pessoa': pessoas,
+                'backend': backend,
+                'duracao': round(time.perf_counter() - inicio, 6),
+                'resultado': 'gerado',
+            })
             return output_path
 
         except Exception as e:
-            print(f"✗ Erro ao gerar contrato: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            self.instrumentacao.contar('erros')
+            log.error(f"✗ Erro ao gerar contrato: {str(e)}", exc_info=True, extra={
+                'evento': 'documento',
+                'template': os.path.basename(template_path),
+                'pessoa': pessoas,
+                'duracao': round(time.perf_counter() - inicio, 6),
+                'resultado': 'erro',
+            })
             raise
 
+    def _gravar_mapa(self, template_path, dados_pessoa, output_path, montado=None):
+        """
+        Grava o mapa de slots do contrato (ver reedicao.py).
+
+        Args:
+            montado: Tupla (template, placeholders, hash do document.xml,
+                posições) calculada junto com o documento (ver _montado);
+                sem ela (acerto do cache de resultados, em que nada foi
+                renderizado), os runs de cada slot são calculados aqui e
+                emendados no plano do template, sem python-docx
+        """
+        from reedicao import gravar_mapa, montar_mapa
+
+        with self.instrumentacao.etapa('mapa'):
+            if montado is None:
+                template = self._template_pronto(template_path)
+                placeholders = self.preparar_placeholders(dados_pessoa)
+                textos = self._textos_dos_slots(template, placeholders)
+                matcher = obter_matcher(dados_pessoa.get('nome_completo', ''))
+                runs = {slot.indice: matcher.segmentar(textos[slot.indice]) for slot in template.slots}
+                montado = self._montado(template, placeholders, runs)
+
+            gravar_mapa(output_path, montar_mapa(montado[0], dados_pessoa, *montado[1:]))
+
+    def atualizar_contrato(self, output_path, correcoes):
+        """
+        Corrige campos de um contrato já gerado, reescrevendo só os slots
+        afetados (ver reedicao.py). O arquivo é substituído de uma vez.
+
+        Args:
+            output_path: Contrato gerado com mapa de slots
+            correcoes: Dicionário {campo de dados_pessoa: valor novo}
+
+        Returns:
+            Número de slots reescritos
+        """
+        from reedicao import gravar_arquivo, gravar_mapa, ler_documento_xml, ler_mapa
+
+        mapa = ler_mapa(output_path)
+        conteudo, mapa, reescritos = self.remendar(ler_documento_xml(output_path), mapa, correcoes)
+
+        if conteudo is not None:
+            gravar_arquivo(output_path, conteudo)
+        gravar_mapa(output_path, mapa)
+        return reescritos
+
+    def remendar(self, documento_xml, mapa, correcoes):
+        """
+        Aplica as correções em memória (ver atualizar_contrato).
+
+        Se o template mudou ou o document.xml não é mais o do mapa, o
+        contrato é gerado de novo por inteiro.
+
+        Args:
+            documento_xml: Bytes do document.xml atual do contrato
+            mapa: Mapa de slots do contrato (reedicao.ler_mapa)
+            correcoes: Dicionário {campo de dados_pessoa: valor novo}
+
+        Returns:
+            Tupla (bytes do .docx novo ou None se nada mudou, mapa novo,
+            número de slots reescritos)
+        """
+        from reedicao import MapaDesatualizado, emendar, hash_documento, montar_mapa
+        from renderizador_xml import xml_run
+
+        dados_pessoa = {**mapa['dados'], **correcoes}
+        plano, template, placeholders, runs_do_slot = self._preparar_xml(mapa['template'], dados_pessoa)
+
+        try:
+            if template.hash != mapa['hash_template']:
+                raise MapaDesatualizado("template alterado")
+            if hash_documento(documento_xml) != mapa['hash_documento']:
+                raise MapaDesatualizado("arquivo alterado depois de gerado")
+        except MapaDesatualizado as e:
+            log.info(f"  🔁 Gerando de novo ({str(e)}): {os.path.basename(template.caminho)}")
+            documento_xml, posicoes = plano.montar_documento(runs_do_slot)
+            novo_mapa = montar_mapa(template, dados_pessoa, placeholders, hash_documento(documento_xml), posicoes)
+            return plano.empacotar(documento_xml), novo_mapa, len(template.slots)
+
+        alterados = {chave for chave, valor in placeholders.items() if mapa['placeholders'].get(chave) != valor}
+        if mapa['dados'].get('nome_completo', '') != dados_pessoa.get('nome_completo', ''):
+            # O nome entra no negrito de qualquer slot
+            afetados = template.slots
+        else:
+            afetados = [slot for slot in template.slots if alterados.intersection(slot.placeholders)]
+
+        conteudo = None
+        posicoes = mapa['slots']
+        if afetados:
+            novos_runs = {
+                slot.indice: ''.join(xml_run(texto, negrito) for texto, negrito in runs_do_slot(slot)).encode('utf-8')
+                for slot in afetados
+            }
+            documento_xml, posicoes = emendar(documento_xml, posicoes, novos_runs)
+            conteudo = plano.empacotar(documento_xml)
+
+        novo_mapa = montar_mapa(template, dados_pessoa, placeholders, hash_documento(documento_xml), posicoes)
+        return conteudo, novo_mapa, len(afetados)
+
+    def _salvar_com_cache(self, template_path, dados_pessoa, output_path, backend='docx'):
+        """
+        Salva o contrato a partir do cache de resultados: se o mesmo template
+        já foi gerado com os mesmos valores, o arquivo de saída vira um
+        apelido do artefato em cache, sem renderizar de novo.
+
+        Returns:
+            Tupla (True se o artefato foi reaproveitado do cache, dados do
+            mapa de slots do documento renderizado ou None)
+        """
+        chave = self._chave_resultado(template_path, dados_pessoa, backend)
+
+        if self.cache_resultados.reaproveitar(chave, output_path):
+            self.instrumentacao.contar('reaproveitados')
+            log.info("  ♻️  Reaproveitado do cache")
+            return True, None
+
+        conteudo, montado = self._renderizar_bytes(template_path, dados_pessoa, backend, self.mapa_slots)
+        artefato = self.cache_resultados.guardar(chave, conteudo)
+        try:
+            self.cache_resultados.vincular(artefato, output_path)
+        except FileNotFoundError:
+            # Removido do cache por outro processo antes do apelido
+            gravar_atomico(output_path, conteudo)
+        return False, montado
+
+    def _chave_resultado(self, template_path, dados_pessoa, backend):
+        """Chave do documento no cache de resultados"""
+        template = self.cache_templates.obter(template_path)
+        placeholders = self.preparar_placeholders(dados_pessoa)
+        # O backend padrão mantém as chaves já existentes no cache
+        variante = '' if backend == 'docx' else backend
+        return self.cache_resultados.chave(template.hash, placeholders, variante)
+
+    def renderizar_com_cache(self, template_path, dados_pessoa, backend=None):
+        """
+        Igual a renderizar_bytes, passando pelo cache de resultados (se
+        houver): o mesmo caminho de gerar_contrato, para quem grava os
+        bytes em outro lugar que não output/ (ver pacote_zip.py).
+
+        Returns:
+            Bytes do .docx
+        """
+        backend = self._verificar_backend(backend or self.backend)
+
+        if self.cache_resultados is None:
+            return self.renderizar_bytes(template_path, dados_pessoa, backend)
+
+        chave = self._chave_resultado(template_path, dados_pessoa, backend)
+        conteudo = self.cache_resultados.ler(chave)
+        if conteudo is not None:
+            self.instrumentacao.contar('reaproveitados')
+            log.info("  ♻️  Reaproveitado do cache")
+            return conteudo
+
+        conteudo = self.renderizar_bytes(template_path, dados_pessoa, backend)
+        self.cache_resultados.guardar(chave, conteudo)
+        return conteudo
+
+
+def resolver_template(template_path):
+    """Caminho absoluto do template, relativo à pasta do projeto (BASE_DIR)"""
+    if os.path.isabs(template_path):
+        return template_path
+    return os.path.join(BASE_DIR, template_path)
+
+
+def gerar_documento(dados_pessoa, template_path, gerador=None, backend=None):
+    """
+    Gera o contrato inteiramente em memória.
+
+    Não imprime nada, não grava arquivos e não depende do diretório atual:
+    caminhos relativos de template são resolvidos a partir de BASE_DIR.
+
+    Returns:
+        BytesIO posicionado no início, com o .docx gerado
+    """
+    return io.BytesIO(gerar_bytes(dados_pessoa, template_path, gerador, backend))
 
-def gerar_todos_contratos(dados_pessoa):
-    """Função principal"""
-    gerador = GeradorContratos()
 
-    templates = [
-        ("templates/PROCURACAO_MODEL.docx", "Procuração"),
-        ("templates/TERMO DE AUTORIZAÇÃO DE IMAGEM_MODEL.docx", "Autorização de Imagem"),
-        ("templates/TERMO DE CONFIDENCIALIDADE_MODEL.docx", "Confidencialidade"),
-        ("templates/TERMO DE PROTEÇÃO DE DADOS_MODEL.docx", "Proteção de Dados"),
-    ]
+def gerar_bytes(dados_pessoa, template_path, gerador=None, backend=None):
+    """Igual a gerar_documento, mas devolve os bytes do .docx"""
+    gerador = gerador or GeradorContratos()
+    return gerador.renderizar_bytes(resolver_template(template_path), dados_pessoa, backend)
+
+
+# Templates gerados para cada pessoa: (caminho, nome do contrato), ver catalogo.py
+TEMPLATES = CATALOGO.pares()
+
+
+_cache_resultados = None
+
+
+def obter_cache_resultados():
+    """
+    Cache de resultados padrão do processo (criado no primeiro uso), ou
+    None se config.CACHE_RESULTADOS_ATIVO estiver desligado.
+    """
+    global _cache_resultados
+
+    if not CACHE_RESULTADOS_ATIVO:
+        return None
+
+    if _cache_resultados is None:
+        from cache_resultados import CacheResultados
+        _cache_resultados = CacheResultados()
+
+    return _cache_resultados
+
+
+def gerar_todos_contratos(dados_pessoa, documentos=None, pdf=None):
+    """
+    Função principal
+
+    Args:
+        documentos: Ids do catálogo a gerar (ex.: ['PROCURACAO']); padrão: todos
+        pdf: PoolConversores para exportar cada contrato para PDF (opcional)
+
+    Returns:
+        Lista [(nome_contrato, caminho ou None), ...]
+    """
+    gerador = GeradorContratos(cache_resultados=obter_cache_resultados(), exportador_pdf=pdf)
 
     resultados = []
 
-    for template_path, nome_contrato in templates:
+    for template_path, nome_contrato in CATALOGO.pares(documentos):
         try:
             caminho = gerador.gerar_contrato(template_path, dados_pessoa)
             resultados.append((nome_contrato, caminho))
         except Exception as e:
-            print(f"  ✗ Falha no {nome_contrato}: {str(e)}")
+            log.warning(f"  ✗ Falha no {nome_contrato}: {str(e)}")
+            resultados.append((nome_contrato, None))
+
+    return resultados
+
+
+def gerar_contratos_conjuntos(signatarios, documentos=None, pdf=None):
+    """
+    Gera um único contrato de cada documento, assinado por todos os
+    signatários (ver signatarios.py)
+
+    Args:
+        signatarios: Lista de dicionários dados_pessoa
+        documentos: Ids do catálogo a gerar; padrão: todos
+        pdf: PoolConversores para exportar cada contrato para PDF (opcional)
+
+    Returns:
+        Lista [(nome_contrato, caminho ou None), ...]
+    """
+    gerador = GeradorContratos(exportador_pdf=pdf)
+
+    resultados = []
+
+    for template_path, nome_contrato in CATALOGO.pares(documentos):
+        try:
+            caminho = gerador.gerar_contrato_conjunto(template_path, signatarios)
+            resultados.append((nome_contrato, caminho))
+        except Exception as e:
+            log.warning(f"  ✗ Falha no {nome_contrato}: {str(e)}")
             resultados.append((nome_contrato, None))
 
-    return resultados
\ No newline at end of file
+    return resultados
@@ -0,0 +1,216 @@
+# instrumentacao.py
+"""
+Instrumentação da geração de contratos
+
+O GeradorContratos marca cada etapa da geração com
+`instrumentacao.etapa(nome)`:
+
+    documento     gerar_contrato inteiro
+    carregamento  template do cache (e plano do backend xml)
+    placeholders  preparar_placeholders e substituição nos slots
+    paragrafos    reescrita dos slots do corpo do documento
+    tabelas       reescrita dos slots dentro de tabelas
+    negrito       aplicar_negrito_seletivo (dentro de paragrafos/tabelas)
+    salvar        serialização do .docx (no backend xml, também a emenda
+                  dos slots, que não passa por paragrafos/tabelas)
+    mapa          mapa de slots gravado ao lado do contrato (ver reedicao.py)
+
+As etapas se aninham (negrito está dentro de paragrafos, que está dentro de
+documento), então os tempos não devem ser somados entre etapas.
+
+A Instrumentacao guarda um histograma de latência por etapa e contadores
+(documentos, parágrafos, runs, erros), chama os callbacks registrados a
+cada etapa e exporta tudo no formato de texto do Prometheus. Opcionalmente
+grava um perfil do cProfile ou um snapshot do tracemalloc por documento.
+"""
+
+import bisect
+import contextlib
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+
+# Limites (segundos) dos buckets dos histogramas de latência
+BUCKETS_PADRAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+PERFIS = ('cprofile', 'tracemalloc')
+
+
+class _Histograma:
+    """Contagem cumulativa por bucket, soma e total de observações"""
+
+    __slots__ = ('contagens', 'soma', 'total')
+
+    def __init__(self, buckets):
+        self.contagens = [0] * len(buckets)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, buckets, valor):
+        posicao = bisect.bisect_left(buckets, valor)
+        if posicao < len(self.contagens):
+            self.contagens[posicao] += 1
+        self.soma += valor
+        self.total += 1
+
+
+class Instrumentacao:
+    """
+    Coleta tempos e contadores da geração.
+
+    Args:
+        callbacks: Funções chamadas ao fim de cada etapa com
+            (etapa, segundos)
+        relogio: Função que devolve o tempo em segundos (padrão:
+            time.perf_counter)
+        buckets: Limites dos buckets dos histogramas, em segundos
+        perfil: 'cprofile' ou 'tracemalloc' para gravar um perfil por
+            documento, ou None
+        pasta_perfis: Pasta dos arquivos de perfil
+    """
+
+    def __init__(self, callbacks=None, relogio=time.perf_counter, buckets=BUCKETS_PADRAO,
+                 perfil=None, pasta_perfis="output/perfis"):
+        if perfil is not None and perfil not in PERFIS:
+            raise ValueError(f"Perfil desconhecido: {perfil} (use {', '.join(PERFIS)})")
+
+        self.callbacks = list(callbacks or [])
+        self.relogio = relogio
+        self.buckets = tuple(sorted(buckets))
+        self.perfil = perfil
+        self.pasta_perfis = pasta_perfis
+
+        self._histogramas = {}
+        self._contadores = {}
+        self._lock = threading.Lock()
+
+    def adicionar_callback(self, callback):
+        """Registra uma função chamada com (etapa, segundos) ao fim de cada etapa"""
+        self.callbacks.append(callback)
+
+    @contextlib.contextmanager
+    def etapa(self, nome):
+        """Mede o bloco como uma ocorrência da etapa `nome`"""
+        inicio = self.relogio()
+        try:
+            yield
+        finally:
+            self.observar(nome, self.relogio() - inicio)
+
+    def observar(self, nome, segundos):
+        """Registra a duração de uma etapa medida por fora"""
+        with self._lock:
+            histograma = self._histogramas.get(nome)
+            if histograma is None:
+                histograma = self._histogramas[nome] = _Histograma(self.buckets)
+            histograma.observar(self.buckets, segundos)
+
+        for callback in self.callbacks:
+            callback(nome, segundos)
+
+    def contar(self, nome, quantidade=1):
+        """Soma `quantidade` ao contador `nome`"""
+        with self._lock:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+
+    @contextlib.contextmanager
+    def perfilar(self, nome_documento):
+        """
+        Grava o perfil do bloco em pasta_perfis, conforme self.perfil:
+        <nome_documento>.prof (cProfile, ver pstats) ou
+        <nome_documento>.tracemalloc (tracemalloc.Snapshot.load).
+        """
+        if self.perfil is None:
+            yield
+            return
+
+        os.makedirs(self.pasta_perfis, exist_ok=True)
+        base = os.path.join(self.pasta_perfis, nome_documento)
+
+        if self.perfil == 'cprofile':
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+            try:
+                yield
+            finally:
+                perfilador.disable()
+                perfilador.dump_stats(base + ".prof")
+        else:
+            ja_ativo = tracemalloc.is_tracing()
+            if not ja_ativo:
+                tracemalloc.start()
+            try:
+                yield
+            finally:
+                tracemalloc.take_snapshot().dump(base + ".tracemalloc")
+                if not ja_ativo:
+                    tracemalloc.stop()
+
+    def resumo(self):
+        """Contadores e, por etapa, observações, tempo total e médio (segundos)"""
+        with self._lock:
+            return {
+                'contadores': dict(self._contadores),
+                'etapas': {
+                    nome: {
+                        'observacoes': histograma.total,
+                        'segundos': histograma.soma,
+                        'media': histograma.soma / histograma.total if histograma.total else 0.0,
+                    }
+                    for nome, histograma in self._histogramas.items()
+                },
+            }
+
+    def exportar_prometheus(self, prefixo="contratos"):
+        """Métricas no formato de texto do Prometheus (versão 0.0.4)"""
+        linhas = []
+
+        with self._lock:
+            for nome, valor in sorted(self._contadores.items()):
+                metrica = f"{prefixo}_{nome}_total"
+                linhas.append(f"# HELP {metrica} Total de {nome.replace('_', ' ')}")
+                linhas.append(f"# TYPE {metrica} counter")
+                linhas.append(f"{metrica} {valor}")
+
+            if self._histogramas:
+                metrica = f"{prefixo}_etapa_segundos"
+                linhas.append(f"# HELP {metrica} Duração de cada etapa da geração")
+                linhas.append(f"# TYPE {metrica} histogram")
+
+                for nome, histograma in sorted(self._histogramas.items()):
+                    acumulado = 0
+                    for limite, contagem in zip(self.buckets, histograma.contagens):
+                        acumulado += contagem
+                        linhas.append(f'{metrica}_bucket{{etapa="{nome}",le="{limite}"}} {acumulado}')
+                    linhas.append(f'{metrica}_bucket{{etapa="{nome}",le="+Inf"}} {histograma.total}')
+                    linhas.append(f'{metrica}_sum{{etapa="{nome}"}} {histograma.soma}')
+                    linhas.append(f'{metrica}_count{{etapa="{nome}"}} {histograma.total}')
+
+        return '\n'.join(linhas) + '\n'
+
+
+class _SemInstrumentacao:
+    """Instrumentação que não mede nada (padrão do GeradorContratos)"""
+
+    callbacks = ()
+    perfil = None
+
+    def __init__(self):
+        self._nulo = contextlib.nullcontext()
+
+    def etapa(self, nome):
+        return self._nulo
+
+    def perfilar(self, nome_documento):
+        return self._nulo
+
+    def observar(self, nome, segundos):
+        pass
+
+    def contar(self, nome, quantidade=1):
+        pass
+
+
+SEM_INSTRUMENTACAO = _SemInstrumentacao()
@@ -0,0 +1,192 @@
+# logs.py
+"""
+Registro (logging) da geração de contratos
+
+Os módulos registram o progresso no logger "contratos" (e filhos, ex.:
+"contratos.gerador") em vez de usar print. Sem nenhuma configuração, a saída
+é a mesma de sempre: as mensagens, legíveis, no stdout.
+
+configurar_logs escolhe o modo:
+    humano      mensagens no console (padrão)
+    json        além do console, um arquivo JSON-lines com um objeto por
+                evento (documento, template, duração, resultado...)
+    silencioso  para lotes grandes: o console só mostra avisos e erros e o
+                arquivo JSON-lines é gravado em lotes de N eventos
+
+Os eventos de documento trazem os campos extras de CAMPOS_EVENTO, passados
+com logger.info(..., extra={...}).
+
+Processos de um pool (paralelo.py) repetem a configuração do processo pai
+com preparar_processo(configuracao_logs()) e gravam no mesmo arquivo.
+"""
+
+import json
+import logging
+import sys
+import threading
+from datetime import datetime, timezone
+
+RAIZ = "contratos"
+
+# Argumentos da última chamada a configurar_logs
+_configuracao = {}
+
+MODOS = ('humano', 'json', 'silencioso')
+
+# Campos extras copiados do registro para o JSON
+CAMPOS_EVENTO = (
+    'evento', 'documento', 'template', 'pessoa', 'linha',
+    'duracao', 'resultado', 'backend', 'caminho',
+)
+
+
+def obter_logger(nome):
+    """Logger filho de "contratos" (ex.: obter_logger('gerador'))"""
+    return logging.getLogger(f"{RAIZ}.{nome}")
+
+
+class FormatadorJson(logging.Formatter):
+    """Um objeto JSON por linha, com os campos extras do evento"""
+
+    def format(self, record):
+        evento = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensagem': record.getMessage().strip(),
+        }
+
+        for campo in CAMPOS_EVENTO:
+            if hasattr(record, campo):
+                evento[campo] = getattr(record, campo)
+
+        if record.exc_info:
+            evento['excecao'] = self.formatException(record.exc_info)
+
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+class ManipuladorJsonLinhas(logging.Handler):
+    """
+    Grava os eventos num arquivo JSON-lines, acumulando até `capacidade`
+    eventos antes de cada escrita. Erros forçam a escrita imediata; o resto
+    é gravado no fechamento (logging.shutdown, chamado na saída do Python).
+    """
+
+    def __init__(self, caminho, capacidade=1):
+        super().__init__()
+        self.caminho = caminho
+        self.capacidade = max(1, capacidade)
+        self._arquivo = open(caminho, 'a', encoding='utf-8')
+        self._pendentes = []
+        self._escrita = threading.Lock()
+        self.setFormatter(FormatadorJson())
+
+    def emit(self, record):
+        try:
+            linha = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._escrita:
+            self._pendentes.append(linha)
+            if len(self._pendentes) >= self.capacidade or record.levelno >= logging.ERROR:
+                self._gravar()
+
+    def _gravar(self):
+        if self._pendentes:
+            self._arquivo.write('\n'.join(self._pendentes) + '\n')
+            self._arquivo.flush()
+            self._pendentes = []
+
+    def descartar_pendentes(self):
+        """Esquece os eventos ainda não gravados (herdados num fork)"""
+        self._pendentes = []
+
+    def flush(self):
+        with self._escrita:
+            if not self._arquivo.closed:
+                self._gravar()
+
+    def close(self):
+        with self._escrita:
+            if not self._arquivo.closed:
+                self._gravar()
+                self._arquivo.close()
+        super().close()
+
+
+def _manipulador_console(nivel):
+    manipulador = logging.StreamHandler(sys.stdout)
+    manipulador.setFormatter(logging.Formatter("%(message)s"))
+    manipulador.setLevel(nivel)
+    return manipulador
+
+
+def configurar_logs(modo='humano', arquivo=None, nivel=logging.INFO, lote=1000):
+    """
+    Configura o logger "contratos".
+
+    Args:
+        modo: 'humano', 'json' ou 'silencioso' (ver docstring do módulo)
+        arquivo: Arquivo JSON-lines (obrigatório nos modos json e silencioso)
+        nivel: Nível mínimo registrado
+        lote: Eventos por escrita no modo silencioso
+
+    Returns:
+        O logger "contratos"
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de log desconhecido: {modo} (use {', '.join(MODOS)})")
+    if modo != 'humano' and not arquivo:
+        raise ValueError(f"O modo {modo} precisa de um arquivo JSON-lines")
+
+    _configuracao.clear()
+    _configuracao.update(modo=modo, arquivo=arquivo, nivel=nivel, lote=lote)
+
+    logger = logging.getLogger(RAIZ)
+    for manipulador in list(logger.handlers):
+        logger.removeHandler(manipulador)
+        manipulador.close()
+
+    logger.setLevel(nivel)
+    logger.propagate = False
+
+    if modo == 'silencioso':
+        logger.addHandler(_manipulador_console(logging.WARNING))
+        logger.addHandler(ManipuladorJsonLinhas(arquivo, capacidade=lote))
+    else:
+        logger.addHandler(_manipulador_console(nivel))
+        if modo == 'json':
+            logger.addHandler(ManipuladorJsonLinhas(arquivo))
+
+    return logger
+
+
+def configuracao_logs():
+    """Argumentos da configuração atual, para repassar a preparar_processo"""
+    return dict(_configuracao)
+
+
+def preparar_processo(configuracao):
+    """
+    Configura os logs num processo filho como no processo pai.
+
+    Num fork, os eventos pendentes herdados pertencem ao pai (que ainda vai
+    gravá-los) e são descartados. Os eventos do filho são gravados quando o
+    processo do pool termina normalmente.
+    """
+    import multiprocessing.util
+
+    for manipulador in logging.getLogger(RAIZ).handlers:
+        if isinstance(manipulador, ManipuladorJsonLinhas):
+            manipulador.descartar_pendentes()
+
+    configurar_logs(**configuracao)
+    multiprocessing.util.Finalize(None, logging.shutdown, exitpriority=0)
+
+
+# Sem configuração explícita, mantém a saída legível de sempre no stdout
+if not logging.getLogger(RAIZ).handlers:
+    configurar_logs()
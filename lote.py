@@ -0,0 +1,688 @@
+# lote.py
+"""
+Geração de contratos em lote a partir de uma planilha (CSV ou XLSX)
+
+Cada linha da planilha corresponde a um outorgante. As linhas são lidas uma
+a uma (sem carregar a planilha inteira em memória), formatadas com o
+FormatadorDados e enviadas para gerar_todos_contratos.
+
+Uso:
+    python lote.py roster.csv
+    python lote.py roster.xlsx --aba Plan1
+    python lote.py roster.csv --processos 8
+    python lote.py roster.csv --zip lote.zip
+    python lote.py roster.csv --documentos PROCURACAO,TERMO_DE_CONFIDENCIALIDADE
+    python lote.py roster.csv --pdf --pdf-processos 4
+    python lote.py socios.csv --conjunto --documentos TERMO_DE_CONFIDENCIALIDADE
+    python lote.py roster.csv --diario lote.db
+    python lote.py roster.csv --somente-validar --relatorio-validacao erros.csv
+    python lote.py roster.csv --log-json lote.jsonl
+    python lote.py roster.csv --silencioso --log-json lote.jsonl
+
+Antes de gerar qualquer documento, a planilha inteira é validada (CPF,
+OAB, UF e data, ver validacao.py); as linhas inválidas são rejeitadas.
+
+Com --diario, cada documento gerado é registrado num diário SQLite (ver
+diario.py); se o lote for interrompido, o mesmo comando continua de onde
+parou: os documentos já prontos são pulados e só os que faltam (ou
+falharam) são gerados.
+
+Com --conjunto, em vez de um jogo de documentos por linha, sai um único
+documento de cada tipo assinado por todos (uma linha, um signatário; ver
+signatarios.py).
+
+O progresso vai para o logger "contratos" (ver logs.py). Com --log-json,
+cada evento (linha, documento, template, duração, resultado) também é
+gravado num arquivo JSON-lines; --silencioso deixa no console só avisos,
+erros e o resumo, e grava o JSON-lines em lotes, para planilhas grandes.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+
+from catalogo import CATALOGO, separar_ids
+from config import PDF_CONVERSOR, PDF_PROCESSOS
+from exportar_pdf import CONVERSORES, ConversorIndisponivel, PoolConversores
+from formatador import FormatadorDados
+from logs import configurar_logs, obter_logger
+from validacao import RelatorioValidacao, validar_colunas
+
+log = obter_logger('lote')
+
+# Colunas esperadas na planilha (mesmas chaves produzidas pelo ColetorDados)
+COLUNAS_ROSTER = [
+    'nome_completo',
+    'cpf',
+    'endereco_completo',
+    'cidade',
+    'estado',
+    'oab_numero',
+    'oab_uf',
+    'estado_civil',
+    'data',
+]
+
+# Colunas sem as quais a linha é rejeitada antes de gerar documentos
+COLUNAS_OBRIGATORIAS = ['nome_completo', 'cpf']
+
+# Linhas lidas e formatadas de uma vez (a memória fica limitada a um bloco)
+TAMANHO_BLOCO = 1000
+
+
+def _normalizar_cabecalho(nome):
+    """Normaliza o nome de uma coluna: minúsculas, sem espaços nas pontas"""
+    return str(nome or '').strip().lower().replace(' ', '_')
+
+
+def ler_csv(caminho):
+    """
+    Lê um CSV linha a linha, devolvendo dicionários.
+    Detecta automaticamente o separador (vírgula, ponto e vírgula ou tab).
+    """
+    with open(caminho, newline='', encoding='utf-8-sig') as arquivo:
+        amostra = arquivo.read(4096)
+        arquivo.seek(0)
+
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+        except csv.Error:
+            dialeto = csv.excel
+
+        leitor = csv.reader(arquivo, dialeto)
+        cabecalho = [_normalizar_cabecalho(c) for c in next(leitor, [])]
+
+        for linha in leitor:
+            if not any(campo.strip() for campo in linha):
+                continue
+            yield dict(zip(cabecalho, linha))
+
+
+def ler_xlsx(caminho, aba=None):
+    """
+    Lê uma planilha XLSX linha a linha (modo somente leitura do openpyxl),
+    devolvendo dicionários.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Para ler arquivos .xlsx instale o openpyxl: pip install openpyxl")
+
+    planilha = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        folha = planilha[aba] if aba else planilha.active
+        linhas = folha.iter_rows(values_only=True)
+        cabecalho = [_normalizar_cabecalho(c) for c in next(linhas, ())]
+
+        for linha in linhas:
+            valores = ['' if valor is None else str(valor) for valor in linha]
+            if not any(valor.strip() for valor in valores):
+                continue
+            yield dict(zip(cabecalho, valores))
+    finally:
+        planilha.close()
+
+
+def ler_roster(caminho, aba=None):
+    """Escolhe o leitor conforme a extensão do arquivo"""
+    extensao = os.path.splitext(caminho)[1].lower()
+
+    if extensao in ('.xlsx', '.xlsm'):
+        return ler_xlsx(caminho, aba)
+    if extensao in ('.csv', '.txt'):
+        return ler_csv(caminho)
+
+    raise ValueError(f"Formato de planilha não suportado: {extensao}")
+
+
+def formatar_registro(linha, formatador=None):
+    """
+    Converte uma linha crua da planilha no dicionário dados_pessoa,
+    aplicando as mesmas formatações do ColetorDados.
+    """
+    formatador = formatador or FormatadorDados()
+
+    faltantes = [coluna for coluna in COLUNAS_OBRIGATORIAS if not str(linha.get(coluna, '')).strip()]
+    if faltantes:
+        raise ValueError(f"Campos obrigatórios vazios: {', '.join(faltantes)}")
+
+    nome_completo = formatador.formatar_nome_completo(linha.get('nome_completo', ''))
+    genero = formatador.determinar_genero(nome_completo)
+
+    dados = {
+        'nome_completo': nome_completo,
+        'cpf': formatador.formatar_cpf(linha.get('cpf', '')),
+        'endereco_completo': formatador.formatar_endereco(linha.get('endereco_completo', '')),
+        'cidade': formatador.formatar_cidade(linha.get('cidade', '')),
+        'estado': formatador.formatar_estado(linha.get('estado', '')),
+        'oab_numero': formatador.formatar_oab(linha.get('oab_numero', '')),
+        'oab_uf': str(linha.get('oab_uf', '')).strip().upper(),
+        'estado_civil': formatador.formatar_estado_civil(linha.get('estado_civil', ''), genero),
+        'data_formatada': formatador.formatar_data(linha.get('data', ''), estrito=True),
+    }
+
+    # Dados fixos
+    dados.update({
+        'profissao': 'advogado',
+        'nacionalidade': 'brasileiro',
+    })
+
+    return dados
+
+
+def formatar_bloco(linhas):
+    """
+    Formata um bloco de linhas de uma vez, coluna a coluna, com
+    FormatadorDados.formatar_colunas (valores repetidos são formatados uma
+    única vez por bloco).
+
+    Returns:
+        Lista com, para cada linha, o dicionário dados_pessoa ou a exceção
+        que impediu a formatação
+    """
+    resultados = [None] * len(linhas)
+    validas = []
+
+    for indice, linha in enumerate(linhas):
+        faltantes = [coluna for coluna in COLUNAS_OBRIGATORIAS if not str(linha.get(coluna, '')).strip()]
+        if faltantes:
+            resultados[indice] = ValueError(f"Campos obrigatórios vazios: {', '.join(faltantes)}")
+        else:
+            validas.append(indice)
+
+    colunas = {coluna: [linhas[i].get(coluna, '') for i in validas] for coluna in COLUNAS_ROSTER}
+    formatadas = FormatadorDados.formatar_colunas(colunas)
+
+    for posicao, indice in enumerate(validas):
+        if formatadas['data'][posicao] is None:
+            resultados[indice] = ValueError(f"Data inválida: {linhas[indice].get('data', '')}")
+            continue
+
+        dados = {
+            'nome_completo': formatadas['nome_completo'][posicao],
+            'cpf': formatadas['cpf'][posicao],
+            'endereco_completo': formatadas['endereco_completo'][posicao],
+            'cidade': formatadas['cidade'][posicao],
+            'estado': formatadas['estado'][posicao],
+            'oab_numero': formatadas['oab_numero'][posicao],
+            'oab_uf': formatadas['oab_uf'][posicao],
+            'estado_civil': formatadas['estado_civil'][posicao],
+            'data_formatada': formatadas['data'][posicao],
+            # Dados fixos
+            'profissao': 'advogado',
+            'nacionalidade': 'brasileiro',
+        }
+        resultados[indice] = dados
+
+    return resultados
+
+
+def _em_blocos(linhas, tamanho):
+    """Agrupa o iterável em listas de até `tamanho` itens"""
+    bloco = []
+    for item in linhas:
+        bloco.append(item)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def validar_planilha(caminho, aba=None):
+    """
+    Valida a planilha inteira, em blocos de TAMANHO_BLOCO, sem gerar
+    documentos.
+
+    Returns:
+        RelatorioValidacao, com os erros identificados pelo número da linha
+    """
+    relatorio = RelatorioValidacao()
+
+    # Linha 1 é o cabeçalho
+    numeradas = enumerate(ler_roster(caminho, aba), start=2)
+
+    for bloco in _em_blocos(numeradas, TAMANHO_BLOCO):
+        colunas = {coluna: [linha.get(coluna, '') for _, linha in bloco] for coluna in COLUNAS_ROSTER}
+        relatorio.adicionar(len(bloco), validar_colunas(colunas, [numero for numero, _ in bloco]))
+
+    return relatorio
+
+
+def mostrar_validacao(relatorio):
+    """Mostra os erros de validação, uma linha da planilha por vez"""
+    for numero_linha, erros in relatorio.por_linha().items():
+        detalhes = '; '.join(f"{erro.campo}: {erro.mensagem}" for erro in erros)
+        log.warning(f"❌ Linha {numero_linha}: {detalhes}",
+                    extra={'evento': 'validacao', 'linha': numero_linha, 'resultado': 'invalida'})
+
+    invalidas = len(relatorio.linhas_invalidas)
+    log.info(f"🔎 Validação: {relatorio.linhas} linhas, {invalidas} inválidas, {len(relatorio.erros)} erros")
+
+
+def _registros_formatados(caminho, aba, totais, rejeitadas=frozenset(), cruas=None):
+    """
+    Lê e formata as linhas da planilha em blocos de TAMANHO_BLOCO,
+    descartando (e reportando) as que não puderem ser formatadas.
+
+    Args:
+        rejeitadas: Números das linhas já rejeitadas na validação (são
+            contadas como falha, sem nova mensagem)
+        cruas: Dicionário que recebe a linha crua de cada registro
+            entregue, pela mesma chave (usado pelo diário)
+
+    Yields:
+        Tuplas ((numero_linha, nome_completo), dados_pessoa)
+    """
+    # Linha 1 é o cabeçalho
+    numeradas = enumerate(ler_roster(caminho, aba), start=2)
+
+    for bloco in _em_blocos(numeradas, TAMANHO_BLOCO):
+        totais['linhas'] += len(bloco)
+        totais['linhas_falha'] += sum(1 for numero_linha, _ in bloco if numero_linha in rejeitadas)
+        bloco = [(numero_linha, linha) for numero_linha, linha in bloco if numero_linha not in rejeitadas]
+
+        formatados = formatar_bloco([linha for _, linha in bloco])
+
+        for (numero_linha, linha), dados in zip(bloco, formatados):
+            if isinstance(dados, Exception):
+                totais['linhas_falha'] += 1
+                log.warning(f"❌ Linha {numero_linha}: {str(dados)}",
+                            extra={'evento': 'linha', 'linha': numero_linha, 'resultado': 'invalida'})
+                continue
+
+            chave = (numero_linha, dados['nome_completo'])
+            if cruas is not None:
+                cruas[chave] = linha
+            yield chave, dados
+
+
+def _registrar_resultados(totais, numero_linha, nome_completo, resultados, pdf=None, retomados=frozenset()):
+    """
+    Atualiza os contadores e mostra o resultado de uma linha.
+
+    Args:
+        retomados: Caminhos que já estavam prontos (lote retomado pelo
+            diário); não contam como gerados nem vão de novo para o PDF
+    """
+    if pdf is not None:
+        # Conversão em segundo plano; os totais saem dos contadores do pool
+        for _, caminho_saida in resultados:
+            if caminho_saida and caminho_saida not in retomados:
+                pdf.enviar(caminho_saida)
+
+    prontos = sum(1 for _, caminho_saida in resultados if caminho_saida in retomados)
+    gerados = sum(1 for _, caminho_saida in resultados if caminho_saida) - prontos
+    falhas = len(resultados) - gerados - prontos
+    totais['documentos'] += gerados
+    totais['documentos_falha'] += falhas
+    if prontos:
+        totais['retomados'] = totais.get('retomados', 0) + prontos
+
+    evento = {'evento': 'linha', 'linha': numero_linha, 'pessoa': nome_completo}
+    resumo = f"{gerados + prontos}/{len(resultados)} contratos" + (f" ({prontos} já prontos)" if prontos else "")
+
+    if falhas:
+        totais['linhas_falha'] += 1
+        log.warning(f"⚠️  Linha {numero_linha}: {nome_completo} - {resumo}",
+                    extra={**evento, 'resultado': 'parcial' if gerados + prontos else 'falha'})
+    else:
+        totais['linhas_ok'] += 1
+        log.info(f"✅ Linha {numero_linha}: {nome_completo} - {resumo}",
+                 extra={**evento, 'resultado': 'ok'})
+
+
+class _Retomada:
+    """
+    Liga o lote ao diário (ver diario.py): tira de cada linha os documentos
+    já prontos e registra os que forem gerados.
+
+    As linhas são identificadas pela chave (numero_linha, nome_completo); a
+    pessoa, no diário, pela linha crua da planilha, que _registros_formatados
+    deixa em `cruas`.
+    """
+
+    def __init__(self, diario, entradas):
+        self.diario = diario
+        self.entradas = entradas
+        self.cruas = {}
+        self._pessoas = {}
+
+    def filtrar(self, chave, dados_pessoa):
+        """Entradas do catálogo que ainda faltam para a linha"""
+        pessoa, prontos, pendentes = self.diario.pendentes(self.cruas.pop(chave), self.entradas)
+        self._pessoas[chave] = (pessoa, prontos, pendentes)
+        return pendentes
+
+    def templates(self, chave, dados_pessoa):
+        """Igual a filtrar, como pares (template_path, nome_contrato) (ver paralelo.py)"""
+        return [(entrada.caminho, entrada.nome) for entrada in self.filtrar(chave, dados_pessoa)]
+
+    def juntar(self, chave, novos):
+        """
+        Registra no diário os documentos gerados para a linha.
+
+        Args:
+            novos: Resultados [(nome_contrato, caminho), ...] dos documentos
+                que faltavam, na ordem de filtrar
+
+        Returns:
+            Tupla (resultados de todos os documentos, caminhos já prontos)
+        """
+        numero_linha, nome_completo = chave
+        pessoa, prontos, pendentes = self._pessoas.pop(chave)
+
+        gerados = {}
+        for entrada, (_, caminho) in zip(pendentes, novos):
+            self.diario.registrar(pessoa, entrada.codigo, caminho, numero_linha, nome_completo)
+            gerados[entrada.codigo] = caminho
+
+        resultados = [(entrada.nome, prontos.get(entrada.codigo) or gerados.get(entrada.codigo)) for entrada in self.entradas]
+        return resultados, frozenset(prontos[entrada.codigo] for entrada in self.entradas if entrada.codigo in prontos)
+
+    def esquecer(self, chave):
+        self._pessoas.pop(chave, None)
+
+
+def _processar_conjunto(pessoas, totais, documentos=None, pdf=None):
+    """Gera um único documento de cada tipo com todas as pessoas como signatárias"""
+    from gerador import gerar_contratos_conjuntos
+
+    signatarios = list(pessoas)
+    if not signatarios:
+        return
+
+    resultados = gerar_contratos_conjuntos([dados for _, dados in signatarios], documentos)
+    if pdf is not None:
+        for _, caminho_saida in resultados:
+            if caminho_saida:
+                pdf.enviar(caminho_saida)
+
+    gerados = sum(1 for _, caminho_saida in resultados if caminho_saida)
+    totais['documentos'] += gerados
+    totais['documentos_falha'] += len(resultados) - gerados
+
+    if gerados == len(resultados):
+        totais['linhas_ok'] += len(signatarios)
+        log.info(f"✅ {len(signatarios)} signatários - {gerados}/{len(resultados)} contratos",
+                 extra={'evento': 'conjunto', 'resultado': 'ok'})
+    else:
+        totais['linhas_falha'] += len(signatarios)
+        log.warning(f"⚠️  {len(signatarios)} signatários - {gerados}/{len(resultados)} contratos",
+                    extra={'evento': 'conjunto', 'resultado': 'parcial' if gerados else 'falha'})
+
+
+def processar_lote(caminho, aba=None, processos=None, zip_saida=None, zip_por_pessoa=False,
+                   validar=True, relatorio_validacao=None, documentos=None, pdf=None, conjunto=False,
+                   diario=None):
+    """
+    Gera os contratos de todas as linhas da planilha.
+
+    As linhas são processadas em fluxo: nenhum resultado é acumulado além dos
+    contadores, de modo que a memória não cresce com o tamanho da planilha.
+
+    Args:
+        caminho: Planilha .csv ou .xlsx
+        aba: Aba da planilha (apenas .xlsx)
+        processos: Se informado, gera os documentos num pool com esse número
+            de processos (ver paralelo.py)
+        zip_saida: Se informado, grava todos os documentos nesse ZIP em vez
+            de arquivos soltos em output/ (ver pacote_zip.py)
+        zip_por_pessoa: Grava um ZIP por pessoa em output/
+        validar: Valida a planilha inteira antes de gerar e pula as linhas
+            inválidas (ver validacao.py)
+        relatorio_validacao: Se informado, grava os erros de validação
+            nesse CSV
+        documentos: Ids do catálogo a gerar para cada linha (ver
+            catalogo.py); padrão: todos
+        pdf: PoolConversores que converte cada documento gerado para PDF
+            (ver exportar_pdf.py); não combina com a saída em ZIP
+        conjunto: Gera um único documento de cada tipo, assinado por todas
+            as linhas (ver signatarios.py); as linhas ficam em memória e não
+            combina com ZIP nem com processos
+        diario: DiarioLote onde cada documento é registrado; os já
+            prontos nele são pulados (ver diario.py); não combina com ZIP
+            nem com o documento conjunto
+
+    Returns:
+        Dicionário com totais de linhas, documentos e tempo decorrido
+    """
+    totais = {
+        'linhas': 0,
+        'linhas_ok': 0,
+        'linhas_falha': 0,
+        'documentos': 0,
+        'documentos_falha': 0,
+    }
+
+    inicio = time.perf_counter()
+
+    if conjunto and (zip_saida or zip_por_pessoa or processos):
+        raise ValueError("O documento conjunto não pode ser combinado com ZIP nem com processos")
+    if diario is not None and (zip_saida or zip_por_pessoa or conjunto):
+        raise ValueError("O diário não pode ser combinado com ZIP nem com o documento conjunto")
+
+    if pdf is not None:
+        if zip_saida or zip_por_pessoa:
+            raise ValueError("A exportação para PDF não pode ser combinada com a saída em ZIP")
+        pdfs_antes, falhas_antes = pdf.convertidos, pdf.falhas
+
+    rejeitadas = frozenset()
+    if validar:
+        relatorio = validar_planilha(caminho, aba)
+        mostrar_validacao(relatorio)
+        if relatorio_validacao:
+            relatorio.gravar_csv(relatorio_validacao)
+        totais['validacao'] = relatorio.resumo()
+        rejeitadas = relatorio.linhas_invalidas
+
+    templates = CATALOGO.pares(documentos)
+    retomada = _Retomada(diario, CATALOGO.selecionar(documentos)) if diario is not None else None
+    pessoas = _registros_formatados(caminho, aba, totais, rejeitadas, retomada.cruas if retomada is not None else None)
+
+    if conjunto:
+        _processar_conjunto(pessoas, totais, documentos, pdf)
+    elif zip_saida:
+        from pacote_zip import gerar_pacote
+
+        for (numero_linha, nome_completo), resultados in gerar_pacote(pessoas, zip_saida, templates):
+            _registrar_resultados(totais, numero_linha, nome_completo, resultados, pdf)
+    elif zip_por_pessoa:
+        from pacote_zip import gerar_pacotes_por_pessoa
+
+        por_pessoa = gerar_pacotes_por_pessoa(pessoas, templates=templates)
+        for (numero_linha, nome_completo), _, resultados in por_pessoa:
+            _registrar_resultados(totais, numero_linha, nome_completo, resultados, pdf)
+    elif processos:
+        from paralelo import gerar_lote_paralelo
+
+        filtro = retomada.templates if retomada is not None else None
+        for chave, resultados in gerar_lote_paralelo(pessoas, templates, processos, filtro):
+            retomados = frozenset()
+            if retomada is not None:
+                resultados, retomados = retomada.juntar(chave, resultados)
+            _registrar_resultados(totais, *chave, resultados, pdf, retomados)
+    else:
+        from gerador import gerar_todos_contratos
+
+        for chave, dados in pessoas:
+            numero_linha, nome_completo = chave
+            retomados = frozenset()
+            try:
+                if retomada is None:
+                    resultados = gerar_todos_contratos(dados, documentos)
+                else:
+                    pendentes = [entrada.codigo for entrada in retomada.filtrar(chave, dados)]
+                    novos = gerar_todos_contratos(dados, pendentes) if pendentes else []
+                    resultados, retomados = retomada.juntar(chave, novos)
+            except Exception as e:
+                if retomada is not None:
+                    retomada.esquecer(chave)
+                totais['linhas_falha'] += 1
+                log.error(f"❌ Linha {numero_linha}: {str(e)}",
+                          extra={'evento': 'linha', 'linha': numero_linha, 'resultado': 'falha'})
+                continue
+
+            _registrar_resultados(totais, numero_linha, nome_completo, resultados, pdf, retomados)
+
+        from gerador import obter_cache_resultados
+
+        cache_resultados = obter_cache_resultados()
+        if cache_resultados is not None:
+            totais['cache'] = cache_resultados.estatisticas()
+
+    if diario is not None:
+        diario.gravar()
+
+    if pdf is not None:
+        pdf.aguardar()
+        totais['pdfs'] = pdf.convertidos - pdfs_antes
+        totais['pdfs_falha'] = pdf.falhas - falhas_antes
+
+    totais['segundos'] = time.perf_counter() - inicio
+    return totais
+
+
+def mostrar_totais(totais):
+    """Mostra o resumo do lote, incluindo a vazão em documentos por segundo"""
+    segundos = totais['segundos']
+    vazao = totais['documentos'] / segundos if segundos > 0 else 0.0
+
+    print("\n" + "=" * 60)
+    print("RESUMO DO LOTE")
+    print("=" * 60)
+    print(f"{'Linhas':20}: {totais['linhas']}")
+    print(f"{'Linhas com sucesso':20}: {totais['linhas_ok']}")
+    print(f"{'Linhas com falha':20}: {totais['linhas_falha']}")
+    if 'validacao' in totais:
+        print(f"{'Linhas inválidas':20}: {totais['validacao']['linhas_invalidas']}")
+    print(f"{'Documentos gerados':20}: {totais['documentos']}")
+    print(f"{'Documentos com falha':20}: {totais['documentos_falha']}")
+    if 'retomados' in totais:
+        print(f"{'Já prontos (diário)':20}: {totais['retomados']}")
+    if 'pdfs' in totais:
+        print(f"{'PDFs':20}: {totais['pdfs']} convertidos, {totais['pdfs_falha']} falhas")
+    print(f"{'Tempo total':20}: {segundos:.2f} s")
+    print(f"{'Vazão':20}: {vazao:.2f} documentos/s")
+    if 'cache' in totais:
+        cache = totais['cache']
+        print(f"{'Cache de resultados':20}: {cache['acertos']} acertos, {cache['faltas']} faltas")
+    print("=" * 60)
+
+
+def main(argv=None):
+    """Ponto de entrada do modo lote"""
+    parser = argparse.ArgumentParser(description="Gera contratos para todas as linhas de uma planilha")
+    parser.add_argument("planilha", help="Arquivo .csv ou .xlsx com um outorgante por linha")
+    parser.add_argument("--aba", help="Nome da aba (apenas .xlsx)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="Gera os documentos em paralelo com N processos")
+    saida = parser.add_mutually_exclusive_group()
+    saida.add_argument("--zip", dest="zip_saida", help="Grava todos os documentos num único ZIP")
+    saida.add_argument("--zip-por-pessoa", action="store_true", help="Grava um ZIP por pessoa em output/")
+    parser.add_argument("--documentos",
+                        help=f"Ids separados por vírgula (padrão: todos): {', '.join(CATALOGO.ids)}")
+    parser.add_argument("--conjunto", action="store_true",
+                        help="Um único documento de cada tipo, assinado por todas as linhas")
+    parser.add_argument("--diario", metavar="ARQUIVO",
+                        help="Registra cada documento neste diário SQLite e retoma um lote interrompido")
+    parser.add_argument("--diario-verificar", action="store_true",
+                        help="Ao retomar, confere o SHA-256 dos documentos já prontos")
+    parser.add_argument("--pdf", action="store_true", help="Converte também cada documento para PDF")
+    parser.add_argument("--pdf-conversor", default=PDF_CONVERSOR, choices=CONVERSORES,
+                        help=f"Conversor de PDF (padrão: {PDF_CONVERSOR}, ver exportar_pdf.py)")
+    parser.add_argument("--pdf-processos", type=int, default=PDF_PROCESSOS,
+                        help=f"Conversores de PDF em paralelo (padrão: {PDF_PROCESSOS})")
+    parser.add_argument("--somente-validar", action="store_true",
+                        help="Apenas valida a planilha, sem gerar documentos")
+    parser.add_argument("--sem-validacao", action="store_true",
+                        help="Não valida a planilha antes de gerar")
+    parser.add_argument("--relatorio-validacao", help="Grava os erros de validação neste CSV")
+    parser.add_argument("--log-json", metavar="ARQUIVO",
+                        help="Grava cada evento (linha, documento, duração, resultado) neste JSON-lines")
+    parser.add_argument("--silencioso", action="store_true",
+                        help="Só avisos e erros no console; exige --log-json, gravado em lotes")
+    parser.add_argument("--log-lote", type=int, default=1000,
+                        help="Eventos por escrita do JSON-lines no modo silencioso (padrão: 1000)")
+    parser.add_argument("--log-nivel", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Nível mínimo dos eventos registrados (padrão: INFO)")
+    args = parser.parse_args(argv)
+
+    if args.silencioso and not args.log_json:
+        print("❌ --silencioso precisa de --log-json.")
+        return 1
+
+    modo = 'silencioso' if args.silencioso else 'json' if args.log_json else 'humano'
+    configurar_logs(modo, args.log_json, getattr(logging, args.log_nivel), args.log_lote)
+
+    if args.processos and (args.zip_saida or args.zip_por_pessoa):
+        print("❌ A saída em ZIP não pode ser combinada com --processos.")
+        return 1
+
+    if args.pdf and (args.zip_saida or args.zip_por_pessoa):
+        print("❌ A saída em ZIP não pode ser combinada com --pdf.")
+        return 1
+
+    if args.conjunto and (args.processos or args.zip_saida or args.zip_por_pessoa):
+        print("❌ --conjunto não pode ser combinado com ZIP nem com --processos.")
+        return 1
+
+    if args.diario and (args.zip_saida or args.zip_por_pessoa or args.conjunto):
+        print("❌ --diario não pode ser combinado com ZIP nem com --conjunto.")
+        return 1
+
+    if not os.path.exists(args.planilha):
+        print(f"❌ Planilha não encontrada: {args.planilha}")
+        return 1
+
+    documentos = separar_ids(args.documentos)
+    try:
+        CATALOGO.selecionar(documentos)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        return 1
+
+    if args.somente_validar:
+        relatorio = validar_planilha(args.planilha, args.aba)
+        mostrar_validacao(relatorio)
+        if args.relatorio_validacao:
+            relatorio.gravar_csv(args.relatorio_validacao)
+        return 0 if relatorio.valido else 1
+
+    pdf = None
+    if args.pdf:
+        try:
+            pdf = PoolConversores(args.pdf_conversor, args.pdf_processos)
+        except ConversorIndisponivel as e:
+            print(f"❌ {str(e)}")
+            return 1
+
+    diario = None
+    if args.diario:
+        from diario import DiarioLote
+        diario = DiarioLote(args.diario, verificar=args.diario_verificar)
+
+    try:
+        totais = processar_lote(args.planilha, args.aba, args.processos, args.zip_saida, args.zip_por_pessoa,
+                                validar=not args.sem_validacao, relatorio_validacao=args.relatorio_validacao,
+                                documentos=documentos, pdf=pdf, conjunto=args.conjunto, diario=diario)
+    except KeyboardInterrupt:
+        print("\n\n❌ Lote interrompido pelo usuário.")
+        if diario is not None:
+            print(f"   Para continuar de onde parou, rode o mesmo comando com --diario {args.diario}")
+        return 1
+    finally:
+        if pdf is not None:
+            pdf.fechar()
+        if diario is not None:
+            diario.fechar()
+
+    mostrar_totais(totais)
+    return 0 if totais['linhas_falha'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,26 @@
 """
 Sistema de Geração de Contratos - Silveiro Advogados
 Com inputs formatados conforme especificações
+
+O gerador (python-docx, lxml) só é importado quando a geração começa. Até
+lá, uma thread importa o gerador e carrega os templates em segundo plano,
+enquanto o usuário responde às perguntas (ver iniciar_aquecimento).
+
+Uso:
+    python main.py                          (todos os documentos do catálogo)
+    python main.py PROCURACAO TERMO_DE_CONFIDENCIALIDADE
 """
 
 import os
-import re
-from datetime import datetime
-from gerador import gerar_todos_contratos
+import sys
+import threading
+from catalogo import CATALOGO
 from formatador import FormatadorDados
 from config import SIGLAS_ESTADOS
+from logs import obter_logger
+from validacao import validar_cpf, validar_numero_oab
+
+log = obter_logger('main')
 
 # Defina ESTADOS_CIVIS localmente no main.py
 ESTADOS_CIVIS = {
@@ -48,13 +60,14 @@ class ColetorDados:
                 # Formatar CPF com pontos e traço
                 cpf_formatado = self.formatador.formatar_cpf(cpf)
 
-                # Verificar se a formatação resultou em um CPF válido
-                if len(re.sub(r'[^\d]', '', cpf_formatado)) == 11:
+                # Verificar os 11 dígitos e os dígitos verificadores
+                erro = validar_cpf(cpf_formatado)
+                if erro is None:
                     self.dados['cpf'] = cpf_formatado
                     print(f"   ✓ CPF formatado: {cpf_formatado}")
                     break
                 else:
-                    print("❌ CPF inválido. Digite 11 números.")
+                    print(f"❌ {erro}. Tente novamente.")
             else:
                 print("❌ CPF é obrigatório.")
 
@@ -107,16 +120,17 @@ class ColetorDados:
 
         # OAB
         while True:
-            oab = input("Número da OAB (6 dígitos): ").strip()
+            oab = input("Número da OAB (1 a 6 dígitos): ").strip()
             if oab:
-                # Formatar: XXX.XXX
-                oab_formatado = self.formatador.formatar_oab(oab)
-                if len(re.sub(r'[^\d]', '', oab_formatado)) == 6:
+                # Mesma regra da validação em lote; formata XXX.XXX
+                erro = validar_numero_oab(oab)
+                if erro is None:
+                    oab_formatado = self.formatador.formatar_oab(oab)
                     self.dados['oab_numero'] = oab_formatado
                     print(f"   ✓ OAB formatada: {oab_formatado}")
                     break
                 else:
-                    print("❌ Número da OAB deve ter 6 dígitos.")
+                    print(f"❌ {erro}. Tente novamente.")
             else:
                 print("❌ Número da OAB é obrigatório.")
 
@@ -221,9 +235,43 @@ class ColetorDados:
         print("=" * 60)
 
 
-def main():
-    """Função principal"""
+def iniciar_aquecimento(documentos=None):
+    """
+    Importa o gerador e carrega os templates dos documentos (padrão: todos
+    os do catálogo) numa thread em segundo plano.
+
+    Falhas são ignoradas aqui: se algo der errado, a geração repete o
+    trabalho e reporta o erro normalmente.
+
+    Returns:
+        A thread iniciada
+    """
+    def aquecer():
+        try:
+            from gerador import GeradorContratos
+            GeradorContratos().aquecer(CATALOGO.pares(documentos))
+        except Exception:
+            log.debug("Falha ao aquecer os templates", exc_info=True)
+
+    thread = threading.Thread(target=aquecer, name="aquecimento", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(documentos=None):
+    """
+    Função principal
+
+    Args:
+        documentos: Ids do catálogo a gerar; padrão: todos
+    """
     try:
+        # Documento desconhecido é erro antes de qualquer pergunta
+        selecionados = CATALOGO.selecionar(documentos)
+
+        # Carrega o gerador enquanto o usuário preenche os dados
+        aquecimento = iniciar_aquecimento(documentos)
+
         # Coletor de dados
         coletor = ColetorDados()
         dados = coletor.coletar_todos_dados()
@@ -238,17 +286,7 @@ def main():
             return
 
         # Verificar templates
-        templates = [
-            "templates/PROCURACAO_MODEL.docx",
-            "templates/TERMO DE AUTORIZAÇÃO DE IMAGEM_MODEL.docx",
-            "templates/TERMO DE CONFIDENCIALIDADE_MODEL.docx",
-            "templates/TERMO DE PROTEÇÃO DE DADOS_MODEL.docx"
-        ]
-
-        faltantes = []
-        for template in templates:
-            if not os.path.exists(template):
-                faltantes.append(os.path.basename(template))
+        faltantes = [os.path.basename(entrada.caminho) for entrada in selecionados if not entrada.existe]
 
         if faltantes:
             print("\n⚠️  Templates não encontrados:")
@@ -262,8 +300,9 @@ def main():
         print("GERANDO CONTRATOS...")
         print("=" * 60)
 
+        aquecimento.join()
         from gerador import gerar_todos_contratos
-        resultados = gerar_todos_contratos(dados)
+        resultados = gerar_todos_contratos(dados, documentos)
 
         # Resultados
         print("\n" + "=" * 60)
@@ -279,7 +318,7 @@ def main():
                 print(f"❌ {nome:25} - FALHA")
 
         print("\n" + "=" * 60)
-        print(f"📊 {sucessos}/4 contratos gerados com sucesso")
+        print(f"📊 {sucessos}/{len(resultados)} contratos gerados com sucesso")
 
         if sucessos > 0:
             print(f"📁 Pasta de saída: {os.path.abspath('output')}")
@@ -289,9 +328,7 @@ def main():
     except KeyboardInterrupt:
         print("\n\n❌ Operação cancelada pelo usuário.")
     except Exception as e:
-        print(f"\n💥 ERRO: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"\n💥 ERRO: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -300,4 +337,4 @@ if __name__ == "__main__":
     os.makedirs("output", exist_ok=True)
 
     # Executar
-    main()
\ No newline at end of file
+    main(sys.argv[1:] or None)
\ No newline at end of file
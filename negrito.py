@@ -0,0 +1,109 @@
+# negrito.py
+"""
+Reconhecimento das palavras que devem ficar em negrito
+
+O vocabulário de PALAVRAS_NEGRITO (mais o nome da pessoa, ou os nomes de
+todos os signatários) é compilado uma única vez numa regex em forma de
+árvore de prefixos: as palavras com o mesmo começo compartilham o mesmo
+ramo, de modo que o custo de cada posição do texto não cresce com o
+número de palavras. Uma única varredura encontra o casamento mais à
+esquerda e, nessa posição, o mais longo.
+"""
+
+import re
+from functools import lru_cache
+
+from config import PALAVRAS_NEGRITO
+
+# Marca, na árvore de prefixos, o fim de uma palavra
+_FIM = ''
+
+
+def _regex_arvore(palavras):
+    """
+    Regex equivalente à alternativa das palavras (da maior para a menor),
+    montada a partir da árvore de prefixos: em cada nó, os ramos que
+    continuam são tentados antes de terminar a palavra ali (o casamento
+    mais longo vence).
+    """
+    arvore = {}
+    for palavra in palavras:
+        no = arvore
+        for caractere in palavra:
+            no = no.setdefault(caractere, {})
+        no[_FIM] = True
+
+    def padrao(no):
+        ramos = [re.escape(caractere) + padrao(filho) for caractere, filho in no.items() if caractere != _FIM]
+        if not ramos:
+            return ''
+        if len(ramos) == 1 and _FIM not in no:
+            return ramos[0]
+        alternativas = f"(?:{'|'.join(ramos)})"
+        return alternativas + '?' if _FIM in no else alternativas
+
+    return padrao(arvore)
+
+
+class MatcherNegrito:
+    """
+    Vocabulário de negrito compilado.
+
+    Args:
+        palavras: Palavras/frases que devem ficar em negrito. Em caso de
+            mesmo tamanho, vale a ordem recebida.
+    """
+
+    def __init__(self, palavras):
+        unicas = list(dict.fromkeys(p for p in palavras if p))
+        unicas.sort(key=len, reverse=True)
+
+        self.palavras = tuple(unicas)
+        self._regex = re.compile(_regex_arvore(unicas)) if unicas else None
+
+    def contem(self, texto):
+        """Indica se o texto tem alguma palavra do vocabulário"""
+        return self._regex is not None and self._regex.search(texto) is not None
+
+    def segmentar(self, texto):
+        """
+        Divide o texto em trechos normais e em negrito.
+
+        Returns:
+            Lista de tuplas [(texto1, negrito1), (texto2, negrito2), ...]
+        """
+        if self._regex is None or not texto.strip():
+            return [(texto, False)]
+
+        runs = []
+        posicao = 0
+        for casamento in self._regex.finditer(texto):
+            inicio, fim = casamento.span()
+            if inicio > posicao:
+                runs.append((texto[posicao:inicio], False))
+            runs.append((casamento.group(), True))
+            posicao = fim
+
+        if not runs:
+            return [(texto, False)]
+
+        if posicao < len(texto):
+            runs.append((texto[posicao:], False))
+
+        return runs
+
+
+# Vocabulário fixo, sem nomes de pessoas
+MATCHER_PADRAO = MatcherNegrito(PALAVRAS_NEGRITO)
+
+
+@lru_cache(maxsize=1024)
+def obter_matcher(*nomes):
+    """
+    Matcher com PALAVRAS_NEGRITO mais os nomes informados, compilado uma vez
+    por combinação de nomes.
+    """
+    nomes = tuple(nome for nome in nomes if nome)
+    if not nomes:
+        return MATCHER_PADRAO
+    return MatcherNegrito(nomes + tuple(PALAVRAS_NEGRITO))
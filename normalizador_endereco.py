@@ -0,0 +1,122 @@
+# normalizador_endereco.py
+"""
+Normalização de endereços
+
+As abreviações de config (ABREVIACOES e ABREVIACOES_COMPOSTAS) são
+compiladas uma única vez numa trie de palavras, de modo que tipos de
+logradouro com mais de uma palavra ("estrada municipal") são reconhecidos
+na mesma varredura que os de uma palavra só, sempre pelo casamento mais
+longo. Pontuação grudada nas palavras ("av.", "rua,") é separada antes da
+busca e devolvida depois.
+
+Os mesmos endereços se repetem muito nos rosters, então o resultado fica
+num cache LRU (normalizar_endereco).
+"""
+
+import re
+from functools import lru_cache
+
+from config import ABREVIACOES, ABREVIACOES_COMPOSTAS, CACHE_ENDERECOS_TAMANHO
+
+# Pontuação inicial, núcleo da palavra e pontuação final de cada pedaço
+_PEDACO = re.compile(r'([(\[{"\']*)(.*?)([.,;:)\]}"\']*)', re.DOTALL)
+
+_NUMERO_ANTES_DA_VIRGULA = re.compile(r'(\d+)\s*,')
+
+# Chave da trie que guarda a abreviação de uma sequência completa
+_FIM = None
+
+
+def _partir(pedaco):
+    """Separa (pontuação inicial, núcleo, pontuação final) de um pedaço"""
+    if pedaco[0].isalnum() and pedaco[-1].isalnum():
+        # Caso mais comum, sem pontuação nas pontas: dispensa a regex
+        return '', pedaco, ''
+    return _PEDACO.fullmatch(pedaco).groups()
+
+
+class NormalizadorEndereco:
+    """
+    Abreviações compiladas numa trie.
+
+    Args:
+        abreviacoes: Dicionário {'tipo de logradouro': 'abreviação'}, com
+            chaves em minúsculas de uma ou mais palavras
+    """
+
+    def __init__(self, abreviacoes):
+        self._trie = {}
+
+        for extenso, abreviacao in abreviacoes.items():
+            no = self._trie
+            for palavra in extenso.split():
+                no = no.setdefault(palavra, {})
+            no[_FIM] = abreviacao
+
+    def _casar(self, pedacos, inicio):
+        """
+        Procura na trie a sequência mais longa de pedaços a partir de
+        `inicio`. Só a primeira palavra pode ter pontuação antes e só a
+        última pode ter pontuação depois.
+
+        Returns:
+            Tupla (abreviação, pedaços consumidos) ou (None, 0)
+        """
+        no = self._trie
+        melhor = (None, 0)
+
+        for posicao in range(inicio, len(pedacos)):
+            antes, nucleo, depois = _partir(pedacos[posicao])
+            if antes and posicao > inicio:
+                break
+
+            no = no.get(nucleo)
+            if no is None:
+                break
+            if _FIM in no:
+                melhor = (no[_FIM], posicao - inicio + 1)
+            if depois:
+                break
+
+        return melhor
+
+    def normalizar(self, endereco):
+        """
+        Aplica as abreviações e deixa as demais palavras com a primeira letra
+        maiúscula. Números seguidos de vírgula ficam grudados nela.
+        """
+        pedacos = endereco.lower().split()
+        palavras = []
+        posicao = 0
+
+        while posicao < len(pedacos):
+            # Só desce na trie se a palavra pode começar uma abreviação
+            if _partir(pedacos[posicao])[1] in self._trie:
+                abreviacao, consumidos = self._casar(pedacos, posicao)
+            else:
+                abreviacao = None
+
+            if abreviacao is None:
+                palavras.append(pedacos[posicao].capitalize())
+                posicao += 1
+                continue
+
+            antes = _partir(pedacos[posicao])[0]
+            depois = _partir(pedacos[posicao + consumidos - 1])[2]
+            if abreviacao.endswith('.') and depois.startswith('.'):
+                # "av." -> "Av." e não "Av.."
+                depois = depois[1:]
+
+            palavras.append(antes + abreviacao + depois)
+            posicao += consumidos
+
+        return _NUMERO_ANTES_DA_VIRGULA.sub(r'\1,', ' '.join(palavras))
+
+
+NORMALIZADOR_PADRAO = NormalizadorEndereco({**ABREVIACOES, **ABREVIACOES_COMPOSTAS})
+
+
+@lru_cache(maxsize=CACHE_ENDERECOS_TAMANHO)
+def normalizar_endereco(endereco):
+    """Endereço normalizado com NORMALIZADOR_PADRAO, com cache"""
+    return NORMALIZADOR_PADRAO.normalizar(endereco)
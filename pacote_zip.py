@@ -0,0 +1,183 @@
+# pacote_zip.py
+"""
+Saída em pacote ZIP
+
+Em vez de gravar cada contrato como um arquivo solto em output/, os
+documentos são gravados direto dentro de um ZIP (um para o lote inteiro ou
+um por pessoa), sem arquivos temporários. Cada documento sai do mesmo
+caminho de gerar_contrato (backend configurado e cache de resultados) e é
+gravado na sua entrada do ZIP, de modo que no máximo um documento está em
+memória.
+
+Ao fechar, o pacote recebe um manifest.csv com pessoa, template, SHA-256 e
+tamanho de cada documento.
+"""
+
+import csv
+import hashlib
+import io
+import os
+import time
+import zipfile
+from datetime import datetime
+
+from catalogo import CATALOGO
+from escritor import parte_segura
+from gerador import GeradorContratos, nome_documento, obter_cache_resultados
+from logs import obter_logger
+
+NOME_MANIFESTO = "manifest.csv"
+CAMPOS_MANIFESTO = ['pessoa', 'cpf', 'template', 'arquivo', 'sha256', 'bytes']
+
+log = obter_logger('pacote_zip')
+
+
+class PacoteZip:
+    """
+    ZIP de saída com os documentos e o manifesto.
+
+    Os .docx já são compactados, então por padrão as entradas são
+    armazenadas sem nova compressão (ZIP_STORED).
+    """
+
+    def __init__(self, caminho, compressao=zipfile.ZIP_STORED):
+        self.caminho = caminho
+        self.manifesto = []
+        self._nomes = set()
+
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        self._zip = zipfile.ZipFile(caminho, 'w', compression=compressao, allowZip64=True)
+
+    @staticmethod
+    def _nome_seguro(nome_arquivo):
+        """Nome da entrada sem '..', pastas absolutas nem barras invertidas (ver escritor.parte_segura)"""
+        partes = nome_arquivo.replace('\\', '/').split('/')
+        return '/'.join(parte_segura(parte) for parte in partes if parte)
+
+    def _nome_unico(self, nome_arquivo):
+        """Evita nomes repetidos dentro do ZIP (mesma pessoa duas vezes no lote)"""
+        nome_arquivo = self._nome_seguro(nome_arquivo)
+        base, extensao = os.path.splitext(nome_arquivo)
+        nome, contador = nome_arquivo, 1
+
+        while nome in self._nomes:
+            contador += 1
+            nome = f"{base}_{contador}{extensao}"
+
+        self._nomes.add(nome)
+        return nome
+
+    def adicionar(self, conteudo, nome_arquivo, dados_pessoa, template_path):
+        """
+        Grava os bytes do documento no ZIP e registra a entrada no manifesto.
+
+        Returns:
+            Nome da entrada dentro do ZIP
+        """
+        nome_arquivo = self._nome_unico(nome_arquivo)
+
+        # Com ZipFile.open(nome, 'w') a entrada sairia datada de 1980-01-01
+        info = zipfile.ZipInfo(nome_arquivo, date_time=time.localtime()[:6])
+        info.compress_type = self._zip.compression
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, conteudo)
+
+        self.manifesto.append({
+            'pessoa': dados_pessoa.get('nome_completo', ''),
+            'cpf': dados_pessoa.get('cpf', ''),
+            'template': os.path.basename(template_path),
+            'arquivo': nome_arquivo,
+            'sha256': hashlib.sha256(conteudo).hexdigest(),
+            'bytes': len(conteudo),
+        })
+
+        return nome_arquivo
+
+    def fechar(self):
+        """Grava o manifesto e fecha o ZIP"""
+        texto = io.StringIO()
+        escritor = csv.DictWriter(texto, fieldnames=CAMPOS_MANIFESTO)
+        escritor.writeheader()
+        escritor.writerows(self.manifesto)
+
+        self._zip.writestr(NOME_MANIFESTO, texto.getvalue().encode('utf-8'))
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def adicionar_contratos(pacote, dados_pessoa, gerador=None, templates=None, pasta=''):
+    """
+    Gera os contratos de uma pessoa direto dentro do pacote.
+
+    Returns:
+        Lista [(nome_contrato, entrada no ZIP ou None), ...], no mesmo
+        formato de gerar_todos_contratos
+    """
+    gerador = gerador or GeradorContratos(cache_resultados=obter_cache_resultados())
+    templates = templates or CATALOGO.pares()
+    nome_pessoa = parte_segura(dados_pessoa.get('nome_completo', ''))
+
+    resultados = []
+
+    for template_path, nome_contrato in templates:
+        try:
+            conteudo = gerador.renderizar_com_cache(template_path, dados_pessoa)
+            nome_arquivo = f"{nome_documento(template_path)}_{nome_pessoa}.docx"
+            if pasta:
+                nome_arquivo = f"{pasta}/{nome_arquivo}"
+            resultados.append((nome_contrato, pacote.adicionar(conteudo, nome_arquivo, dados_pessoa, template_path)))
+        except Exception as e:
+            log.warning(f"  ✗ Falha no {nome_contrato}: {str(e)}")
+            resultados.append((nome_contrato, None))
+
+    return resultados
+
+
+def gerar_pacote(pessoas, caminho_zip, templates=None):
+    """
+    Gera os contratos de várias pessoas num único ZIP, com uma pasta por pessoa.
+
+    Args:
+        pessoas: Iterável de tuplas (chave, dados_pessoa)
+        caminho_zip: Arquivo .zip de saída
+
+    Yields:
+        Tuplas (chave, resultados) no formato de gerar_todos_contratos
+    """
+    gerador = GeradorContratos(cache_resultados=obter_cache_resultados())
+
+    with PacoteZip(caminho_zip) as pacote:
+        for chave, dados_pessoa in pessoas:
+            pasta = parte_segura(dados_pessoa.get('nome_completo', ''))
+            yield chave, adicionar_contratos(pacote, dados_pessoa, gerador, templates, pasta)
+
+
+def gerar_pacotes_por_pessoa(pessoas, pasta_saida="output", templates=None):
+    """
+    Gera um ZIP por pessoa em pasta_saida.
+
+    Args:
+        pessoas: Iterável de tuplas (chave, dados_pessoa)
+
+    Yields:
+        Tuplas (chave, caminho do ZIP, resultados)
+    """
+    gerador = GeradorContratos(cache_resultados=obter_cache_resultados())
+
+    for chave, dados_pessoa in pessoas:
+        nome_pessoa = parte_segura(dados_pessoa.get('nome_completo', ''))
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        caminho_zip = os.path.join(pasta_saida, f"{nome_pessoa}_{timestamp}.zip")
+
+        with PacoteZip(caminho_zip) as pacote:
+            resultados = adicionar_contratos(pacote, dados_pessoa, gerador, templates)
+
+        yield chave, caminho_zip, resultados
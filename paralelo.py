@@ -0,0 +1,167 @@
+# paralelo.py
+"""
+Geração de contratos em paralelo com um pool de processos
+
+Cada par (pessoa, template) vira um job independente. Os jobs são
+distribuídos num ProcessPoolExecutor; cada processo tem o seu próprio
+GeradorContratos e o seu próprio cache de templates, carregado no primeiro
+job. Os resultados voltam na mesma ordem em que os jobs foram enviados, e
+uma falha num job não afeta os demais.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from catalogo import CATALOGO
+from gerador import GeradorContratos, obter_cache_resultados
+from logs import configuracao_logs, obter_logger, preparar_processo
+
+log = obter_logger('paralelo')
+
+# Gerador de cada processo do pool (criado pelo inicializador)
+_gerador = None
+
+
+def _inicializar_processo(configuracao=None):
+    """Cria o gerador local do processo (e repete a configuração de logs do pai)"""
+    global _gerador
+    if configuracao is not None:
+        preparar_processo(configuracao)
+    _gerador = GeradorContratos(cache_resultados=obter_cache_resultados())
+
+
+def _executar_job(template_path, dados_pessoa):
+    """
+    Gera um contrato dentro do processo do pool.
+
+    Returns:
+        Tupla (caminho, erro): caminho do arquivo gerado ou None e a
+        mensagem de erro ou None
+    """
+    try:
+        return _gerador.gerar_contrato(template_path, dados_pessoa), None
+    except Exception as e:
+        return None, str(e)
+
+
+def gerar_contratos_processo(dados_pessoa, templates=None):
+    """
+    Gera todos os contratos de uma pessoa dentro de um processo do pool
+    (usado pela fila assíncrona, ver fila_jobs.py).
+
+    Returns:
+        Lista [(nome_contrato, caminho ou None), ...]
+    """
+    if _gerador is None:
+        _inicializar_processo()
+
+    resultados = []
+    for template_path, nome_contrato in templates or CATALOGO.pares():
+        caminho, _ = _executar_job(template_path, dados_pessoa)
+        resultados.append((nome_contrato, caminho))
+
+    return resultados
+
+
+def executar_jobs(jobs, processos=None, janela=None):
+    """
+    Executa os jobs no pool, devolvendo os resultados na ordem de envio.
+
+    Só `janela` jobs ficam pendentes ao mesmo tempo, de modo que a memória
+    não cresce com o número de jobs.
+
+    Args:
+        jobs: Iterável de tuplas (chave, template_path, nome_contrato, dados_pessoa)
+        processos: Número de processos (padrão: número de CPUs)
+        janela: Máximo de jobs pendentes (padrão: 4 por processo)
+
+    Yields:
+        Tuplas (chave, nome_contrato, caminho, erro)
+    """
+    processos = processos or os.cpu_count() or 1
+    janela = janela or processos * 4
+
+    pendentes = deque()
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_processo,
+                             initargs=(configuracao_logs(),)) as executor:
+        for chave, template_path, nome_contrato, dados_pessoa in jobs:
+            futuro = executor.submit(_executar_job, template_path, dados_pessoa)
+            pendentes.append((chave, nome_contrato, futuro))
+
+            if len(pendentes) >= janela:
+                yield _coletar(pendentes.popleft())
+
+        while pendentes:
+            yield _coletar(pendentes.popleft())
+
+
+def _coletar(pendente):
+    """Espera um job e monta a tupla de resultado"""
+    chave, nome_contrato, futuro = pendente
+
+    try:
+        caminho, erro = futuro.result()
+    except Exception as e:
+        # Processo do pool morreu ou o job não pôde ser enviado
+        caminho, erro = None, str(e)
+
+    return chave, nome_contrato, caminho, erro
+
+
+def gerar_lote_paralelo(pessoas, templates=None, processos=None, filtro=None):
+    """
+    Gera os contratos de várias pessoas em paralelo.
+
+    Args:
+        pessoas: Iterável de tuplas (chave, dados_pessoa); a chave identifica
+            a pessoa no resultado (ex.: número da linha da planilha)
+        templates: Lista de (template_path, nome_contrato); padrão: todo o catálogo
+        processos: Número de processos do pool
+        filtro: Função (chave, dados_pessoa) que devolve os templates a
+            gerar para a pessoa, em vez de todos (ex.: só os que faltam ao
+            retomar um lote, ver diario.py)
+
+    Yields:
+        Tuplas (chave, resultados), na ordem das pessoas, com resultados no
+        mesmo formato de gerar_todos_contratos: [(nome_contrato, caminho), ...]
+    """
+    templates = templates or CATALOGO.pares()
+
+    # (chave, número de jobs, resultados) de cada pessoa, na ordem de envio
+    esperados = deque()
+
+    def jobs():
+        for chave, dados_pessoa in pessoas:
+            da_pessoa = templates if filtro is None else filtro(chave, dados_pessoa)
+            esperados.append((chave, len(da_pessoa), []))
+            for template_path, nome_contrato in da_pessoa:
+                yield chave, template_path, nome_contrato, dados_pessoa
+
+    def proxima():
+        chave, _, resultados = esperados.popleft()
+        return chave, resultados
+
+    for chave, nome_contrato, caminho, erro in executar_jobs(jobs(), processos):
+        if erro:
+            log.warning(f"  ✗ Falha no {nome_contrato}: {erro}")
+
+        # Pessoas sem nenhum job saem na sua vez
+        while esperados[0][1] == 0:
+            yield proxima()
+
+        _, total, resultados = esperados[0]
+        resultados.append((nome_contrato, caminho))
+        if len(resultados) == total:
+            yield proxima()
+
+    while esperados:
+        yield proxima()
+
+
+def gerar_todos_contratos_paralelo(dados_pessoa, processos=None):
+    """Versão paralela de gerar_todos_contratos para uma pessoa"""
+    for _, resultados in gerar_lote_paralelo([(None, dados_pessoa)], processos=processos):
+        return resultados
+    return []
@@ -0,0 +1,184 @@
+# reedicao.py
+"""
+Correção de campos em contratos já gerados, sem gerar tudo de novo
+
+Ao salvar um contrato, o GeradorContratos grava ao lado dele um mapa de
+slots (<arquivo>.docx.slots.json) com os dados usados, o valor de cada
+placeholder e a posição em bytes dos runs de cada slot no document.xml.
+
+Para corrigir um campo (ex.: estado_civil), GeradorContratos.
+atualizar_contrato compara os placeholders novos com os do mapa, reescreve
+só os slots que usam algum placeholder alterado e emenda esses runs no
+document.xml do arquivo existente; os demais slots não são tocados. Se o
+nome mudar, todos os slots são reescritos (o nome entra no negrito de
+qualquer parágrafo). Se o template mudou ou o arquivo foi editado depois de
+gerado, o contrato é gerado de novo por inteiro.
+
+Uso:
+    python reedicao.py output/*/MARIA_*/PROCURACAO_*.docx --campo estado_civil=casada
+    python reedicao.py output/2025-12-23/*/*.docx --campo endereco_completo="Rua X, 10"
+"""
+
+import argparse
+import json
+import os
+import sys
+import zipfile
+import zlib
+
+from escritor import gravar_atomico as gravar_arquivo
+from logs import obter_logger
+
+SUFIXO_MAPA = ".slots.json"
+VERSAO_MAPA = 1
+
+log = obter_logger('reedicao')
+
+
+class MapaDesatualizado(ValueError):
+    """Mapa de slots que não corresponde mais ao template ou ao arquivo"""
+
+
+def caminho_mapa(output_path):
+    return output_path + SUFIXO_MAPA
+
+
+def hash_documento(documento_xml):
+    """CRC-32 do document.xml (o mesmo que o ZIP guarda para o membro)"""
+    return zlib.crc32(documento_xml)
+
+
+def ler_documento_xml(output_path):
+    """Bytes do word/document.xml de um .docx"""
+    from renderizador_xml import PARTE_DOCUMENTO
+
+    with zipfile.ZipFile(output_path) as documento:
+        return documento.read(PARTE_DOCUMENTO)
+
+
+def montar_mapa(template, dados_pessoa, placeholders, hash_xml, posicoes):
+    """
+    Mapa de slots de um contrato.
+
+    Args:
+        template: TemplateCarregado usado na geração
+        dados_pessoa: Dados usados na geração
+        placeholders: Placeholders usados na geração
+        hash_xml: hash_documento do document.xml gerado
+        posicoes: {indice do slot: (inicio, fim)} dos runs no document.xml
+    """
+    return {
+        'versao': VERSAO_MAPA,
+        'template': template.caminho,
+        'hash_template': template.hash,
+        'hash_documento': hash_xml,
+        'dados': dados_pessoa,
+        'placeholders': placeholders,
+        'slots': posicoes,
+    }
+
+
+def gravar_mapa(output_path, mapa):
+    """Grava o mapa de slots ao lado do contrato"""
+    mapa = {**mapa, 'slots': {str(indice): list(posicao) for indice, posicao in mapa['slots'].items()}}
+    conteudo = json.dumps(mapa, ensure_ascii=False, default=str).encode('utf-8')
+    gravar_arquivo(caminho_mapa(output_path), conteudo)
+
+
+def ler_mapa(output_path):
+    """Mapa de slots do contrato (FileNotFoundError se não houver)"""
+    caminho = caminho_mapa(output_path)
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"Contrato sem mapa de slots: {output_path}")
+
+    with open(caminho, encoding='utf-8') as arquivo:
+        mapa = json.load(arquivo)
+
+    if mapa.get('versao') != VERSAO_MAPA:
+        raise MapaDesatualizado(f"Versão de mapa de slots não suportada: {caminho}")
+
+    mapa['slots'] = {int(indice): tuple(posicao) for indice, posicao in mapa['slots'].items()}
+    return mapa
+
+
+def emendar(documento_xml, posicoes, novos_runs):
+    """
+    Troca os runs de alguns slots no document.xml.
+
+    Args:
+        documento_xml: Bytes do document.xml
+        posicoes: {indice do slot: (inicio, fim)} de todos os slots
+        novos_runs: {indice do slot: bytes dos runs novos}
+
+    Returns:
+        Tupla (document.xml novo, posições novas de todos os slots)
+    """
+    partes = []
+    novas_posicoes = {}
+    cursor = 0
+    deslocamento = 0
+
+    for indice, (inicio, fim) in sorted(posicoes.items(), key=lambda item: item[1][0]):
+        if indice not in novos_runs:
+            novas_posicoes[indice] = (inicio + deslocamento, fim + deslocamento)
+            continue
+
+        runs = novos_runs[indice]
+        partes.append(documento_xml[cursor:inicio])
+        novas_posicoes[indice] = (inicio + deslocamento, inicio + deslocamento + len(runs))
+        partes.append(runs)
+        deslocamento += len(runs) - (fim - inicio)
+        cursor = fim
+
+    partes.append(documento_xml[cursor:])
+    return b''.join(partes), novas_posicoes
+
+
+def corrigir_contratos(caminhos, correcoes, gerador=None):
+    """
+    Aplica as mesmas correções a vários contratos já gerados.
+
+    Returns:
+        Lista [(caminho, slots reescritos ou None se falhou), ...]
+    """
+    if gerador is None:
+        from gerador import GeradorContratos
+        gerador = GeradorContratos()
+
+    resultados = []
+    for caminho in caminhos:
+        try:
+            reescritos = gerador.atualizar_contrato(caminho, correcoes)
+            log.info(f"🩹 {os.path.basename(caminho)}: {reescritos} slot(s) reescrito(s)",
+                     extra={'evento': 'correcao', 'documento': os.path.basename(caminho), 'resultado': 'ok'})
+            resultados.append((caminho, reescritos))
+        except Exception as e:
+            log.warning(f"  ✗ Falha em {os.path.basename(caminho)}: {str(e)}",
+                        extra={'evento': 'correcao', 'documento': os.path.basename(caminho), 'resultado': 'falha'})
+            resultados.append((caminho, None))
+
+    return resultados
+
+
+def _campo(texto):
+    campo, separador, valor = texto.partition('=')
+    if not separador or not campo.strip():
+        raise argparse.ArgumentTypeError(f"Use campo=valor: {texto}")
+    return campo.strip(), valor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corrige campos em contratos já gerados")
+    parser.add_argument("contratos", nargs='+', help="Arquivos .docx gerados (com o mapa .slots.json)")
+    parser.add_argument("--campo", type=_campo, action='append', required=True, metavar="CAMPO=VALOR",
+                        help="Campo de dados_pessoa a corrigir (pode repetir)")
+    args = parser.parse_args(argv)
+
+    resultados = corrigir_contratos(args.contratos, dict(args.campo))
+    falhas = sum(1 for _, reescritos in resultados if reescritos is None)
+    print(f"\n📊 {len(resultados) - falhas}/{len(resultados)} contratos corrigidos")
+    return 0 if falhas == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# renderizador_xml.py
+"""
+Renderização direta do OOXML, sem o python-docx no caminho quente
+
+O template (já compilado pelo cache_templates) é convertido uma única vez
+num plano de emenda: o word/document.xml é serializado com um marcador no
+lugar do conteúdo de cada slot dinâmico e cortado nesses marcadores. Os
+demais membros do ZIP são gravados uma única vez num ZIP base, sem o
+document.xml.
+
+Para cada contrato, basta montar o XML dos runs de cada slot (o mesmo que o
+python-docx produziria com add_run), emendar com os trechos fixos e
+acrescentar o document.xml a uma cópia do ZIP base: os outros membros são
+copiados byte a byte, sem descompactar nem recompactar.
+"""
+
+import io
+import re
+import threading
+import weakref
+import zipfile
+
+from lxml import etree
+
+from cache_templates import listar_paragrafos
+
+PARTE_DOCUMENTO = 'word/document.xml'
+
+# Marcador do slot no XML serializado: <?slot N?>
+_MARCADOR = re.compile(rb'<\?slot ([0-9]+)\?>')
+
+# Propriedades dos runs, iguais às de GeradorContratos.escrever_paragrafo
+# (Arial Narrow, 11 pt, negrito ligado ou desligado)
+_RPR = {
+    True: '<w:rPr><w:rFonts w:ascii="Arial Narrow" w:hAnsi="Arial Narrow"/><w:b/><w:sz w:val="22"/></w:rPr>',
+    False: '<w:rPr><w:rFonts w:ascii="Arial Narrow" w:hAnsi="Arial Narrow"/><w:b w:val="0"/><w:sz w:val="22"/></w:rPr>',
+}
+
+# Tab e quebras de linha viram elementos próprios dentro do run
+_SEPARADORES = re.compile('([\t\r\n])')
+
+# Caracteres de controle que não podem aparecer em XML
+_CONTROLE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _escapar(texto):
+    return texto.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def xml_run(texto, negrito):
+    """
+    XML de um run com o texto, como o python-docx monta em add_run:
+    w:t para o texto (com xml:space="preserve" se houver espaço nas
+    pontas), w:tab para tabulação e w:br para cada quebra de linha.
+    """
+    if _CONTROLE.search(texto):
+        raise ValueError("Texto com caracteres de controle que não são permitidos em XML")
+
+    partes = ['<w:r>', _RPR[negrito]]
+
+    for pedaco in _SEPARADORES.split(texto):
+        if pedaco == '\t':
+            partes.append('<w:tab/>')
+        elif pedaco in ('\r', '\n'):
+            partes.append('<w:br/>')
+        elif pedaco:
+            if len(pedaco.strip()) < len(pedaco):
+                partes.append(f'<w:t xml:space="preserve">{_escapar(pedaco)}</w:t>')
+            else:
+                partes.append(f'<w:t>{_escapar(pedaco)}</w:t>')
+
+    partes.append('</w:r>')
+    return ''.join(partes)
+
+
+class PlanoXml:
+    """
+    Plano de emenda de um template.
+
+    Attributes:
+        trechos: Pedaços fixos do document.xml (um a mais que os slots)
+        ordem: Slots na ordem em que aparecem no XML (que não é a de
+            listar_paragrafos quando há tabelas)
+        base: Bytes do ZIP com todos os membros, menos o document.xml
+    """
+
+    def __init__(self, template):
+        doc = template.clonar()
+        paragrafos = listar_paragrafos(doc)
+
+        for numero, slot in enumerate(template.slots):
+            paragrafo = paragrafos[slot.indice]._p
+            paragrafo.clear_content()
+            paragrafo.append(etree.ProcessingInstruction('slot', str(numero)))
+
+        partes = _MARCADOR.split(doc.part.blob)
+        self.trechos = partes[0::2]
+        self.ordem = [template.slots[int(numero)] for numero in partes[1::2]]
+
+        if sorted(slot.indice for slot in self.ordem) != template.com_placeholders:
+            raise ValueError(f"Não foi possível montar o plano de {template.caminho}")
+
+        self.base, self._info_documento = self._montar_base(template.caminho)
+
+    @staticmethod
+    def _montar_base(caminho):
+        """ZIP com os membros do template, menos o document.xml"""
+        buffer = io.BytesIO()
+        info_documento = None
+
+        with zipfile.ZipFile(caminho) as origem, zipfile.ZipFile(buffer, 'w') as base:
+            for info in origem.infolist():
+                if info.filename == PARTE_DOCUMENTO:
+                    info_documento = zipfile.ZipInfo(info.filename, info.date_time)
+                    info_documento.compress_type = zipfile.ZIP_DEFLATED
+                    continue
+
+                copia = zipfile.ZipInfo(info.filename, info.date_time)
+                copia.compress_type = info.compress_type
+                copia.external_attr = info.external_attr
+                base.writestr(copia, origem.read(info))
+
+        if info_documento is None:
+            raise ValueError(f"{caminho} não tem {PARTE_DOCUMENTO}")
+
+        return buffer.getvalue(), info_documento
+
+    def renderizar(self, runs_do_slot):
+        """
+        Monta o .docx.
+
+        Args:
+            runs_do_slot: Função que recebe o SlotDinamico e devolve a lista
+                de tuplas (texto, negrito) do parágrafo
+
+        Returns:
+            Bytes do .docx
+        """
+        documento_xml, _ = self.montar_documento(runs_do_slot)
+        return self.empacotar(documento_xml)
+
+    def montar_documento(self, runs_do_slot):
+        """
+        Monta o document.xml (ver renderizar).
+
+        Returns:
+            Tupla (bytes do document.xml, {indice do slot: (inicio, fim)}),
+            com a posição em bytes dos runs de cada slot no XML
+        """
+        partes = [self.trechos[0]]
+        posicoes = {}
+        posicao = len(self.trechos[0])
+
+        for slot, trecho in zip(self.ordem, self.trechos[1:]):
+            runs = ''.join(xml_run(texto, negrito) for texto, negrito in runs_do_slot(slot)).encode('utf-8')
+            posicoes[slot.indice] = (posicao, posicao + len(runs))
+            partes.append(runs)
+            partes.append(trecho)
+            posicao += len(runs) + len(trecho)
+
+        return b''.join(partes), posicoes
+
+    def empacotar(self, documento_xml):
+        """Bytes do .docx: o ZIP base com o document.xml acrescentado"""
+        buffer = io.BytesIO(self.base)
+        with zipfile.ZipFile(buffer, 'a') as documento:
+            documento.writestr(self._info_documento, documento_xml)
+
+        return buffer.getvalue()
+
+
+# Planos por template; somem junto com o template quando o cache o recarrega
+_planos = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def obter_plano(template):
+    """
+    Plano de emenda do TemplateCarregado (montado no primeiro uso).
+    O template já deve ter passado por preparar_negrito.
+    """
+    plano = _planos.get(template)
+    if plano is None:
+        with _lock:
+            plano = _planos.get(template)
+            if plano is None:
+                plano = _planos[template] = PlanoXml(template)
+    return plano
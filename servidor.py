@@ -0,0 +1,158 @@
+# servidor.py
+"""
+Serviço HTTP local de geração de contratos (somente biblioteca padrão)
+
+Os templates são carregados e compilados na inicialização; cada requisição
+só gera o documento em memória e devolve os bytes do .docx.
+
+Rotas:
+    GET  /templates              -> lista de templates disponíveis (JSON)
+    GET  /metricas               -> tempos por etapa e contadores (Prometheus)
+    POST /contratos/<template>   -> corpo JSON com dados_pessoa; devolve o .docx
+                                    (?formatar=1 valida e aplica o FormatadorDados
+                                    antes; dados inválidos -> 400 com a lista de erros)
+
+Uso:
+    python servidor.py --porta 8000
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from catalogo import CATALOGO
+from gerador import GeradorContratos, gerar_bytes
+from instrumentacao import Instrumentacao
+from validacao import validar_registro
+
+TIPO_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Templates indexados pelo identificador usado na URL (ex.: PROCURACAO)
+TEMPLATES_POR_ID = {entrada.codigo: (entrada.caminho, entrada.nome) for entrada in CATALOGO}
+
+
+class ManipuladorContratos(BaseHTTPRequestHandler):
+    """Trata as requisições; o gerador é compartilhado pelo servidor"""
+
+    gerador = None
+
+    def _responder_json(self, status, corpo):
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self):
+        rota = urlparse(self.path).path.rstrip('/')
+
+        if rota == '/metricas':
+            dados = self.gerador.instrumentacao.exportar_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+            return
+
+        if rota != '/templates':
+            self._responder_json(404, {"erro": "Rota não encontrada"})
+            return
+
+        self._responder_json(200, [
+            {"id": template_id, "nome": nome}
+            for template_id, (_, nome) in TEMPLATES_POR_ID.items()
+        ])
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        partes = url.path.strip('/').split('/')
+
+        if len(partes) != 2 or partes[0] != 'contratos':
+            self._responder_json(404, {"erro": "Rota não encontrada"})
+            return
+
+        if partes[1] not in TEMPLATES_POR_ID:
+            self._responder_json(404, {"erro": f"Template desconhecido: {partes[1]}"})
+            return
+
+        try:
+            tamanho = int(self.headers.get("Content-Length", 0))
+            dados_pessoa = json.loads(self.rfile.read(tamanho) or b'{}')
+            if not isinstance(dados_pessoa, dict):
+                raise ValueError("O corpo deve ser um objeto JSON")
+        except ValueError as e:
+            self._responder_json(400, {"erro": f"JSON inválido: {str(e)}"})
+            return
+
+        try:
+            if parse_qs(url.query).get('formatar') == ['1']:
+                erros = validar_registro(dados_pessoa)
+                if erros:
+                    self._responder_json(400, {
+                        "erro": "Dados inválidos",
+                        "erros": [{"campo": erro.campo, "valor": erro.valor, "mensagem": erro.mensagem}
+                                  for erro in erros],
+                    })
+                    return
+
+                from lote import formatar_registro
+                dados_pessoa = formatar_registro(dados_pessoa)
+
+            template_path, _ = TEMPLATES_POR_ID[partes[1]]
+            with self.gerador.instrumentacao.etapa('documento'):
+                documento = gerar_bytes(dados_pessoa, template_path, self.gerador)
+            self.gerador.instrumentacao.contar('documentos')
+        except ValueError as e:
+            self._responder_json(400, {"erro": str(e)})
+            return
+        except Exception as e:
+            self.gerador.instrumentacao.contar('erros')
+            self._responder_json(500, {"erro": str(e)})
+            return
+
+        nome_pessoa = dados_pessoa.get('nome_completo', '').replace(" ", "_")
+        nome_arquivo = f"{partes[1]}_{nome_pessoa}.docx"
+
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_DOCX)
+        self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(nome_arquivo)}")
+        self.send_header("Content-Length", str(len(documento)))
+        self.end_headers()
+        self.wfile.write(documento)
+
+    def log_message(self, formato, *args):
+        # Sem log por requisição no stdout
+        pass
+
+
+def criar_servidor(host="127.0.0.1", porta=8000):
+    """Cria o servidor com o cache de templates já aquecido e instrumentado"""
+    gerador = GeradorContratos(instrumentacao=Instrumentacao())
+    gerador.aquecer()
+
+    manipulador = type("Manipulador", (ManipuladorContratos,), {"gerador": gerador})
+    return ThreadingHTTPServer((host, porta), manipulador)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de geração de contratos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    servidor = criar_servidor(args.host, args.porta)
+    print(f"🌐 Servindo em http://{args.host}:{args.porta}")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n❌ Servidor encerrado.")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
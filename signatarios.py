@@ -0,0 +1,252 @@
+# signatarios.py
+"""
+Documentos com vários signatários
+
+Um mesmo termo assinado por N outorgantes sai num único documento: os
+parágrafos do template que usam algum placeholder de signatário
+(PLACEHOLDERS_SIGNATARIO: nome, CPF, endereço...) formam blocos repetidos,
+clonados uma vez por signatário, na ordem recebida. Os demais slots (ex.:
+{{DATA_ASSINATURA}}) são preenchidos uma única vez, com os dados do
+primeiro signatário.
+
+Um bloco é:
+  - o parágrafo do slot ou, dentro de tabela, a linha (w:tr) inteira;
+  - mais as linhas de assinatura ("_____") logo antes dele;
+  - e os blocos vizinhos são unidos, para que cada signatário tenha o seu
+    conjunto de parágrafos seguidos (nome e CPF de um, depois do outro).
+
+O template é lido e compilado uma vez só, qualquer que seja N; o negrito
+usa um único matcher com os nomes de todos os signatários (ver negrito.py),
+e o custo cresce linearmente com o número de signatários.
+
+Uso:
+    gerador.gerar_contrato_conjunto(template_path, [dados1, dados2, ...])
+    python lote.py socios.csv --conjunto --documentos TERMO_DE_CONFIDENCIALIDADE
+"""
+
+import copy
+import re
+import threading
+import weakref
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+from cache_templates import listar_paragrafos
+from config import PLACEHOLDERS_SIGNATARIO
+from renderizador_xml import PlanoXml, xml_run
+
+# Marcadores no XML serializado: <?slot N?>, <?inicio N?> e <?fim N?>
+_MARCADOR = re.compile(rb'<\?(slot|inicio|fim) ([0-9]+)\?>')
+
+
+def do_signatario(slot):
+    """Indica se o slot usa algum placeholder de signatário"""
+    return not PLACEHOLDERS_SIGNATARIO.isdisjoint(slot.placeholders)
+
+
+def _texto(elemento):
+    return ''.join(t.text or '' for t in elemento.iter(qn('w:t')))
+
+
+def _linha_de_assinatura(elemento):
+    """Parágrafo só com sublinhados (a linha onde se assina)"""
+    texto = _texto(elemento).strip()
+    return elemento.tag == qn('w:p') and bool(texto) and not texto.strip('_')
+
+
+def blocos_repetidos(template, paragrafos):
+    """
+    Blocos do documento que se repetem por signatário.
+
+    Args:
+        template: TemplateCarregado
+        paragrafos: listar_paragrafos de uma cópia do template
+
+    Returns:
+        Lista de blocos, na ordem do documento; cada bloco é a lista dos
+        elementos irmãos (w:p ou w:tr) que o compõem
+    """
+    elementos = []
+    for slot in template.slots:
+        if not do_signatario(slot):
+            continue
+        paragrafo = paragrafos[slot.indice]._p
+        linha = next(paragrafo.iterancestors(qn('w:tr')), None)
+        elemento = paragrafo if linha is None else linha
+        if elemento not in elementos:
+            elementos.append(elemento)
+
+    # Um bloco dentro de outro (tabela aninhada) já é repetido com ele
+    escolhidos = set(elementos)
+    elementos = [e for e in elementos if escolhidos.isdisjoint(e.iterancestors())]
+
+    if not elementos:
+        return []
+
+    ordem = {elemento: numero for numero, elemento in enumerate(elementos[0].getroottree().iter())}
+    elementos.sort(key=ordem.__getitem__)
+
+    blocos = []
+    for elemento in elementos:
+        inicio = [elemento]
+        anterior = elemento.getprevious()
+        while anterior is not None and _linha_de_assinatura(anterior):
+            inicio.insert(0, anterior)
+            anterior = anterior.getprevious()
+
+        if blocos and blocos[-1][-1].getnext() is inicio[0]:
+            blocos[-1].extend(inicio)
+        else:
+            blocos.append(inicio)
+
+    return blocos
+
+
+def _paragrafos_do_bloco(bloco):
+    return [p for elemento in bloco for p in elemento.iter(qn('w:p'))]
+
+
+def repetir_blocos(template, doc, quantidade):
+    """
+    Clona, na cópia do template, cada bloco repetido até haver um por
+    signatário (as cópias vêm logo depois do original).
+
+    Returns:
+        Tupla (paragrafos, copias): listar_paragrafos(doc) e
+        {indice do slot: [Paragraph do signatário 1, 2, ...]} para os
+        slots de signatário
+    """
+    paragrafos = listar_paragrafos(doc)
+    copias = {}
+
+    for bloco in blocos_repetidos(template, paragrafos):
+        originais = _paragrafos_do_bloco(bloco)
+        posicoes = {
+            slot.indice: originais.index(paragrafos[slot.indice]._p)
+            for slot in template.slots if paragrafos[slot.indice]._p in originais
+        }
+
+        series = [originais]
+        ultimo = bloco[-1]
+        for _ in range(quantidade - 1):
+            copia = []
+            for elemento in bloco:
+                novo = copy.deepcopy(elemento)
+                ultimo.addnext(novo)
+                ultimo = novo
+                copia.append(novo)
+            series.append(_paragrafos_do_bloco(copia))
+
+        for indice, posicao in posicoes.items():
+            parent = paragrafos[indice]._parent
+            copias[indice] = [Paragraph(serie[posicao], parent) for serie in series]
+
+    return paragrafos, copias
+
+
+class PlanoSignatarios:
+    """
+    Plano de emenda (ver renderizador_xml.py) com blocos repetidos.
+
+    Attributes:
+        itens: Pedaços do document.xml na ordem: bytes fixos, SlotDinamico
+            (preenchido uma vez) ou lista (bloco repetido por signatário,
+            com bytes e SlotDinamico)
+        base: Bytes do ZIP com todos os membros, menos o document.xml
+    """
+
+    # Mesmo empacotamento do plano de um signatário
+    empacotar = PlanoXml.empacotar
+
+    def __init__(self, template):
+        doc = template.clonar()
+        paragrafos = listar_paragrafos(doc)
+        blocos = blocos_repetidos(template, paragrafos)
+
+        for numero, slot in enumerate(template.slots):
+            paragrafo = paragrafos[slot.indice]._p
+            paragrafo.clear_content()
+            paragrafo.append(etree.ProcessingInstruction('slot', str(numero)))
+
+        for numero, bloco in enumerate(blocos):
+            bloco[0].addprevious(etree.ProcessingInstruction('inicio', str(numero)))
+            bloco[-1].addnext(etree.ProcessingInstruction('fim', str(numero)))
+
+        partes = _MARCADOR.split(doc.part.blob)
+        self.itens = [partes[0]]
+        atual = self.itens
+        vistos = []
+
+        for posicao in range(1, len(partes), 3):
+            tipo, numero, trecho = partes[posicao], int(partes[posicao + 1]), partes[posicao + 2]
+            if tipo == b'slot':
+                slot = template.slots[numero]
+                vistos.append(slot.indice)
+                atual.append(slot)
+            elif tipo == b'inicio':
+                atual = []
+                self.itens.append(atual)
+            else:
+                atual = self.itens
+            atual.append(trecho)
+
+        if sorted(vistos) != template.com_placeholders:
+            raise ValueError(f"Não foi possível montar o plano de signatários de {template.caminho}")
+
+        self.base, self._info_documento = PlanoXml._montar_base(template.caminho)
+
+    def montar_documento(self, runs_do_slot, quantidade):
+        """
+        Monta o document.xml.
+
+        Args:
+            runs_do_slot: Função que recebe o SlotDinamico e o número do
+                signatário (0 nos slots fora dos blocos) e devolve a lista
+                de tuplas (texto, negrito) do parágrafo
+            quantidade: Número de signatários
+
+        Returns:
+            Bytes do document.xml
+        """
+        partes = []
+
+        def emendar(item, numero):
+            if isinstance(item, bytes):
+                partes.append(item)
+            else:
+                partes.append(''.join(xml_run(texto, negrito) for texto, negrito in runs_do_slot(item, numero)).encode('utf-8'))
+
+        for item in self.itens:
+            if isinstance(item, list):
+                for numero in range(quantidade):
+                    for subitem in item:
+                        emendar(subitem, numero)
+            else:
+                emendar(item, 0)
+
+        return b''.join(partes)
+
+    def renderizar(self, runs_do_slot, quantidade):
+        """Bytes do .docx (ver montar_documento)"""
+        return self.empacotar(self.montar_documento(runs_do_slot, quantidade))
+
+
+# Planos por template; somem junto com o template quando o cache o recarrega
+_planos = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def obter_plano_signatarios(template):
+    """
+    Plano de signatários do TemplateCarregado (montado no primeiro uso).
+    O template já deve ter passado por preparar_negrito.
+    """
+    plano = _planos.get(template)
+    if plano is None:
+        with _lock:
+            plano = _planos.get(template)
+            if plano is None:
+                plano = _planos[template] = PlanoSignatarios(template)
+    return plano
@@ -0,0 +1,66 @@
+# tests/test_cache_resultados.py
+"""
+Testes do cache de documentos gerados (cache_resultados.py)
+"""
+
+import os
+
+import cache_resultados
+from cache_resultados import CacheResultados
+
+
+def test_regravar_chave_nao_soma_o_tamanho_de_novo(tmp_path):
+    cache = CacheResultados(str(tmp_path))
+    cache.guardar('a', b'x' * 100)
+    cache.guardar('a', b'x' * 40)
+    assert cache.estatisticas()['bytes'] == 40
+
+
+def test_artefato_removido_antes_do_apelido_e_falta(tmp_path, monkeypatch):
+    cache = CacheResultados(str(tmp_path / "cache"))
+    artefato = cache.guardar('a', b'docx')
+    destino = str(tmp_path / "saida" / "doc.docx")
+
+    obter = cache.obter
+
+    def obter_e_remover(chave):
+        caminho = obter(chave)
+        os.remove(artefato)
+        return caminho
+
+    monkeypatch.setattr(cache, 'obter', obter_e_remover)
+    assert cache.reaproveitar('a', destino) is False
+    assert (cache.acertos, cache.faltas) == (0, 1)
+    assert not os.path.exists(destino)
+    assert os.listdir(tmp_path / "saida") == []
+
+
+def test_chave_depende_do_vocabulario_de_negrito(monkeypatch):
+    antes = CacheResultados.chave('0' * 64, {'{{NOME_COMPLETO}}': 'MARIA'})
+    monkeypatch.setattr(cache_resultados, '_ASSINATURA', b'[2, []]')
+    assert CacheResultados.chave('0' * 64, {'{{NOME_COMPLETO}}': 'MARIA'}) != antes
+
+
+def test_acerto_nao_muda_a_data_dos_contratos_vinculados(tmp_path):
+    cache = CacheResultados(str(tmp_path / "cache"))
+    artefato = cache.guardar('a', b'docx')
+    os.utime(artefato, (1_000_000, 1_000_000))
+    destino = str(tmp_path / "saida" / "doc.docx")
+
+    assert cache.reaproveitar('a', destino)
+    assert cache.reaproveitar('a', str(tmp_path / "saida" / "outro.docx"))
+    assert os.stat(destino).st_mtime == 1_000_000
+
+
+def test_remove_o_usado_ha_mais_tempo(tmp_path):
+    cache = CacheResultados(str(tmp_path), limite_bytes=250)
+    antigo = cache.guardar('antigo', b'x' * 100)
+    recente = cache.guardar('recente', b'x' * 100)
+    os.utime(antigo, (1_000_000, 1_000_000))
+    os.utime(recente, (2_000_000, 2_000_000))
+
+    # Usar o antigo o torna o mais recente, mesmo com o mtime de antes
+    assert cache.obter('antigo') == antigo
+    cache.guardar('novo', b'x' * 100)
+
+    assert os.path.exists(antigo) and not os.path.exists(recente)
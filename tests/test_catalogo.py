@@ -0,0 +1,40 @@
+# tests/test_catalogo.py
+"""
+Testes do catálogo de templates (catalogo.py)
+"""
+
+import json
+import shutil
+
+import pytest
+
+from cache_templates import CacheTemplates
+from catalogo import CATALOGO, PASTA_TEMPLATES, CatalogoTemplates
+
+
+def _catalogo(tmp_path, placeholders):
+    shutil.copy(f"{PASTA_TEMPLATES}/PROCURACAO_MODEL.docx", tmp_path)
+    (tmp_path / "manifest.json").write_text(json.dumps({"templates": [
+        {"id": "PROCURACAO", "arquivo": "PROCURACAO_MODEL.docx", "placeholders": placeholders},
+    ]}), encoding='utf-8')
+    catalogo = CatalogoTemplates(str(tmp_path))
+    return catalogo, CacheTemplates().obter(catalogo.obter('PROCURACAO').caminho)
+
+
+def test_manifest_do_projeto_confere_com_os_templates():
+    cache = CacheTemplates()
+    for entrada in CATALOGO:
+        CATALOGO.conferir(cache.obter(entrada.caminho))
+
+
+def test_manifest_divergente_e_rejeitado(tmp_path):
+    catalogo, template = _catalogo(tmp_path, ["{{NOME_COMPLETO}}", "{{INEXISTENTE}}"])
+
+    with pytest.raises(ValueError) as erro:
+        catalogo.conferir(template)
+    assert "{{INEXISTENTE}}" in str(erro.value) and "{{CPF_OUTORGANTE}}" in str(erro.value)
+
+
+def test_sem_declaracao_nao_confere(tmp_path):
+    catalogo, template = _catalogo(tmp_path, None)
+    catalogo.conferir(template)
@@ -0,0 +1,125 @@
+# tests/test_exportar_pdf.py
+"""
+Testes do pool de conversores PDF (exportar_pdf.py)
+"""
+
+import os
+import threading
+
+import pytest
+
+import exportar_pdf
+from exportar_pdf import ConversorStub, PoolConversores, caminho_pdf
+
+
+class ConversorInstavel(ConversorStub):
+    """Stub que falha nas primeiras `falhas` conversões (somadas entre todos os conversores)"""
+
+    def __init__(self, registro):
+        super().__init__()
+        self.registro = registro
+        self.fechado = False
+        registro['criados'].append(self)
+
+    def converter(self, caminho_docx, destino):
+        assert not self.fechado, "conversor fechado reutilizado"
+        with self.registro['lock']:
+            if self.registro['falhas'] > 0:
+                self.registro['falhas'] -= 1
+                raise RuntimeError("falha simulada")
+        super().converter(caminho_docx, destino)
+
+    def fechar(self):
+        self.registro['fechamentos'].append(self)
+        self.fechado = True
+
+
+@pytest.fixture
+def registro():
+    return {'criados': [], 'fechamentos': [], 'falhas': 0, 'lock': threading.Lock()}
+
+
+def _docx(tmp_path, nome):
+    caminho = tmp_path / nome
+    caminho.write_bytes(b'docx')
+    return str(caminho)
+
+
+def test_duas_falhas_seguidas_nao_vazam_conversores(tmp_path, registro):
+    registro['falhas'] = 2
+    caminhos = [_docx(tmp_path, f"doc{numero}.docx") for numero in range(3)]
+
+    with PoolConversores(lambda: ConversorInstavel(registro), processos=1) as pool:
+        resultados = list(pool.converter_todos(caminhos))
+
+    # O primeiro arquivo falha no conversor original e no recriado
+    assert resultados[0][1] is None and 'falha simulada' in resultados[0][2]
+    assert [pdf is not None for _, pdf, _ in resultados[1:]] == [True, True]
+    assert pool.falhas == 1 and pool.convertidos == 2
+
+    # Cada conversor criado é fechado exatamente uma vez
+    assert len(registro['criados']) == 3
+    assert sorted(map(id, registro['fechamentos'])) == sorted(map(id, registro['criados']))
+
+
+def test_falha_isolada_reaproveita_conversor_recriado(tmp_path, registro):
+    registro['falhas'] = 1
+    caminhos = [_docx(tmp_path, f"doc{numero}.docx") for numero in range(3)]
+
+    with PoolConversores(lambda: ConversorInstavel(registro), processos=1) as pool:
+        resultados = list(pool.converter_todos(caminhos))
+
+    assert all(pdf is not None for _, pdf, _ in resultados)
+    assert len(registro['criados']) == 2
+    assert registro['fechamentos'] == registro['criados']
+    assert registro['criados'][1].convertidos == 3
+
+
+def test_arquivo_ausente_nao_recria_conversor(tmp_path, registro):
+    with PoolConversores(lambda: ConversorInstavel(registro), processos=1) as pool:
+        resultados = list(pool.converter_todos([str(tmp_path / "nao_existe.docx")]))
+
+    assert resultados[0][1] is None
+    assert len(registro['criados']) == 1
+
+
+def test_conversao_interrompida_nao_deixa_pdf(tmp_path, monkeypatch):
+    caminho = _docx(tmp_path, "doc.docx")
+
+    def falhar(texto):
+        raise RuntimeError("conversão interrompida")
+
+    monkeypatch.setattr(exportar_pdf, 'pdf_minimo', falhar)
+    with pytest.raises(RuntimeError):
+        ConversorStub().converter(caminho, caminho_pdf(caminho))
+
+    assert os.listdir(tmp_path) == ["doc.docx"]
+
+
+class ConversorNulo(ConversorStub):
+    """Stub que não grava nada: só o trânsito dos jobs pela fila"""
+
+    def converter(self, caminho_docx, destino):
+        pass
+
+
+def test_envio_durante_o_fechamento_nunca_fica_pendente():
+    for _ in range(20):
+        pool = PoolConversores(ConversorNulo, processos=2)
+        futuros = []
+
+        def enviar():
+            for numero in range(50):
+                try:
+                    futuros.append(pool.enviar(f"doc{numero}.docx"))
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=enviar) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        pool.fechar()
+        for thread in threads:
+            thread.join()
+
+        assert all(futuro.done() for futuro in futuros)
@@ -0,0 +1,27 @@
+# tests/test_gerador.py
+"""
+Testes do gerador de contratos (gerador.py)
+"""
+
+import warnings
+
+import pytest
+
+from benchmark import DADOS_EXEMPLO
+from catalogo import CATALOGO
+from gerador import GeradorContratos
+from instrumentacao import Instrumentacao
+
+
+@pytest.mark.parametrize('backend', ['docx', 'xml'])
+def test_carregamento_medido_uma_vez_por_documento(backend):
+    etapas = []
+    gerador = GeradorContratos(backend=backend, instrumentacao=Instrumentacao([lambda nome, _: etapas.append(nome)]))
+    template_path = CATALOGO.obter('PROCURACAO').caminho
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        gerador.renderizar_bytes(template_path, DADOS_EXEMPLO)
+        gerador.renderizar_bytes_signatarios(template_path, [DADOS_EXEMPLO, DADOS_EXEMPLO])
+
+    assert etapas.count('carregamento') == 2
@@ -0,0 +1,53 @@
+# tests/test_pacote_zip.py
+"""
+Testes da saída em pacote ZIP (pacote_zip.py)
+"""
+
+import csv
+import hashlib
+import io
+import warnings
+import zipfile
+from datetime import datetime
+
+from benchmark import DADOS_EXEMPLO
+from cache_resultados import CacheResultados
+from catalogo import CATALOGO
+from gerador import GeradorContratos
+from pacote_zip import NOME_MANIFESTO, PacoteZip, adicionar_contratos
+
+
+def test_entradas_com_data_atual_e_nomes_seguros(tmp_path):
+    caminho = str(tmp_path / "pacote.zip")
+    with PacoteZip(caminho) as pacote:
+        nome = pacote.adicionar(b'docx', "../../etc/MARIA SOUZA.docx", {'nome_completo': 'MARIA'}, 'X.docx')
+        barra_invertida = pacote.adicionar(b'docx', "..\\JOAO.docx", {}, 'X.docx')
+
+    assert nome == "SEM_NOME/SEM_NOME/etc/MARIA_SOUZA.docx"
+    assert barra_invertida == "SEM_NOME/JOAO.docx"
+
+    with zipfile.ZipFile(caminho) as arquivo:
+        info = arquivo.getinfo(nome)
+        assert info.date_time[0] == datetime.now().year
+        linhas = list(csv.DictReader(io.StringIO(arquivo.read(NOME_MANIFESTO).decode('utf-8'))))
+
+    assert linhas[0]['sha256'] == hashlib.sha256(b'docx').hexdigest()
+    assert linhas[0]['bytes'] == '4'
+
+
+def test_contratos_usam_backend_e_cache_do_gerador(tmp_path):
+    cache = CacheResultados(str(tmp_path / "cache"))
+    gerador = GeradorContratos(cache_resultados=cache, backend='xml')
+    templates = CATALOGO.pares(['PROCURACAO'])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        esperado = gerador.renderizar_bytes(templates[0][0], DADOS_EXEMPLO, 'xml')
+
+        for numero in range(2):
+            with PacoteZip(str(tmp_path / f"{numero}.zip")) as pacote:
+                (_, nome), = adicionar_contratos(pacote, DADOS_EXEMPLO, gerador, templates)
+            with zipfile.ZipFile(str(tmp_path / f"{numero}.zip")) as arquivo:
+                assert arquivo.read(nome) == esperado
+
+    assert (cache.acertos, cache.faltas) == (1, 1)
@@ -0,0 +1,44 @@
+# tests/test_validacao.py
+"""
+Testes da validação de dados (validacao.py)
+"""
+
+import pytest
+
+from config import OUTORGADOS
+from formatador import FormatadorDados
+from validacao import validar_numero_oab, validar_oab
+
+_OABS_OUTORGADOS = [
+    (dados[chave], chave.split('_', 1)[1].upper())
+    for dados in OUTORGADOS.values()
+    for chave in dados if chave.startswith('oab_')
+]
+
+
+@pytest.mark.parametrize("numero, uf", _OABS_OUTORGADOS)
+def test_oabs_dos_outorgados_sao_validas(numero, uf):
+    assert validar_oab(numero, uf) is None
+
+
+@pytest.mark.parametrize("numero", ["1", "56.110", "123.456", "123.456/RS"])
+def test_oab_de_1_a_6_digitos(numero):
+    assert validar_oab(numero, "RS") is None
+
+
+@pytest.mark.parametrize("numero", ["", "ABC", "1.234.567"])
+def test_oab_sem_digitos_ou_longa_demais(numero):
+    assert validar_oab(numero, "RS") is not None
+
+
+def test_oab_de_outra_seccional():
+    assert "seccional SP" in validar_oab("123.456/SP", "RS")
+
+
+@pytest.mark.parametrize("numero, formatado", [
+    ("123456", "123.456"), ("56110", "56.110"), ("1234", "1.234"), ("123", "123"), ("7", "7"),
+])
+def test_oab_curta_valida_e_formatada(numero, formatado):
+    assert validar_numero_oab(numero) is None
+    assert FormatadorDados.formatar_oab(numero) == formatado
+    assert validar_oab(FormatadorDados.formatar_oab(numero), "RS") is None
@@ -0,0 +1,303 @@
+# validacao.py
+"""
+Validação dos dados antes da geração dos contratos
+
+Verifica os dígitos verificadores do CPF, o número da OAB (1 a 6 dígitos e, se
+trouxer a seccional, a mesma UF de oab_uf), as siglas de estado contra
+SIGLAS_ESTADOS e a data. A validação em lote (validar_colunas) trabalha
+coluna a coluna: os dígitos de todos os CPFs são conferidos de uma vez com
+numpy (quando instalado) e os demais campos são validados uma vez por valor
+distinto. Nenhum documento é aberto: linhas inválidas são rejeitadas antes
+da geração, com um relatório estruturado dos erros.
+"""
+
+import csv
+import re
+from collections import Counter, namedtuple
+
+from config import SIGLAS_ESTADOS
+from formatador import DataInvalida, FormatadorDados, _mapear_unicos
+
+_NAO_DIGITOS = re.compile(r'[^0-9]')
+
+# Siglas dentro do número da OAB (ex.: "OAB/RS 123.456"); aceita 3 letras para
+# consumir o prefixo "OAB" inteiro, que não é sigla de estado
+_SIGLAS_NO_NUMERO = re.compile(r'[A-Za-z]{2,3}')
+
+# Campos sem os quais a linha é rejeitada
+CAMPOS_OBRIGATORIOS = ['nome_completo', 'cpf']
+
+# Um erro encontrado na validação
+ErroValidacao = namedtuple('ErroValidacao', ['linha', 'campo', 'valor', 'mensagem'])
+
+
+class RegistroInvalido(ValueError):
+    """Registro com um ou mais erros de validação (ver .erros)"""
+
+    def __init__(self, erros):
+        self.erros = list(erros)
+        super().__init__('; '.join(f"{erro.campo}: {erro.mensagem}" for erro in self.erros))
+
+
+def _texto(valor):
+    """Valor da planilha como texto, tratando None e NaN como vazio"""
+    if valor is None or valor != valor:
+        return ''
+    return str(valor).strip()
+
+
+def _digitos_verificadores(digitos):
+    """Os dois dígitos verificadores esperados para os 9 primeiros dígitos"""
+    soma = sum(int(d) * peso for d, peso in zip(digitos[:9], range(10, 1, -1)))
+    primeiro = soma * 10 % 11 % 10
+    soma = sum(int(d) * peso for d, peso in zip(digitos[:9] + str(primeiro), range(11, 1, -1)))
+    segundo = soma * 10 % 11 % 10
+    return f"{primeiro}{segundo}"
+
+
+def validar_cpf(cpf):
+    """
+    Valida o CPF (qualquer formato).
+
+    Returns:
+        Mensagem de erro ou None se o CPF é válido
+    """
+    digitos = _NAO_DIGITOS.sub('', _texto(cpf))
+
+    if len(digitos) != 11:
+        return "CPF deve ter 11 dígitos"
+    if digitos == digitos[0] * 11:
+        return "CPF inválido (dígitos repetidos)"
+    if digitos[9:] != _digitos_verificadores(digitos):
+        return "CPF inválido (dígitos verificadores não conferem)"
+    return None
+
+
+def cpf_valido(cpf):
+    """Indica se o CPF tem 11 dígitos e dígitos verificadores corretos"""
+    return validar_cpf(cpf) is None
+
+
+def validar_uf(uf):
+    """Mensagem de erro ou None se a sigla está em SIGLAS_ESTADOS"""
+    if _texto(uf).upper() not in SIGLAS_ESTADOS:
+        return f"Sigla de estado inválida: {_texto(uf)}"
+    return None
+
+
+def validar_numero_oab(numero_oab):
+    """Mensagem de erro ou None se o número da OAB tem de 1 a 6 dígitos"""
+    if not 1 <= len(_NAO_DIGITOS.sub('', _texto(numero_oab))) <= 6:
+        return "Número da OAB deve ter de 1 a 6 dígitos"
+    return None
+
+
+def validar_oab(numero_oab, oab_uf):
+    """
+    Valida o número da OAB contra a UF da OAB.
+
+    O número deve ter de 1 a 6 dígitos. Se trouxer a seccional junto (ex.:
+    "123.456/RS"), ela tem que ser a mesma de oab_uf.
+
+    Returns:
+        Mensagem de erro ou None
+    """
+    numero = _texto(numero_oab)
+    uf = _texto(oab_uf).upper()
+
+    if not uf:
+        return "UF da OAB não informada"
+    if uf not in SIGLAS_ESTADOS:
+        return f"UF da OAB inválida: {uf}"
+
+    erro = validar_numero_oab(numero)
+    if erro:
+        return erro
+
+    for sigla in _SIGLAS_NO_NUMERO.findall(numero.upper()):
+        if sigla in SIGLAS_ESTADOS and sigla != uf:
+            return f"Número da OAB é da seccional {sigla}, mas oab_uf é {uf}"
+
+    return None
+
+
+def validar_data(data):
+    """Mensagem de erro ou None (data vazia é aceita: vale a data atual)"""
+    if not _texto(data):
+        return None
+    try:
+        FormatadorDados.interpretar_data(data)
+    except DataInvalida:
+        return f"Data inválida: {_texto(data)}"
+    return None
+
+
+def validar_registro(dados, linha=None):
+    """
+    Valida um registro (linha da planilha ou dados_pessoa, crus ou já
+    formatados).
+
+    Returns:
+        Lista de ErroValidacao (vazia se o registro é válido)
+    """
+    colunas = {campo: [valor] for campo, valor in dados.items()}
+    return validar_colunas(colunas, [linha])
+
+
+def _mensagens_cpf(valores):
+    """
+    Mensagens de validação de uma coluna de CPFs. Com numpy, os dígitos
+    verificadores de todos os CPFs de 11 dígitos são conferidos de uma vez.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return [validar_cpf(valor) for valor in valores]
+
+    digitos = [_NAO_DIGITOS.sub('', _texto(valor)) for valor in valores]
+    completos = [indice for indice, d in enumerate(digitos) if len(d) == 11]
+    mensagens = ["CPF deve ter 11 dígitos"] * len(digitos)
+
+    if completos:
+        matriz = numpy.frombuffer(
+            ''.join(digitos[i] for i in completos).encode('ascii'), dtype=numpy.uint8,
+        ).reshape(-1, 11).astype(numpy.int64) - ord('0')
+
+        primeiro = matriz[:, :9] @ numpy.arange(10, 1, -1) * 10 % 11 % 10
+        segundo = matriz[:, :10] @ numpy.arange(11, 1, -1) * 10 % 11 % 10
+        repetidos = (matriz == matriz[:, :1]).all(axis=1)
+        conferem = (primeiro == matriz[:, 9]) & (segundo == matriz[:, 10])
+
+        for indice, repetido, confere in zip(completos, repetidos.tolist(), conferem.tolist()):
+            if repetido:
+                mensagens[indice] = "CPF inválido (dígitos repetidos)"
+            elif not confere:
+                mensagens[indice] = "CPF inválido (dígitos verificadores não conferem)"
+            else:
+                mensagens[indice] = None
+
+    return mensagens
+
+
+def validar_colunas(colunas, linhas=None):
+    """
+    Valida um roster inteiro coluna a coluna.
+
+    Args:
+        colunas: Dicionário {campo: valores} ou DataFrame do pandas, com os
+            campos crus da planilha (as mesmas chaves de COLUNAS_ROSTER)
+        linhas: Identificador de cada linha no relatório (ex.: número da
+            linha na planilha); padrão: a posição
+
+    Returns:
+        Lista de ErroValidacao, na ordem das linhas
+    """
+    colunas = {campo: list(colunas[campo]) for campo in colunas}
+    total = max((len(valores) for valores in colunas.values()), default=0)
+    linhas = list(linhas) if linhas is not None else list(range(total))
+    vazia = [''] * total
+
+    mensagens = {}
+
+    for campo in CAMPOS_OBRIGATORIOS:
+        mensagens[campo] = [
+            "Campo obrigatório vazio" if not _texto(valor) else None
+            for valor in colunas.get(campo, vazia)
+        ]
+
+    if 'cpf' in colunas:
+        mensagens['cpf'] = [
+            obrigatorio or (formato if _texto(valor) else None)
+            for valor, obrigatorio, formato in zip(
+                colunas['cpf'], mensagens['cpf'], _mensagens_cpf(colunas['cpf']),
+            )
+        ]
+
+    if 'estado' in colunas:
+        mensagens['estado'] = _mapear_unicos(
+            colunas['estado'], lambda valor: validar_uf(valor) if _texto(valor) else None,
+        )
+
+    if 'oab_numero' in colunas or 'oab_uf' in colunas:
+        pares = list(zip(colunas.get('oab_numero', vazia), colunas.get('oab_uf', vazia)))
+        memo = {}
+        mensagens['oab_numero'] = []
+        for numero, uf in pares:
+            if not _texto(numero) and not _texto(uf):
+                mensagens['oab_numero'].append(None)
+                continue
+            chave = (_texto(numero), _texto(uf))
+            if chave not in memo:
+                memo[chave] = validar_oab(numero, uf)
+            mensagens['oab_numero'].append(memo[chave])
+
+    if 'data' in colunas:
+        mensagens['data'] = _mapear_unicos(colunas['data'], validar_data)
+
+    erros = []
+    for posicao, linha in enumerate(linhas):
+        for campo, mensagens_campo in mensagens.items():
+            mensagem = mensagens_campo[posicao]
+            if mensagem:
+                valor = colunas.get(campo, vazia)[posicao]
+                erros.append(ErroValidacao(linha, campo, _texto(valor), mensagem))
+
+    return erros
+
+
+class RelatorioValidacao:
+    """
+    Erros de validação de um roster.
+
+    Attributes:
+        linhas: Total de linhas validadas
+        erros: Lista de ErroValidacao
+    """
+
+    CAMPOS_CSV = list(ErroValidacao._fields)
+
+    def __init__(self):
+        self.linhas = 0
+        self.erros = []
+
+    def adicionar(self, linhas, erros):
+        """Acrescenta o resultado da validação de um bloco de linhas"""
+        self.linhas += linhas
+        self.erros.extend(erros)
+
+    @property
+    def linhas_invalidas(self):
+        """Identificadores das linhas com algum erro"""
+        return {erro.linha for erro in self.erros}
+
+    @property
+    def valido(self):
+        """Indica se nenhuma linha tem erro"""
+        return not self.erros
+
+    def por_campo(self):
+        """Quantidade de erros por campo"""
+        return Counter(erro.campo for erro in self.erros)
+
+    def por_linha(self):
+        """Erros agrupados por linha"""
+        agrupados = {}
+        for erro in self.erros:
+            agrupados.setdefault(erro.linha, []).append(erro)
+        return agrupados
+
+    def gravar_csv(self, caminho):
+        """Grava um erro por linha no CSV (linha, campo, valor, mensagem)"""
+        with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(self.CAMPOS_CSV)
+            escritor.writerows(self.erros)
+
+    def resumo(self):
+        """Totais em formato serializável"""
+        return {
+            'linhas': self.linhas,
+            'linhas_invalidas': len(self.linhas_invalidas),
+            'erros': len(self.erros),
+            'por_campo': dict(self.por_campo()),
+        }